@@ -0,0 +1,16 @@
+"""Provider API keys for the test scripts, read from the environment once."""
+
+import os
+from types import MappingProxyType
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+KEYS = MappingProxyType(
+    {
+        "openai": os.getenv("OPENAI_API_KEY"),
+        "gemini": os.getenv("GEMINI_API_KEY"),
+        "claude": os.getenv("CLAUDE_API_KEY"),
+    }
+)
@@ -0,0 +1,37 @@
+"""On-disk cache of travel plans for the live test scripts, enabled by ``HERMES_TEST_CACHE=1``."""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import orjson
+
+CACHE_DIR = Path("~/.cache/hermes_tests").expanduser()
+EXPIRE = 7 * 86400
+
+
+def response_cache_key(provider, query):
+    payload = {"provider": provider or "auto", "query": query, "temp": 0}
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def cached_travel_plan(travel_crew, query, provider=None):
+    """``travel_crew.create_travel_plan(query)``, replayed from disk on warm runs."""
+    if os.getenv("HERMES_TEST_CACHE") != "1":
+        return travel_crew.create_travel_plan(query)
+
+    path = CACHE_DIR / f"{response_cache_key(provider, query)}.json"
+    try:
+        if time.time() - path.stat().st_mtime < EXPIRE:
+            return orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+
+    result = travel_crew.create_travel_plan(query)
+    # Scored answers (plans and rejections) are worth replaying; errors may be transient
+    if "confidence_score" in result:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Task outputs are objects, not JSON values: store their text
+        path.write_bytes(orjson.dumps(result, default=str))
+    return result
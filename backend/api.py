@@ -6,42 +6,129 @@ This module implements a FastAPI server that exposes the travel planning
 functionality as a REST API.
 """
 
+import asyncio
+import logging
 import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
+import anyio.to_thread
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from project_hermes.batching import MicroBatcher
+from project_hermes.body import json_body_openapi, parse_json_body
+from project_hermes.cache import PlanStore, TTLCache, plan_cache_key
+from project_hermes.errors import install_error_handlers
+from project_hermes.http import close_llm_http, configure_llm_http, prewarm
+from project_hermes.settings import parse_origins
+from project_hermes.shared_cache import RedisPlanCache
+
+if TYPE_CHECKING:
+    from travel_crew_multi_provider import TravelCrew
+
+logger = logging.getLogger(__name__)
+
+# Worker threads available to blocking handlers and crew runs (anyio default is 40)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+# Successful plans keyed by (provider, normalized query digest); identical queries
+# arriving while a plan is being generated share that run
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", "3600"))
+plan_store = PlanStore(
+    TTLCache(maxsize=int(os.getenv("PLAN_CACHE_SIZE", "1024")), ttl=PLAN_CACHE_TTL),
+    # How long a rate-limited provider fails fast before the LLM is tried again
+    negative_ttl=float(os.getenv("PLAN_NEGATIVE_TTL", "30")),
+)
+# Setting REDIS_URL shares cached plans (and in-flight runs) across workers
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+# Optional micro-batching of concurrent plan requests (window of 0 disables it)
+PLAN_BATCH_WINDOW_MS = float(os.getenv("PLAN_BATCH_WINDOW_MS", "0"))
+PLAN_BATCH_MAX = int(os.getenv("PLAN_BATCH_MAX", "8"))
+# Most queries accepted by one /travel/plan/batch request
+PLAN_BATCH_QUERIES_MAX = int(os.getenv("PLAN_BATCH_QUERIES_MAX", "32"))
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Build the default-provider crew in the background: the CrewAI/provider SDK
+    # imports take seconds, and startup should not wait on them
+    warmup = asyncio.create_task(_warm_crew())
+    if REDIS_URL:
+        plan_store.shared = RedisPlanCache.from_url(REDIS_URL, ttl=PLAN_CACHE_TTL)
+    if plan_batcher is not None:
+        plan_batcher.start()
+    yield
+    warmup.cancel()
+    if plan_batcher is not None:
+        await plan_batcher.stop()
+    if plan_store.shared is not None:
+        await plan_store.shared.close()
+        plan_store.shared = None
+    await close_llm_http()
+
+
+async def _warm_crew() -> None:
+    try:
+        crew = await run_in_threadpool(_get_crew, None)
+        await run_in_threadpool(prewarm, crew.llm_provider_name)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Could not warm default TravelCrew: %s", e)
 
-from travel_crew_multi_provider import TravelCrew
 
 # Initialize the FastAPI app
 app = FastAPI(
     title="Project Hermes Travel API",
     description="A multi-agent AI system for comprehensive travel planning",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
+install_error_handlers(app)
 
 # Enable CORS for frontend access (configurable via env)
-allowed_origins = os.getenv(
-    "CORS_ALLOW_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000"
-).split(",")
+ALLOWED_ORIGINS = parse_origins(
+    os.getenv("CORS_ALLOW_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000")
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[o.strip() for o in allowed_origins if o.strip()],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
-# Define request and response models
+# Define request and response models (immutable; unknown fields are dropped)
+_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
+
 class TravelRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     query: str
     llm_provider: str | None = None
 
 
+class TravelBatchRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
+    queries: list[str] = Field(min_length=1, max_length=PLAN_BATCH_QUERIES_MAX)
+    llm_provider: str | None = None
+
+
 class TravelPlan(BaseModel):
+    model_config = _MODEL_CONFIG
+
     overview: str
     itinerary: str
     safety: str
@@ -49,6 +136,8 @@ class TravelPlan(BaseModel):
 
 
 class TravelResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     success: bool
     confidence_score: float
     llm_provider: str | None = None
@@ -66,23 +155,191 @@ async def root():
     }
 
 
-@app.post("/travel/plan", response_model=TravelResponse)
-async def create_travel_plan(request: TravelRequest):
-    try:
-        # Initialize travel crew with the requested provider if specified
-        travel_crew = TravelCrew(llm_provider=request.llm_provider)
+@lru_cache(maxsize=8)
+def _get_crew(llm_provider: str | None) -> "TravelCrew":
+    """Return a shared TravelCrew per provider (LLM client built once; each plan
+    builds its own agents, so concurrent requests never share one)."""
+    # Imported on first use: pulls in CrewAI, litellm and every provider SDK
+    from travel_crew_multi_provider import TravelCrew
+
+    configure_llm_http()
+    return TravelCrew(llm_provider=llm_provider)
+
+
+def _plan_trip(
+    query: str, llm_provider: str | None, on_section: Callable[[str, str], None] | None = None
+) -> dict:
+    # Reuse the travel crew for the requested provider if specified
+    travel_crew = _get_crew(llm_provider)
+
+    # Call the travel crew to generate a plan
+    return travel_crew.plan_trip(query, on_section=on_section)
+
+
+def _plan_trip_batch(items: list[tuple[str, str | None]]) -> list[dict | Exception]:
+    """Run a batch of (query, provider) items with one plan_trip_batch call per provider."""
+    results: list[dict | Exception] = [{}] * len(items)
+    by_provider: dict[str | None, list[int]] = {}
+    for i, (_, llm_provider) in enumerate(items):
+        by_provider.setdefault(llm_provider, []).append(i)
+
+    for llm_provider, indices in by_provider.items():
+        try:
+            travel_crew = _get_crew(llm_provider)
+        except Exception as e:  # noqa: BLE001
+            for i in indices:
+                results[i] = e
+            continue
+        batch = travel_crew.plan_trip_batch([items[i][0] for i in indices])
+        for i, result in zip(indices, batch, strict=True):
+            results[i] = result
+    return results
+
+
+async def _run_plan_batch(items: list[tuple[str, str | None]]) -> list[dict | Exception]:
+    return await run_in_threadpool(_plan_trip_batch, items)
+
+
+plan_batcher = (
+    MicroBatcher(_run_plan_batch, max_batch=PLAN_BATCH_MAX, window_ms=PLAN_BATCH_WINDOW_MS)
+    if PLAN_BATCH_WINDOW_MS > 0
+    else None
+)
+
+
+async def _generate_plan(query: str, llm_provider: str | None) -> dict:
+    if plan_batcher is not None:
+        return await plan_batcher.submit((query, llm_provider))
+    # Crew runs are blocking and take minutes; keep them off the event loop
+    return await run_in_threadpool(_plan_trip, query, llm_provider)
+
+
+# TravelResponse documents the schema only; results come from plan_trip with the
+# declared types already, so they are serialized directly instead of re-validated.
+# The body is parsed straight from bytes rather than via FastAPI's json.loads pass.
+@app.post(
+    "/travel/plan",
+    responses={200: {"model": TravelResponse}},
+    openapi_extra=json_body_openapi(TravelRequest),
+)
+async def create_travel_plan(raw_request: Request):
+    request = await parse_json_body(raw_request, TravelRequest)
+    cache_key = plan_cache_key(request.query, request.llm_provider)
+    # Failures surface as PlanError and become a 502 in plan_error_handler
+    result = await plan_store.get_or_create(
+        cache_key, lambda: _generate_plan(request.query, request.llm_provider)
+    )
+
+    # Return the result which already has the provider information
+    return ORJSONResponse(content=result)
+
+
+async def _stream_plan(query: str, llm_provider: str | None) -> AsyncIterator[bytes]:
+    """NDJSON lines: one ``{"section", "content"}`` per plan section as its task
+    completes, then ``{"section": "result", "content": <full plan response>}``."""
+    cache_key = plan_cache_key(query, llm_provider)
+    cached = await plan_store.get(cache_key)
+    if cached is not None:
+        # Replay a cached plan in the same shape, all sections at once
+        for section, content in (cached.get("travel_plan") or {}).items():
+            yield orjson.dumps({"section": section, "content": content}) + b"\n"
+        yield orjson.dumps({"section": "result", "content": cached}) + b"\n"
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+    def on_section(section: str, content: str) -> None:
+        # Called on the crew's worker thread
+        loop.call_soon_threadsafe(queue.put_nowait, (section, content))
+
+    async def run() -> None:
+        try:
+            result = await run_in_threadpool(_plan_trip, query, llm_provider, on_section)
+        except Exception as e:  # noqa: BLE001
+            result = {"success": False, "error": type(e).__name__}
+        else:
+            await plan_store.set(cache_key, result)
+        queue.put_nowait(("result", result))
+
+    runner = asyncio.create_task(run())
+    section = None
+    while section != "result":
+        section, content = await queue.get()
+        yield orjson.dumps({"section": section, "content": content}) + b"\n"
+    await runner
+
+
+@app.post("/travel/plan/stream", openapi_extra=json_body_openapi(TravelRequest))
+async def stream_travel_plan(raw_request: Request):
+    """Like /travel/plan, but streams each section as soon as it is generated."""
+    request = await parse_json_body(raw_request, TravelRequest)
+    return StreamingResponse(
+        _stream_plan(request.query, request.llm_provider), media_type="application/x-ndjson"
+    )
+
+
+@app.post("/travel/plan/batch", openapi_extra=json_body_openapi(TravelBatchRequest))
+async def batch_travel_plans(raw_request: Request):
+    """Plan many queries in one call, e.g. for evaluations; results keep query order.
+
+    Cached plans are returned as-is and repeated queries run once; the rest go to
+    the provider's crew, which plans a few at a time with separate agents per plan.
+    A failed query yields an error result in place.
+    """
+    request = await parse_json_body(raw_request, TravelBatchRequest)
+    keys = [plan_cache_key(query, request.llm_provider) for query in request.queries]
+    results: list[dict | None] = list(await asyncio.gather(*map(plan_store.get, keys)))
+
+    # One run per distinct missing key
+    pending: dict[tuple[str, str], int] = {}
+    for i, key in enumerate(keys):
+        if results[i] is None:
+            pending.setdefault(key, i)
+    if pending:
+        items = [(request.queries[i], request.llm_provider) for i in pending.values()]
+        generated = await run_in_threadpool(_plan_trip_batch, items)
+        by_key: dict[tuple[str, str], dict] = {}
+        for key, result in zip(pending, generated, strict=True):
+            if isinstance(result, Exception):
+                result = {"success": False, "error": type(result).__name__}
+            else:
+                await plan_store.set(key, result)
+            by_key[key] = result
+        results = [
+            by_key[key] if result is None else result
+            for key, result in zip(keys, results, strict=True)
+        ]
+
+    return ORJSONResponse(content={"results": results})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return plan_store.metrics()
+
 
-        # Call the travel crew to generate a plan
-        result = travel_crew.plan_trip(request.query)
+# Canned plan for frontend work without API keys; the body is pre-serialized bytes
+if os.getenv("HERMES_MOCK_PLAN") == "1":
+    from demo_with_realistic_data import MOCK_PLAN_JSON
 
-        # Return the result which already has the provider information
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error processing travel plan: {str(e)}"
-        ) from e
+    @app.get("/travel/plan/mock")
+    async def mock_travel_plan():
+        return Response(content=MOCK_PLAN_JSON, media_type="application/json")
 
 
 # Run the server if executed directly
 if __name__ == "__main__":
-    uvicorn.run("api:app", host="0.0.0.0", port=8001, reload=True)
+    # HERMES_DEV=1: single process with hot reload (reload forks a file watcher)
+    dev = os.getenv("HERMES_DEV") == "1"
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if dev else int(os.getenv("WEB_CONCURRENCY", "4")),
+        log_level="warning",
+        access_log=False,
+        reload=dev,
+    )
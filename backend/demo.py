@@ -7,8 +7,8 @@ This script launches the Project Hermes demo using one of the test scripts.
 """
 
 import os
+import runpy
 import sys
-import subprocess
 
 
 def main():
@@ -54,9 +54,16 @@ def main():
     print(f"\nRunning {script_name}...")
     print("=" * 50)
 
-    # Execute the test script
-    result = subprocess.call([sys.executable, script_path])
-    return result
+    # Execute the test script in this interpreter; a child process would pay
+    # Python startup plus the CrewAI/provider SDK imports all over again
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        print(f"Error running {script_name}: {e}")
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
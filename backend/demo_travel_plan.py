@@ -14,6 +14,24 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Provider table, in auto-detect priority order: (name, API key env var, model, label)
+_PROVIDERS = (
+    ("openai", "OPENAI_API_KEY", "gpt-4-turbo", "OpenAI"),
+    ("gemini", "GEMINI_API_KEY", "gemini-pro", "Gemini"),
+    ("claude", "CLAUDE_API_KEY", "claude-3-opus-20240229", "Claude"),
+)
+MODEL_BY_PROVIDER = {name: model for name, _, model, _ in _PROVIDERS}
+MODEL_LABELS = {
+    "gpt-4-turbo": "GPT-4 Turbo",
+    "gemini-pro": "Gemini Pro",
+    "claude-3-opus-20240229": "Claude",
+}
+# Resolved once after .env is loaded
+AVAILABLE_PROVIDERS: tuple[str, ...] = tuple(
+    name for name, env, _, _ in _PROVIDERS if os.environ.get(env)
+)
+DEFAULT_PROVIDER = AVAILABLE_PROVIDERS[0] if AVAILABLE_PROVIDERS else "openai"
+
 
 def run_demo():
     """Run a simple travel planning demo."""
@@ -28,38 +46,14 @@ def run_demo():
             print(f"Using specified provider: {provider}")
 
         # Print information about available API keys
-        if os.getenv("OPENAI_API_KEY"):
-            print("✓ OpenAI API key found")
-        else:
-            print("✗ OpenAI API key not found")
-
-        if os.getenv("GEMINI_API_KEY"):
-            print("✓ Gemini API key found")
-        else:
-            print("✗ Gemini API key not found")
-
-        if os.getenv("CLAUDE_API_KEY"):
-            print("✓ Claude API key found")
-        else:
-            print("✗ Claude API key not found")
-
-        # Try to determine the provider from API keys
-        model_name = "gpt-4-turbo"  # Default
-        if provider == "gemini" or (
-            provider is None and not os.getenv("OPENAI_API_KEY") and os.getenv("GEMINI_API_KEY")
-        ):
-            model_name = "gemini-pro"
-            print("Using Gemini Pro model")
-        elif provider == "claude" or (
-            provider is None
-            and not os.getenv("OPENAI_API_KEY")
-            and not os.getenv("GEMINI_API_KEY")
-            and os.getenv("CLAUDE_API_KEY")
-        ):
-            model_name = "claude-3-opus-20240229"
-            print("Using Claude model")
-        else:
-            print("Using GPT-4 Turbo model")
+        for name, _, _, label in _PROVIDERS:
+            mark = "✓" if name in AVAILABLE_PROVIDERS else "✗"
+            status = "found" if name in AVAILABLE_PROVIDERS else "not found"
+            print(f"{mark} {label} API key {status}")
+
+        # Unknown provider names fall back to the OpenAI default, as before
+        model_name = MODEL_BY_PROVIDER.get(provider or DEFAULT_PROVIDER, "gpt-4-turbo")
+        print(f"Using {MODEL_LABELS[model_name]} model")
 
         print("\nInitializing TravelCrew...")
         # Initialize the travel crew with the determined model
@@ -7,7 +7,8 @@ to demonstrate the output format and functionality.
 
 import os
 import sys
-import json
+
+import orjson
 from dotenv import load_dotenv
 
 # Add necessary paths
@@ -161,6 +162,9 @@ mock_travel_plan = {
     },
 }
 
+# Serialized once at import; served as-is by the optional /travel/plan/mock endpoint
+MOCK_PLAN_JSON: bytes = orjson.dumps(mock_travel_plan)
+
 
 def print_section(title):
     """Print a formatted section title."""
@@ -190,47 +194,55 @@ def display_travel_plan(result):
 
     print_section("TRAVEL PLAN")
 
-    # Print the plan overview
-    if "overview" in travel_plan:
-        print("\n📋 OVERVIEW")
-        print(travel_plan["overview"])
+    for key, heading, render in _SECTIONS:
+        if key in travel_plan:
+            print(heading)
+            render(travel_plan[key])
 
-    # Print itinerary
-    if "itinerary" in travel_plan:
-        print("\n🗓️ ITINERARY")
-        itinerary = travel_plan["itinerary"]
-        if isinstance(itinerary, list):
+
+def _print_itinerary(itinerary):
+    match itinerary:
+        case list():
             for day in itinerary:
                 print(f"\n📅 {day.get('day', 'Day')}:")
                 for activity in day.get("activities", []):
                     print(f"  • {activity.get('time', '')} - {activity.get('description', '')}")
-        else:
+        case _:
             print(itinerary)  # Fallback if not in expected format
 
-    # Print safety information
-    if "safety" in travel_plan:
-        print("\n🛡️ SAFETY INFORMATION")
-        safety = travel_plan["safety"]
-        if isinstance(safety, dict):
+
+def _print_safety(safety):
+    match safety:
+        case dict():
             for key, value in safety.items():
                 print(f"  • {key.replace('_', ' ').title()}: {value}")
-        else:
+        case _:
             print(safety)
 
-    # Print budget information
-    if "finance" in travel_plan:
-        print("\n💰 BUDGET")
-        finance = travel_plan["finance"]
-        if isinstance(finance, dict):
+
+def _print_finance(finance):
+    match finance:
+        case dict():
             for category, amount in finance.items():
-                if isinstance(amount, (int, float)):
-                    print(f"  • {category.replace('_', ' ').title()}: ${amount}")
-                else:
-                    print(f"  • {category.replace('_', ' ').title()}: {amount}")
-        else:
+                label = category.replace("_", " ").title()
+                match amount:
+                    case int() | float():
+                        print(f"  • {label}: ${amount}")
+                    case _:
+                        print(f"  • {label}: {amount}")
+        case _:
             print(finance)
 
 
+# Plan sections in display order: (key, heading, renderer)
+_SECTIONS = (
+    ("overview", "\n📋 OVERVIEW", print),
+    ("itinerary", "\n🗓️ ITINERARY", _print_itinerary),
+    ("safety", "\n🛡️ SAFETY INFORMATION", _print_safety),
+    ("finance", "\n💰 BUDGET", _print_finance),
+)
+
+
 def main():
     """Main test function."""
     print_section("PROJECT HERMES - DEMO WITH REALISTIC DATA")
@@ -13,7 +13,19 @@ if SRC not in sys.path:
 def main():
     import uvicorn
 
-    uvicorn.run("project_hermes.api:app", host="127.0.0.1", port=8001, reload=True)
+    # HERMES_DEV=1: single process with hot reload (reload forks a file watcher)
+    dev = os.getenv("HERMES_DEV") == "1"
+    uvicorn.run(
+        "project_hermes.api:app",
+        host="127.0.0.1",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if dev else int(os.getenv("WEB_CONCURRENCY", "4")),
+        log_level="warning",
+        access_log=False,
+        reload=dev,
+    )
 
 
 if __name__ == "__main__":
@@ -1,21 +1,51 @@
+import asyncio
 import importlib.metadata
-
-from fastapi import FastAPI, HTTPException, Query
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+import anyio.to_thread
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import importlib.metadata
-from project_hermes.settings import get_settings
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+
+from project_hermes.batching import MicroBatcher
+from project_hermes.body import json_body_openapi, parse_json_body
+from project_hermes.cache import PlanStore, TTLCache, plan_cache_key
+from project_hermes.errors import install_error_handlers
+from project_hermes.http import close_llm_http, configure_llm_http, prewarm
 from project_hermes.logging import configure_logging
+from project_hermes.settings import get_settings
+from project_hermes.shared_cache import RedisPlanCache
 
 configure_logging()
 
+logger = logging.getLogger(__name__)
+
+# Resolved once: importlib.metadata scans sys.path and parses METADATA on every call
+try:
+    _VERSION = importlib.metadata.version("project_hermes")
+except importlib.metadata.PackageNotFoundError:
+    _VERSION = "0.0.0"
+
+
+# Immutable, and unknown fields are dropped rather than rejected
+_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
 
 class TravelRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     query: str
     llm_provider: str | None = None  # Added provider selection
 
 
 class TravelResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     success: bool
     query: str
     travel_plan: dict | None = None
@@ -24,14 +54,114 @@ class TravelResponse(BaseModel):
     llm_provider: str | None = None  # Added to show which provider was used
 
 
+class PoemResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
+    poem: str
+    topic: str
+    model: str | None = None
+    attempts: int
+    success: bool
+    error: str | None = None
+
+
+@lru_cache(maxsize=8)
+def _get_crew(llm_provider: str | None):
+    """Return a shared TravelCrew per provider instead of rebuilding agents per request."""
+    from project_hermes.crews.travel_crew.travel_crew import TravelCrew
+
+    configure_llm_http()
+    return TravelCrew(llm_provider=llm_provider)
+
+
+async def _warm_crew() -> None:
+    try:
+        crew = await run_in_threadpool(_get_crew, None)
+        await run_in_threadpool(prewarm, crew.llm_provider_name)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Could not warm default TravelCrew: %s", e)
+
+
+def _plan_trip(query: str, llm_provider: str | None) -> dict:
+    travel_crew = _get_crew(llm_provider)
+    result = travel_crew.plan_trip(query)
+
+    # Add the provider info to the response
+    result["llm_provider"] = travel_crew.llm_provider_name
+    return result
+
+
+def _plan_trip_batch(items: list[tuple[str, str | None]]) -> list[dict | Exception]:
+    """Run a batch of (query, provider) items with one plan_trip_batch call per provider."""
+    results: list[dict | Exception] = [{}] * len(items)
+    by_provider: dict[str | None, list[int]] = {}
+    for i, (_, llm_provider) in enumerate(items):
+        by_provider.setdefault(llm_provider, []).append(i)
+
+    for llm_provider, indices in by_provider.items():
+        try:
+            travel_crew = _get_crew(llm_provider)
+        except Exception as e:  # noqa: BLE001
+            for i in indices:
+                results[i] = e
+            continue
+        batch = travel_crew.plan_trip_batch([items[i][0] for i in indices])
+        for i, result in zip(indices, batch, strict=True):
+            if isinstance(result, dict):
+                result["llm_provider"] = travel_crew.llm_provider_name
+            results[i] = result
+    return results
+
+
+async def _run_plan_batch(items: list[tuple[str, str | None]]) -> list[dict | Exception]:
+    return await run_in_threadpool(_plan_trip_batch, items)
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
-    application = FastAPI(title=settings.app_name)
+    plan_batcher = (
+        MicroBatcher(
+            _run_plan_batch,
+            max_batch=settings.plan_batch_max,
+            window_ms=settings.plan_batch_window_ms,
+        )
+        if settings.plan_batch_window_ms > 0
+        else None
+    )
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter.total_tokens = settings.threadpool_size
+        # Warm the default crew in the background so startup is not held up by imports
+        warmup = asyncio.create_task(_warm_crew())
+        if settings.plan_cache_redis:
+            plan_store.shared = RedisPlanCache.from_url(
+                settings.redis_url, ttl=settings.plan_cache_ttl
+            )
+        if plan_batcher is not None:
+            plan_batcher.start()
+        yield
+        warmup.cancel()
+        if plan_batcher is not None:
+            await plan_batcher.stop()
+        if plan_store.shared is not None:
+            await plan_store.shared.close()
+            plan_store.shared = None
+        await close_llm_http()
+
+    application = FastAPI(
+        title=settings.app_name, lifespan=lifespan, default_response_class=ORJSONResponse
+    )
+    install_error_handlers(application)
+    plan_store = PlanStore(
+        TTLCache(maxsize=settings.plan_cache_size, ttl=settings.plan_cache_ttl),
+        negative_ttl=settings.plan_negative_ttl,
+    )
 
-    origins = [o.strip() for o in settings.cors_origins.split(",") if o.strip()]
     application.add_middleware(
         CORSMiddleware,
-        allow_origins=origins or ["*"],
+        allow_origins=settings.cors_origins_list,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -39,40 +169,56 @@ def create_app() -> FastAPI:
 
     @application.get("/healthz")
     def healthcheck() -> dict:
-        try:
-            version = importlib.metadata.version("project_hermes")
-        except importlib.metadata.PackageNotFoundError:
-            version = "0.0.0"
-        return {"status": "ok", "version": version, "env": settings.environment}
-
-    @application.post("/travel/plan", response_model=TravelResponse)
-    async def plan_travel(request: TravelRequest) -> TravelResponse:
-        from project_hermes.crews.travel_crew.travel_crew import TravelCrew
+        return {"status": "ok", "version": _VERSION, "env": settings.environment}
+
+    # Response models are documented via ``responses`` only: results are built
+    # internally with the declared types, so FastAPI's validate+encode pass is skipped.
+    # The request body is likewise validated straight from bytes.
+    @application.post(
+        "/travel/plan",
+        responses={200: {"model": TravelResponse}},
+        openapi_extra=json_body_openapi(TravelRequest),
+    )
+    async def plan_travel(raw_request: Request) -> ORJSONResponse:
+        request = await parse_json_body(raw_request, TravelRequest)
+        cache_key = plan_cache_key(request.query, request.llm_provider)
 
-        travel_crew = TravelCrew(verbose=True, llm_provider=request.llm_provider)
-        result = travel_crew.plan_trip(request.query)
+        async def _generate() -> dict:
+            if plan_batcher is not None:
+                return await plan_batcher.submit((request.query, request.llm_provider))
+            # plan_trip blocks for the whole LLM pipeline; run it off the event loop
+            return await run_in_threadpool(_plan_trip, request.query, request.llm_provider)
 
-        # Add the provider info to the response
-        if hasattr(travel_crew.llm, "__class__"):
-            llm_type = travel_crew.llm.__class__.__name__
-            result["llm_provider"] = llm_type
+        result = await plan_store.get_or_create(cache_key, _generate)
+        return ORJSONResponse(content=result)
 
-        return TravelResponse(**result)
+    @application.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> str:
+        return plan_store.metrics()
 
     # Keep existing poem endpoint for backward compatibility
-    from project_hermes.main import run_flow
-
-    @application.get("/poem/{prompt}")
-    def generate_poem(prompt: str):
-        state = run_flow(prompt)
-        return {
-            "poem": state.poem,
-            "topic": state.topic,
-            "model": state.model_used,
-            "attempts": state.attempts,
-            "success": state.success,
-            "error": state.error_message,
-        }
+    from project_hermes.main import arun_flow, stream_flow
+
+    # Async so a waiting request holds no threadpool worker; only the crew kickoff
+    # itself runs in a thread
+    @application.get("/poem/{prompt}", responses={200: {"model": PoemResponse}})
+    async def generate_poem(prompt: str) -> ORJSONResponse:
+        state = await arun_flow(prompt)
+        return ORJSONResponse(
+            content={
+                "poem": state.poem,
+                "topic": state.topic,
+                "model": state.model_used,
+                "attempts": state.attempts,
+                "success": state.success,
+                "error": state.error_message,
+            }
+        )
+
+    @application.get("/poem/{prompt}/stream", response_class=StreamingResponse)
+    async def stream_poem(prompt: str) -> StreamingResponse:
+        """Like /poem/{prompt}, but sends the poem text as it is generated."""
+        return StreamingResponse(stream_flow(prompt), media_type="text/plain; charset=utf-8")
 
     return application
 
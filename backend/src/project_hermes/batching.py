@@ -0,0 +1,109 @@
+"""Micro-batching of requests that arrive within a short window."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collect submissions for up to ``window_ms`` (or ``max_batch`` items) and hand
+    them to ``handler`` as one batch.
+
+    ``handler`` returns one result per item, in order; an item whose result is an
+    exception instance has that exception raised to its submitter.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[T]], Awaitable[Sequence[R | BaseException]]],
+        max_batch: int = 8,
+        window_ms: float = 25.0,
+    ):
+        self._handler = handler
+        self.max_batch = max(1, max_batch)
+        self.window = window_ms / 1000
+        self._queue: asyncio.Queue[tuple[T, asyncio.Future[R]]] | None = None
+        self._consumer: asyncio.Task[None] | None = None
+        self._dispatches: set[asyncio.Task[None]] = set()
+
+    def start(self) -> None:
+        """Start the consumer task on the running event loop."""
+        if self._consumer is None:
+            self._queue = asyncio.Queue()
+            self._consumer = asyncio.create_task(self._consume())
+
+    async def stop(self) -> None:
+        """Stop consuming; submissions still queued or in a running batch fail with
+        ``RuntimeError`` instead of leaving their submitters waiting."""
+        tasks = list(self._dispatches)
+        if self._consumer is not None:
+            tasks.append(self._consumer)
+            self._consumer = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._fail([self._queue.get_nowait()])
+            self._queue = None
+
+    async def submit(self, item: T) -> R:
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher.start() has not been called")
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _consume(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        batch: list[tuple[T, asyncio.Future[Any]]] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.window
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:  # not the builtin until Python 3.11  # noqa: UP041
+                        break
+                # Run the batch in the background so the next window starts filling now
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+                batch = []
+        except asyncio.CancelledError:
+            self._fail(batch)
+            raise
+
+    async def _dispatch(self, batch: list[tuple[T, asyncio.Future[Any]]]) -> None:
+        try:
+            results = await self._handler([item for item, _ in batch])
+        except asyncio.CancelledError:
+            self._fail(batch)
+            raise
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Batch of %d failed: %s", len(batch), e)
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(batch: list[tuple[T, asyncio.Future[Any]]]) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher stopped"))
@@ -0,0 +1,168 @@
+"""In-process caches for LLM-backed responses."""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from project_hermes.errors import PlanError, is_rate_limit
+
+T = TypeVar("T")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so trivially different queries share a key."""
+    return " ".join(query.split()).lower()
+
+
+def plan_cache_key(query: str, llm_provider: str | None) -> tuple[str, str]:
+    """Cache key for a travel plan: (provider, digest of the normalized query)."""
+    digest = hashlib.blake2b(normalize_query(query).encode("utf-8"), digest_size=16)
+    return (llm_provider or "auto", digest.hexdigest())
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after insertion."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """Coalesce concurrent async calls that share a key into a single execution.
+
+    The first caller for a key starts ``fn()`` as a task; callers arriving while it
+    is still running await the same task. The work is shielded, so a cancelled
+    caller (e.g. a dropped client) does not cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        # No await between lookup and insert, so this is atomic on the event loop
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class PlanStore:
+    """Travel plan lookup: per-worker ``TTLCache``, then an optional shared cache
+    (see ``shared_cache.RedisPlanCache``), then ``fn()``.
+
+    Concurrent misses for one key are coalesced within the worker, and across
+    workers through the shared cache's lease lock. Only successful plans are cached.
+    Failures are raised as ``PlanError``; a rate-limited provider is remembered for
+    ``negative_ttl`` seconds and fails fast instead of hitting the LLM again.
+    """
+
+    def __init__(self, local: TTLCache, shared: Any = None, negative_ttl: float = 30.0):
+        self.local = local
+        self.shared = shared
+        self.inflight = SingleFlight()
+        self.throttled = TTLCache(maxsize=64, ttl=negative_ttl)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: tuple[str, str]) -> dict | None:
+        """The cached plan for ``key``, counting the hit or miss."""
+        cached = self.local.get(key)
+        if cached is None and self.shared is not None:
+            cached = await self.shared.get(key)
+            if cached is not None:
+                self.local.set(key, cached)
+        if cached is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return cached
+
+    async def set(self, key: tuple[str, str], result: dict) -> None:
+        """Cache ``result`` locally and in the shared cache, if it is a successful plan."""
+        if result.get("success"):
+            self.local.set(key, result)
+            if self.shared is not None:
+                await self.shared.set(key, result)
+
+    async def get_or_create(
+        self, key: tuple[str, str], fn: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        provider = key[0]
+        throttled = self.throttled.get(provider)
+        if throttled is not None:
+            raise PlanError(provider, throttled)
+        try:
+            return await self.inflight.do(key, lambda: self._create(key, fn))
+        except Exception as e:
+            if is_rate_limit(e):
+                self.throttled.set(provider, e)
+            raise PlanError(provider, e) from e
+
+    async def _create(self, key: tuple[str, str], fn: Callable[[], Awaitable[dict]]) -> dict:
+        shared = self.shared
+        if shared is not None and not await shared.acquire(key):
+            # Another worker is generating this plan; reuse its result if it stores one
+            result = await shared.wait(key)
+            if result is not None:
+                self.local.set(key, result)
+                return result
+            return await self._create(key, fn)
+        try:
+            result = await fn()
+            await self.set(key, result)
+            return result
+        finally:
+            if shared is not None:
+                await shared.release(key)
+
+    def metrics(self) -> str:
+        """Counters in the Prometheus text exposition format (per worker)."""
+        return (
+            "# TYPE cache_hits_total counter\n"
+            f"cache_hits_total {self.hits}\n"
+            "# TYPE cache_misses_total counter\n"
+            f"cache_misses_total {self.misses}\n"
+        )
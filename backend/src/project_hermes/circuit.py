@@ -0,0 +1,68 @@
+"""Per-key circuit breakers for LLM providers that are failing."""
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+
+class State(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """The circuit for ``key`` is open; the call was not attempted."""
+
+    def __init__(self, key: str):
+        super().__init__(f"Circuit open for {key}")
+        self.key = key
+
+
+@dataclass
+class CircuitState:
+    state: State = State.CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+
+
+class CircuitBreaker:
+    """Closed until ``threshold`` consecutive failures, then open for ``break_seconds``.
+
+    After the break the circuit is half-open: the next call is let through, and one
+    more failure re-opens it while a success closes it.
+    """
+
+    def __init__(self, threshold: int = 5, break_seconds: float = 30.0):
+        self.threshold = max(1, threshold)
+        self.break_seconds = break_seconds
+        self._circuits: dict[str, CircuitState] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state is not State.OPEN:
+                return True
+            if time.monotonic() - circuit.opened_at < self.break_seconds:
+                return False
+            circuit.state = State.HALF_OPEN
+            return True
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            self._circuits.pop(key, None)
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(key, CircuitState())
+            circuit.failures += 1
+            if circuit.state is State.HALF_OPEN or circuit.failures >= self.threshold:
+                circuit.state = State.OPEN
+                circuit.opened_at = time.monotonic()
+
+    def state(self, key: str) -> State:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return State.CLOSED if circuit is None else circuit.state
@@ -1,9 +1,11 @@
-from crewai import Agent, Crew, Process, Task
+from crewai import LLM, Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 from dotenv import load_dotenv
 
+from project_hermes.logging import VERBOSE
+
 load_dotenv()
 
 # If you want to run a snippet of code before or after the crew starts,
@@ -24,12 +26,17 @@ class PoemCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self, model: str | None = None):
+        # Replaces the YAML `llm` of the writer, e.g. for the flow's fallback models
+        self.model = model
+
     # If you would lik to add tools to your crew, you can learn more about it here:
     # https://docs.crewai.com/concepts/agents#agent-tools
     @agent
     def poem_writer(self) -> Agent:
         return Agent(
             config=self.agents_config["poem_writer"],  # type: ignore[index]
+            llm=LLM(model=self.model) if self.model else None,
         )
 
     # To learn more about structured task outputs,
@@ -51,5 +58,5 @@ class PoemCrew:
             agents=self.agents,  # Automatically created by the @agent decorator
             tasks=self.tasks,  # Automatically created by the @task decorator
             process=Process.sequential,
-            verbose=True,
+            verbose=VERBOSE,
         )
@@ -1,7 +1,10 @@
 import logging
+from typing import Any, ClassVar
 
 from crewai import Agent
 
+from project_hermes.logging import VERBOSE
+
 from .utils import get_prompt_library
 
 logger = logging.getLogger(__name__)
@@ -10,136 +13,121 @@ logger = logging.getLogger(__name__)
 class BaseAgent:
     """Base class for all travel crew agents."""
 
-    def __init__(self, verbose: bool = True):
-        self.prompt_lib = get_prompt_library()
+    # (name, prompt_key, role, goal, backstory)
+    AGENT_SPEC: ClassVar[tuple[str, str, str, str, str]]
+
+    def __init__(self, verbose: bool = VERBOSE):
         self.verbose = verbose
+        self.agent = self.build(verbose)
+
+    @classmethod
+    def build(cls, verbose: bool = VERBOSE) -> Agent:
+        """Create the agent with its prompt from the prompt library.
+
+        Agents hold per-run state, so each call returns a new one; only the
+        constant keyword arguments are cached.
+        """
+        return Agent(**_agent_kwargs(cls), tools=[], verbose=verbose)
+
+
+# Constant Agent keyword arguments per agent class, built on first use
+_AGENT_KWARGS: dict[type[BaseAgent], dict[str, Any]] = {}
+
 
-    def create_agent(
-        self,
-        name: str,
-        prompt_key: str,
-        role: str,
-        goal: str,
-        backstory: str,
-        tools: list | None = None,
-    ) -> Agent:
-        """Create an agent with a prompt from the prompt library."""
-        prompt = self.prompt_lib.get_prompt_text(prompt_key)
-
-        return Agent(
-            name=name,
-            prompt_template=prompt,
-            role=role,
-            goal=goal,
-            backstory=backstory,
-            tools=tools or [],
-            verbose=self.verbose,
-        )
+def _agent_kwargs(cls: type[BaseAgent]) -> dict[str, Any]:
+    kwargs = _AGENT_KWARGS.get(cls)
+    if kwargs is None:
+        name, prompt_key, role, goal, backstory = cls.AGENT_SPEC
+        # Racing first calls build equal dicts, so the last write is harmless
+        kwargs = _AGENT_KWARGS[cls] = {
+            "name": name,
+            "prompt_template": get_prompt_library().get_prompt_text(prompt_key),
+            "role": role,
+            "goal": goal,
+            "backstory": backstory,
+        }
+    return kwargs
 
 
 class ConfidenceAgent(BaseAgent):
     """Agent that determines if a prompt is travel-related."""
 
-    def __init__(self, verbose: bool = True):
-        super().__init__(verbose=verbose)
-        self.agent = self.create_agent(
-            name="Confidence Analyzer",
-            prompt_key="confidence_agent",
-            role="Gatekeeper",
-            goal="Determine if queries are travel-related",
-            backstory=(
-                "I analyze incoming queries to determine if they are relevant to travel planning."
-            ),
-        )
+    AGENT_SPEC = (
+        "Confidence Analyzer",
+        "confidence_agent",
+        "Gatekeeper",
+        "Determine if queries are travel-related",
+        "I analyze incoming queries to determine if they are relevant to travel planning.",
+    )
 
 
 class OrchestratorAgent(BaseAgent):
     """Agent that orchestrates the travel planning process."""
 
-    def __init__(self, verbose: bool = True):
-        super().__init__(verbose=verbose)
-        self.agent = self.create_agent(
-            name="Orchestrator",
-            prompt_key="orchestrator_agent",
-            role="Conductor",
-            goal="Break down travel requests and synthesize specialist findings",
-            backstory="I manage the crew and ensure a cohesive travel plan.",
-        )
+    AGENT_SPEC = (
+        "Orchestrator",
+        "orchestrator_agent",
+        "Conductor",
+        "Break down travel requests and synthesize specialist findings",
+        "I manage the crew and ensure a cohesive travel plan.",
+    )
 
 
 class InfoAgent(BaseAgent):
     """Agent that gathers location-specific information."""
 
-    def __init__(self, verbose: bool = True):
-        super().__init__(verbose=verbose)
-        self.agent = self.create_agent(
-            name="Information Specialist",
-            prompt_key="info_crew",
-            role="Local Expert",
-            goal="Gather real-time, location-specific information",
-            backstory=(
-                "I provide weather forecasts, local news, and travel advisories for destinations."
-            ),
-        )
+    AGENT_SPEC = (
+        "Information Specialist",
+        "info_crew",
+        "Local Expert",
+        "Gather real-time, location-specific information",
+        "I provide weather forecasts, local news, and travel advisories for destinations.",
+    )
 
 
 class SafetyAgent(BaseAgent):
     """Agent that ensures traveler safety."""
 
-    def __init__(self, verbose: bool = True):
-        super().__init__(verbose=verbose)
-        self.agent = self.create_agent(
-            name="Safety Guardian",
-            prompt_key="safety_crew",
-            role="Guardian",
-            goal="Ensure traveler safety",
-            backstory=(
-                "I provide emergency contacts, identify risk areas, and suggest travel insurance."
-            ),
-        )
+    AGENT_SPEC = (
+        "Safety Guardian",
+        "safety_crew",
+        "Guardian",
+        "Ensure traveler safety",
+        "I provide emergency contacts, identify risk areas, and suggest travel insurance.",
+    )
 
 
 class ExperienceAgent(BaseAgent):
     """Agent that personalizes travel experiences."""
 
-    def __init__(self, verbose: bool = True):
-        super().__init__(verbose=verbose)
-        self.agent = self.create_agent(
-            name="Experience Curator",
-            prompt_key="experience_crew",
-            role="Curator",
-            goal="Personalize travel experiences",
-            backstory=(
-                "I recommend restaurants, attractions, and local experiences based on preferences."
-            ),
-        )
+    AGENT_SPEC = (
+        "Experience Curator",
+        "experience_crew",
+        "Curator",
+        "Personalize travel experiences",
+        "I recommend restaurants, attractions, and local experiences based on preferences.",
+    )
 
 
 class LogisticAgent(BaseAgent):
     """Agent that manages travel logistics."""
 
-    def __init__(self, verbose: bool = True):
-        super().__init__(verbose=verbose)
-        self.agent = self.create_agent(
-            name="Logistics Planner",
-            prompt_key="logistic_crew",
-            role="Planner",
-            goal="Manage travel and accommodation logistics",
-            backstory="I find flight and hotel options and plan efficient routes.",
-        )
+    AGENT_SPEC = (
+        "Logistics Planner",
+        "logistic_crew",
+        "Planner",
+        "Manage travel and accommodation logistics",
+        "I find flight and hotel options and plan efficient routes.",
+    )
 
 
 class FinanceAgent(BaseAgent):
     """Agent that manages the trip budget."""
 
-    def __init__(self, verbose: bool = True):
-        super().__init__(verbose=verbose)
-        self.agent = self.create_agent(
-            name="Finance Manager",
-            prompt_key="finance_agent",
-            role="Accountant",
-            goal="Manage the trip budget",
-            backstory=(
-                "I allocate funds, flag over-budget suggestions, and provide spending reports."
-            ),
-        )
+    AGENT_SPEC = (
+        "Finance Manager",
+        "finance_agent",
+        "Accountant",
+        "Manage the trip budget",
+        "I allocate funds, flag over-budget suggestions, and provide spending reports.",
+    )
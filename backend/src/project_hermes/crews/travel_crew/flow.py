@@ -1,8 +1,19 @@
-import json
-
-from crewai import Crew
+import asyncio
+import os
+import re
+from collections.abc import Callable
+from functools import cached_property, lru_cache
+from typing import Any
+
+import orjson
+from crewai import LLM, Agent, Crew, Process, Task
 from crewai.flow import Flow, listen, start
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, with_config
+from typing_extensions import TypedDict
+
+from project_hermes.cache import normalize_query
+from project_hermes.errors import is_transient
+from project_hermes.logging import VERBOSE
 
 from .agents import (
     ConfidenceAgent,
@@ -13,6 +24,7 @@ from .agents import (
     OrchestratorAgent,
     SafetyAgent,
 )
+from .streaming import JSONSectionScanner, stream_chunks
 from .tasks import (
     ConfidenceTask,
     ExperienceTask,
@@ -22,9 +34,107 @@ from .tasks import (
     OrchestratorTask,
     SafetyTask,
 )
+from .utils import get_confidence_classifier, get_exact_cache, get_semantic_cache
+
+
+class ConfidenceResult(TypedDict, total=False):
+    score: float
+    prompt: str
+
+
+@with_config(ConfigDict(extra="allow"))
+class QueryBreakdown(TypedDict, total=False):
+    budget: float
+    preferences: dict[str, Any]
+
+
+# Crew outputs are decoded and validated straight from the raw text
+_JSON_OBJECT = TypeAdapter(dict[str, Any])
+_CONFIDENCE = TypeAdapter(ConfidenceResult)
+_BREAKDOWN = TypeAdapter(QueryBreakdown)
+
+# Local classifier probabilities at or beyond these bounds skip the confidence LLM call.
+# Opt-in (TRAVEL_LOCAL_CONFIDENCE=1): the prototype classifier is not a trained model
+# and misjudges mixed queries, so by default every query goes to the LLM
+LOCAL_CONFIDENCE = os.getenv("TRAVEL_LOCAL_CONFIDENCE", "0") == "1"
+LOCAL_CONFIDENCE_HIGH = 0.85
+LOCAL_CONFIDENCE_LOW = 0.2
+
+# Reusing step outputs across flows is opt-in. Only the confidence score (the
+# query's topic) is shared between similar queries; breakdowns and plans carry the
+# query's durations, dates and budgets, so they are only reused for the same text
+SEMANTIC_CACHE = os.getenv("SEMANTIC_CACHE", "0") == "1"
+_SIMILARITY_NAMESPACES = frozenset({"confidence"})
+
+_SCORE_RE = re.compile(r'"score"\s*:\s*([0-9]*\.?[0-9]+)')
+
+# Upper bound on each specialist's crew run, in seconds
+SPECIALIST_TIMEOUT = 60.0
+# Attempts per specialist before its error reaches synthesis, and the first backoff
+# delay in seconds (doubled after each failed attempt)
+SPECIALIST_ATTEMPTS = 3
+SPECIALIST_BACKOFF = 0.5
+# Fewest specialist results worth synthesizing a (partial) plan from
+MIN_SPECIALIST_RESULTS = 2
+# Send the specialist prompts straight to an OpenAI-compatible endpoint as one batch
+# instead of one Crew per specialist
+BATCH_SPECIALISTS = os.getenv("TRAVEL_BATCH_SPECIALISTS") == "1"
+
+
+class BatchedSpecialistStep:
+    """Issue the specialist prompts as one batch of concurrent chat completions.
+
+    Bypasses ``Crew``: the specialists have no tools and differ only in their system
+    prompt and task, so each becomes a plain ``[system, user]`` message pair sent over
+    one shared ``AsyncOpenAI`` client (kept-alive connections, and co-scheduled
+    prefills on batching servers such as vLLM behind ``OPENAI_BASE_URL``).
+    """
+
+    def __init__(self, client: Any = None, timeout: float = SPECIALIST_TIMEOUT):
+        self._client = client
+        self.timeout = timeout
+
+    @staticmethod
+    def messages(agent: Agent, task: Task) -> list[dict[str, str]]:
+        system = f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"
+        user = f"{task.description}\n\nExpected output: {task.expected_output}"
+        return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+    @staticmethod
+    def model_for(agent: Agent) -> str:
+        model: str = (
+            getattr(agent.llm, "model", None) or os.getenv("OPENAI_MODEL_NAME") or "gpt-4o-mini"
+        )
+        return model.removeprefix("openai/")
+
+    async def run(self, jobs: list[tuple[Agent, Task]]) -> list[Any]:
+        """Parsed JSON per job, in order; a failed or timed-out job yields its exception."""
+        if self._client is None:
+            self._client = _openai_client()
+        return await asyncio.gather(
+            *(asyncio.wait_for(self._complete(agent, task), self.timeout) for agent, task in jobs),
+            return_exceptions=True,
+        )
+
+    async def _complete(self, agent: Agent, task: Task) -> Any:
+        response = await self._client.chat.completions.create(
+            model=self.model_for(agent), messages=self.messages(agent, task), n=1
+        )
+        return _JSON_OBJECT.validate_json(response.choices[0].message.content or "")
+
+
+@lru_cache(maxsize=1)
+def _openai_client() -> Any:
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI()
 
 
 class TravelState(BaseModel):
+    # Steps assign already-typed values; keep per-assignment validation off explicitly
+    # (CrewAI flows require a BaseModel or dict state, so this stays pydantic)
+    model_config = ConfigDict(validate_assignment=False, arbitrary_types_allowed=True)
+
     query: str = ""
     confidence_score: float = 0.0
     query_breakdown: dict | None = None
@@ -38,218 +148,324 @@ class TravelState(BaseModel):
     success: bool = True
     budget: float = 0.0
     preferences: dict | None = None
+    missing: list[str] = []  # specialist sections left out of a partial plan
+    no_cache: bool = False  # bypass the semantic cache (e.g. sensitive prompts)
 
 
 class TravelFlow(Flow[TravelState]):
-    @start()
-    def analyze_confidence(self) -> None:
-        agent = ConfidenceAgent().agent
-        task = ConfidenceTask().create_confidence_task(agent=agent, query=self.state.query)
-
-        # Create a crew with just the confidence agent and task
-        confidence_crew = Crew(agents=[agent], tasks=[task], verbose=True)
-
-        # Run the crew to get the result
-        result = confidence_crew.kickoff()
-
+    # Optional ``on_section(key, value)`` callback: receives each top-level section
+    # of the final plan while synthesis is still streaming
+    on_section: Callable[[str, Any], None] | None = None
+    _crew: Crew | None = None
+
+    # Agents are built on first use and reused for the rest of this flow run
+    # (the orchestrator serves both breakdown and synthesis)
+    @cached_property
+    def confidence_agent(self) -> Agent:
+        return ConfidenceAgent.build()
+
+    @cached_property
+    def orchestrator_agent(self) -> Agent:
+        return OrchestratorAgent.build()
+
+    @cached_property
+    def info_agent(self) -> Agent:
+        return InfoAgent.build()
+
+    @cached_property
+    def safety_agent(self) -> Agent:
+        return SafetyAgent.build()
+
+    @cached_property
+    def experience_agent(self) -> Agent:
+        return ExperienceAgent.build()
+
+    @cached_property
+    def logistic_agent(self) -> Agent:
+        return LogisticAgent.build()
+
+    @cached_property
+    def finance_agent(self) -> Agent:
+        return FinanceAgent.build()
+
+    def reset(self, state: TravelState | None = None) -> None:
+        """Start the next run from ``state`` (or a fresh one), keeping the built
+        agents and crew."""
+        self._state = state if state is not None else self._create_initial_state()
+        self._method_execution_counts.clear()
+
+    def _crew_for(self, agent: Agent, task: Task) -> Crew:
+        """The flow's one crew for its sequential steps, pointed at ``agent``/``task``.
+
+        Built on the first step and re-targeted afterwards, so the steps do not each
+        pay for Crew validation and setup.
+        """
+        crew = self._crew
+        if crew is None:
+            crew = self._crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=VERBOSE,
+                memory=False,
+                cache=True,
+            )
+        else:
+            crew.agents = [agent]
+            crew.tasks = [task]
+        return crew
+
+    def _parse(self, result: Any, schema: TypeAdapter, what: str) -> Any:
+        """Decode and validate a crew result in one pass.
+
+        Dict results (JSON-mode LLMs, mocks) skip decoding and are only validated.
+        On failure the error is recorded on the state and ``None`` is returned.
+        """
         try:
-            parsed = json.loads(result)
-            self.state.confidence_score = float(parsed.get("score", 0))
-        except Exception as e:
-            self.state.error = f"Failed to parse confidence score: {str(e)}"
-            self.state.confidence_score = 0
+            if isinstance(result, dict):
+                return schema.validate_python(result)
+            return schema.validate_json(str(result))
+        except ValidationError as e:
+            self.state.error = f"Failed to parse {what}: {e}"
             self.state.success = False
+            return None
 
-    @listen(analyze_confidence)
-    def breakdown_query(self) -> None:
-        # Skip this step if confidence score is too low
-        if self.state.confidence_score < 0.6:
-            return
-
-        agent = OrchestratorAgent().agent
-        task = OrchestratorTask().create_breakdown_task(agent=agent, query=self.state.query)
-
-        # Create a crew with just this agent and task
-        crew = Crew(agents=[agent], tasks=[task], verbose=True)
+    def _cache_get(self, namespace: str, text: str) -> Any:
+        if self.state.no_cache or not SEMANTIC_CACHE:
+            return None
+        if namespace in _SIMILARITY_NAMESPACES:
+            return get_semantic_cache().get(namespace, text)
+        return get_exact_cache().get((namespace, normalize_query(text)))
 
-        # Run the crew to get the result
-        result = crew.kickoff()
-
-        try:
-            self.state.query_breakdown = json.loads(result)
-
-            # Extract budget and preferences from breakdown
-            if self.state.query_breakdown:
-                self.state.budget = float(self.state.query_breakdown.get("budget", 0))
-                self.state.preferences = self.state.query_breakdown.get("preferences", {})
-        except Exception as e:
-            self.state.error = f"Failed to parse query breakdown: {str(e)}"
-            self.state.success = False
-
-    @listen(breakdown_query)
-    def gather_info(self) -> None:
-        # Skip if previous step was skipped or failed
-        if not self.state.query_breakdown:
+    def _cache_set(self, namespace: str, text: str, value: Any) -> None:
+        if self.state.no_cache or not SEMANTIC_CACHE:
             return
+        if namespace in _SIMILARITY_NAMESPACES:
+            get_semantic_cache().set(namespace, text, value)
+        else:
+            get_exact_cache().set((namespace, normalize_query(text)), value)
 
-        agent = InfoAgent().agent
-        task = InfoTask().create_info_task(
-            agent=agent,
-            query=self.state.query,
-            destination=self.state.query_breakdown.get("destination", ""),
-            activities=self.state.query_breakdown.get("activities", []),
-        )
-
-        # Create a crew with just this agent and task
-        crew = Crew(agents=[agent], tasks=[task], verbose=True)
+    def _apply_breakdown(self, breakdown: dict) -> None:
+        self.state.query_breakdown = breakdown
 
-        # Run the crew to get the result
-        result = crew.kickoff()
+        # Extract budget and preferences from breakdown
+        if self.state.query_breakdown:
+            self.state.budget = float(self.state.query_breakdown.get("budget", 0))
+            self.state.preferences = self.state.query_breakdown.get("preferences", {})
 
-        try:
-            self.state.info_results = json.loads(result)
-        except Exception as e:
-            self.state.error = f"Failed to parse info results: {str(e)}"
-            self.state.success = False
-
-    @listen(breakdown_query)
-    def assess_safety(self) -> None:
-        # Skip if previous step was skipped or failed
-        if not self.state.query_breakdown:
+    @start()
+    def analyze_confidence(self) -> None:
+        cached = self._cache_get("confidence", self.state.query)
+        if cached is not None:
+            self.state.confidence_score = cached
             return
 
-        agent = SafetyAgent().agent
-        task = SafetyTask().create_safety_task(
-            agent=agent, location_data=self.state.query_breakdown.get("locations", {})
-        )
+        # Clear-cut queries are settled locally; only the ambiguous band costs an LLM call
+        if LOCAL_CONFIDENCE:
+            probability = get_confidence_classifier().predict(self.state.query)
+            if probability >= LOCAL_CONFIDENCE_HIGH or probability <= LOCAL_CONFIDENCE_LOW:
+                self.state.confidence_score = probability
+                return
+
+        agent = self.confidence_agent
+        task = ConfidenceTask.create_confidence_task(agent=agent, query=self.state.query)
+
+        # Run the confidence agent and task on the flow's crew
+        result = self._crew_for(agent, task).kickoff()
+
+        # Only the score is needed: pull it out directly, decoding the JSON only
+        # when the output is not in the expected shape
+        match = None if isinstance(result, dict) else _SCORE_RE.search(str(result))
+        if match is not None:
+            self.state.confidence_score = float(match[1])
+        else:
+            parsed = self._parse(result, _CONFIDENCE, "confidence score")
+            if parsed is None:
+                self.state.confidence_score = 0
+                return
+            self.state.confidence_score = parsed.get("score", 0.0)
+        self._cache_set("confidence", self.state.query, self.state.confidence_score)
 
-        # Create a crew with just this agent and task
-        crew = Crew(agents=[agent], tasks=[task], verbose=True)
-
-        # Run the crew to get the result
-        result = crew.kickoff()
-
-        try:
-            self.state.safety_results = json.loads(result)
-        except Exception as e:
-            self.state.error = f"Failed to parse safety results: {str(e)}"
-            self.state.success = False
-
-    @listen(breakdown_query)
-    def curate_experiences(self) -> None:
-        # Skip if previous step was skipped or failed
-        if not self.state.query_breakdown:
+    @listen(analyze_confidence)
+    def breakdown_query(self) -> None:
+        # Skip this step if confidence score is too low
+        if self.state.confidence_score < 0.6:
             return
 
-        agent = ExperienceAgent().agent
-        task = ExperienceTask().create_experience_task(
-            agent=agent,
-            preferences=self.state.preferences,
-            location_data=self.state.query_breakdown.get("locations", {}),
-        )
-
-        # Create a crew with just this agent and task
-        crew = Crew(agents=[agent], tasks=[task], verbose=True)
-
-        # Run the crew to get the result
-        result = crew.kickoff()
-        try:
-            self.state.experience_results = json.loads(result)
-        except Exception as e:
-            self.state.error = f"Failed to parse experience results: {str(e)}"
-            self.state.success = False
-
-    @listen(breakdown_query)
-    def plan_logistics(self) -> None:
-        # Skip if previous step was skipped or failed
-        if not self.state.query_breakdown:
+        cached = self._cache_get("breakdown", self.state.query)
+        if cached is not None:
+            self._apply_breakdown(cached)
             return
 
-        agent = LogisticAgent().agent
-        task = LogisticTask().create_logistic_task(
-            agent=agent,
-            travel_details={
-                "dates": self.state.query_breakdown.get("dates", {}),
-                "locations": self.state.query_breakdown.get("locations", {}),
-                "travelers": self.state.query_breakdown.get("travelers", {}),
-            },
-        )
-
-        # Create a crew with just this agent and task
-        crew = Crew(agents=[agent], tasks=[task], verbose=True)
+        agent = self.orchestrator_agent
+        task = OrchestratorTask.create_breakdown_task(agent=agent, query=self.state.query)
 
         # Run the crew to get the result
-        result = crew.kickoff()
+        result = self._crew_for(agent, task).kickoff()
 
-        try:
-            self.state.logistic_results = json.loads(result)
-        except Exception as e:
-            self.state.error = f"Failed to parse logistic results: {str(e)}"
-            self.state.success = False
+        breakdown = self._parse(result, _BREAKDOWN, "query breakdown")
+        if breakdown is None:
+            return
+        self._apply_breakdown(breakdown)
+        self._cache_set("breakdown", self.state.query, self.state.query_breakdown)
+
+    def _specialist_jobs(self) -> list[tuple[str, Agent, Task]]:
+        """(state field, agent, task) for each specialist; they only depend on the
+        query breakdown, not on each other."""
+        breakdown = self.state.query_breakdown or {}
+        locations = breakdown.get("locations", {})
+        return [
+            (
+                "info_results",
+                self.info_agent,
+                InfoTask.create_info_task(
+                    agent=self.info_agent,
+                    query=self.state.query,
+                    destination=breakdown.get("destination", ""),
+                    activities=breakdown.get("activities", []),
+                ),
+            ),
+            (
+                "safety_results",
+                self.safety_agent,
+                SafetyTask.create_safety_task(agent=self.safety_agent, location_data=locations),
+            ),
+            (
+                "experience_results",
+                self.experience_agent,
+                ExperienceTask.create_experience_task(
+                    agent=self.experience_agent,
+                    preferences=self.state.preferences,
+                    location_data=locations,
+                ),
+            ),
+            (
+                "logistic_results",
+                self.logistic_agent,
+                LogisticTask.create_logistic_task(
+                    agent=self.logistic_agent,
+                    travel_details={
+                        "dates": breakdown.get("dates", {}),
+                        "locations": locations,
+                        "travelers": breakdown.get("travelers", {}),
+                    },
+                ),
+            ),
+            (
+                "finance_results",
+                self.finance_agent,
+                FinanceTask.create_finance_task(
+                    agent=self.finance_agent,
+                    budget=self.state.budget,
+                    expenses=breakdown.get("expected_expenses", {}),
+                ),
+            ),
+        ]
+
+    @staticmethod
+    async def _run_specialist(agent: Agent, task: Task) -> dict:
+        # Specialists run concurrently, so each gets its own crew
+        crew = Crew(agents=[agent], tasks=[task], verbose=VERBOSE)
+
+        async def attempt() -> dict:
+            result = await asyncio.wait_for(crew.kickoff_async(), timeout=SPECIALIST_TIMEOUT)
+            return _JSON_OBJECT.validate_json(str(result))
+
+        # Retry transient provider errors with exponential backoff; a timeout has
+        # already used the whole budget, so it is not retried
+        for retry in range(SPECIALIST_ATTEMPTS - 1):
+            try:
+                return await attempt()
+            except asyncio.TimeoutError:  # not the builtin until Python 3.11  # noqa: UP041
+                raise
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                await asyncio.sleep(SPECIALIST_BACKOFF * 2**retry)
+        return await attempt()
 
     @listen(breakdown_query)
-    def manage_finances(self) -> None:
+    async def run_specialists(self) -> None:
         # Skip if previous step was skipped or failed
         if not self.state.query_breakdown:
             return
 
-        agent = FinanceAgent().agent
-        task = FinanceTask().create_finance_task(
-            agent=agent,
-            budget=self.state.budget,
-            expenses=self.state.query_breakdown.get("expected_expenses", {}),
-        )
-
-        # Create a crew with just this agent and task
-        crew = Crew(agents=[agent], tasks=[task], verbose=True)
-
-        # Run the crew to get the result
-        result = crew.kickoff()
-
-        try:
-            self.state.finance_results = json.loads(result)
-        except Exception as e:
-            self.state.error = f"Failed to parse finance results: {str(e)}"
-            self.state.success = False
-
-    @listen("gather_info")
-    @listen("assess_safety")
-    @listen("curate_experiences")
-    @listen("plan_logistics")
-    @listen("manage_finances")
+        # The specialists are independent LLM calls: run them concurrently, and let
+        # one failing or timing out leave the others' results in place
+        jobs = self._specialist_jobs()
+        if BATCH_SPECIALISTS:
+            results = await BatchedSpecialistStep().run([(agent, task) for _, agent, task in jobs])
+        else:
+            results = await asyncio.gather(
+                *(self._run_specialist(agent, task) for _, agent, task in jobs),
+                return_exceptions=True,
+            )
+        for (field, _, _), result in zip(jobs, results, strict=True):
+            name = field.removesuffix("_results")
+            if isinstance(result, asyncio.TimeoutError):  # noqa: UP041
+                self.state.error = f"Timed out waiting for {name} results"
+                self.state.success = False
+            elif isinstance(result, BaseException):
+                self.state.error = f"Failed to get {name} results: {str(result)}"
+                self.state.success = False
+            else:
+                setattr(self.state, field, result)
+
+    @listen(run_specialists)
     def synthesize_plan(self) -> None:
-        # Skip if any of the required results are missing
-        if not all(
-            [
-                self.state.info_results,
-                self.state.safety_results,
-                self.state.experience_results,
-                self.state.logistic_results,
-                self.state.finance_results,
-            ]
-        ):
+        results = {
+            "info": self.state.info_results,
+            "safety": self.state.safety_results,
+            "experience": self.state.experience_results,
+            "logistics": self.state.logistic_results,
+            "finance": self.state.finance_results,
+        }
+        # Synthesize from whatever succeeded; the plan lists the sections it lacks
+        specialist_outputs = {key: value for key, value in results.items() if value is not None}
+        if len(specialist_outputs) < MIN_SPECIALIST_RESULTS:
+            return
+        self.state.missing = [key for key in results if key not in specialist_outputs]
+        # Synthesis is keyed by its inputs, not the query
+        cache_text = orjson.dumps(specialist_outputs, option=orjson.OPT_SORT_KEYS).decode()
+        cached = self._cache_get("synthesis", cache_text)
+        if cached is not None:
+            self.state.final_plan = cached
+            if self.on_section is not None and isinstance(cached, dict):
+                for key, value in cached.items():
+                    self.on_section(key, value)
             return
 
-        agent = OrchestratorAgent().agent
-        task = OrchestratorTask().create_synthesis_task(
+        agent = self.orchestrator_agent
+        task = OrchestratorTask.create_synthesis_task(
             agent=agent,
-            specialist_outputs={
-                "info": self.state.info_results,
-                "safety": self.state.safety_results,
-                "experience": self.state.experience_results,
-                "logistics": self.state.logistic_results,
-                "finance": self.state.finance_results,
-            },
+            specialist_outputs={**specialist_outputs, "missing": self.state.missing},
         )
-
-        # Create a crew with just this agent and task
-        crew = Crew(agents=[agent], tasks=[task], verbose=True)
-
-        # Run the crew to get the result
-        result = crew.kickoff()
-
-        try:
-            self.state.final_plan = json.loads(result)
-        except Exception as e:
-            self.state.error = f"Failed to parse final plan: {str(e)}"
-            self.state.success = False
+        crew = self._crew_for(agent, task)
+
+        # Run the crew to get the result, streaming sections out as they complete
+        # when someone is listening
+        llm = getattr(agent, "llm", None)
+        on_section = self.on_section
+        if on_section is not None and isinstance(llm, LLM):
+            scanner = JSONSectionScanner()
+
+            def on_chunk(chunk: str) -> None:
+                for key, value in scanner.feed(chunk):
+                    on_section(key, value)
+
+            # The orchestrator LLM is shared with non-streaming steps and later
+            # (pooled) flows, so only stream for this run
+            llm.stream = True
+            try:
+                with stream_chunks(llm, on_chunk):
+                    result = crew.kickoff()
+            finally:
+                llm.stream = False
+        else:
+            result = crew.kickoff()
+
+        plan = self._parse(result, _JSON_OBJECT, "final plan")
+        if plan is None:
+            return
+        self.state.final_plan = plan
+        self._cache_set("synthesis", cache_text, plan)
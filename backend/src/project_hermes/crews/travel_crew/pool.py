@@ -0,0 +1,65 @@
+"""A pool of pre-built TravelFlow instances for serving concurrent requests."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from project_hermes.http import configure_llm_http
+
+from .flow import TravelFlow, TravelState
+
+# Touched once per pooled flow so its agents are built before the first request
+_AGENT_PROPERTIES = (
+    "confidence_agent",
+    "orchestrator_agent",
+    "info_agent",
+    "safety_agent",
+    "experience_agent",
+    "logistic_agent",
+    "finance_agent",
+)
+
+
+class FlowPool:
+    """Hands out pre-warmed flows one request at a time.
+
+    Each flow keeps its agents and crew between runs and only has its state reset on
+    release, so a request starts from "reset the state" rather than from building
+    seven agents. ``acquire`` waits while every flow is in use.
+    """
+
+    def __init__(self, size: int = 8, factory: Callable[[], TravelFlow] = TravelFlow):
+        self.size = max(1, size)
+        self._factory = factory
+        self._idle: asyncio.Queue[TravelFlow] = asyncio.Queue(maxsize=self.size)
+
+    def fill(self) -> None:
+        """Build the pooled flows; blocking, so run it off the event loop at startup."""
+        configure_llm_http()
+        while not self._idle.full():
+            flow = self._factory()
+            for name in _AGENT_PROPERTIES:
+                getattr(flow, name)
+            self._idle.put_nowait(flow)
+
+    async def acquire(self) -> TravelFlow:
+        return await self._idle.get()
+
+    def release(self, flow: TravelFlow) -> None:
+        flow.reset()
+        flow.on_section = None
+        self._idle.put_nowait(flow)
+
+    @asynccontextmanager
+    async def flow(self) -> AsyncIterator[TravelFlow]:
+        flow = await self.acquire()
+        try:
+            yield flow
+        finally:
+            self.release(flow)
+
+    async def plan(self, query: str, no_cache: bool = False) -> TravelState:
+        """Run one flow for ``query`` and return a copy of its final state."""
+        async with self.flow() as flow:
+            await flow.kickoff_async(inputs={"query": query, "no_cache": no_cache})
+            return flow.state.model_copy()
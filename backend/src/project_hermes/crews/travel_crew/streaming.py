@@ -0,0 +1,98 @@
+"""Incremental parsing of streamed LLM output."""
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import orjson
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+
+class JSONSectionScanner:
+    """Consume a JSON object as it streams in and emit each top-level member.
+
+    ``feed`` returns the ``(key, value)`` pairs whose values completed within the
+    chunk, so a consumer can act on ``"itinerary"`` while ``"finance"`` is still
+    being generated. Text before the opening brace (e.g. a code fence) is skipped.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = -1
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self._text += chunk
+        members: list[tuple[str, Any]] = []
+        text = self._text
+        while self._pos < len(text) and not self.done:
+            char = text[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = self._pos + 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    members.extend(self._member(self._pos))
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                members.extend(self._member(self._pos))
+                self._member_start = self._pos + 1
+            self._pos += 1
+        return members
+
+    def _member(self, end: int) -> list[tuple[str, Any]]:
+        body = self._text[self._member_start : end].strip()
+        if not body:
+            return []
+        try:
+            return list(orjson.loads("{" + body + "}").items())
+        except orjson.JSONDecodeError:
+            return []  # malformed member; the final full parse reports the error
+
+
+_chunk_listeners: dict[int, Callable[[str], None]] = {}
+_listeners_lock = threading.Lock()
+_handler_registered = False
+
+
+def _dispatch_chunk(source: Any, event: LLMStreamChunkEvent) -> None:
+    listener = _chunk_listeners.get(id(source))
+    if listener is not None:
+        listener(event.chunk)
+
+
+@contextmanager
+def stream_chunks(llm: Any, listener: Callable[[str], None]) -> Iterator[None]:
+    """Route ``llm``'s stream chunk events to ``listener`` while the block runs.
+
+    One process-wide handler is registered on the CrewAI event bus and dispatches
+    by emitting LLM, so concurrent flows only see their own chunks.
+    """
+    global _handler_registered
+    with _listeners_lock:
+        if not _handler_registered:
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _dispatch_chunk)
+            _handler_registered = True
+        _chunk_listeners[id(llm)] = listener
+    try:
+        yield
+    finally:
+        with _listeners_lock:
+            _chunk_listeners.pop(id(llm), None)
@@ -1,80 +1,62 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
+
 from crewai import Crew, Process
-from .agents import (
-    ConfidenceAgent,
-    ExperienceAgent,
-    FinanceAgent,
-    InfoAgent,
-    LogisticAgent,
-    OrchestratorAgent,
-    SafetyAgent,
-)
+from project_hermes.logging import VERBOSE
+
+from .agents import ConfidenceAgent
+from .flow import LOCAL_CONFIDENCE, LOCAL_CONFIDENCE_LOW
 from .tasks import ConfidenceTask
+from .utils import get_confidence_classifier, parse_json
+
+# Most batch plans that run at once; each one holds a thread and its LLM calls
+BATCH_WORKERS = 8
 
 
 class TravelCrew:
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = VERBOSE, llm_provider: str | None = None):
         self.verbose = verbose
+        self.llm_provider_name = llm_provider
 
-    def create_crew(self) -> Crew:
-        # Create all agents
-        confidence_agent = ConfidenceAgent(verbose=self.verbose).agent
-        orchestrator_agent = OrchestratorAgent(verbose=self.verbose).agent
-        info_agent = InfoAgent(verbose=self.verbose).agent
-        safety_agent = SafetyAgent(verbose=self.verbose).agent
-        experience_agent = ExperienceAgent(verbose=self.verbose).agent
-        logistic_agent = LogisticAgent(verbose=self.verbose).agent
-        finance_agent = FinanceAgent(verbose=self.verbose).agent
-
-        # Create the tasks
-        confidence_task = ConfidenceTask().create_confidence_task(
-            agent=confidence_agent,
-            query="This is a placeholder query that will be replaced at runtime",
-        )
-
-        # Return the crew with agents and tasks
+    def create_crew(self, query: str) -> Crew:
+        # plan_trip only runs the confidence check, so only that agent is built
+        confidence_agent = ConfidenceAgent.build(verbose=self.verbose)
+        confidence_task = ConfidenceTask.create_confidence_task(agent=confidence_agent, query=query)
         return Crew(
-            agents=[
-                confidence_agent,
-                orchestrator_agent,
-                info_agent,
-                safety_agent,
-                experience_agent,
-                logistic_agent,
-                finance_agent,
-            ],
-            tasks=[confidence_task],  # We'll only add the confidence task initially
+            agents=[confidence_agent],
+            tasks=[confidence_task],
             verbose=self.verbose,
             process=Process.sequential,
         )
 
+    def _rejection(self, query: str, confidence_score: float) -> dict:
+        return {
+            "success": False,
+            "error": "The query does not appear to be travel-related.",
+            "confidence_score": confidence_score,
+            "query": query,
+        }
+
     def plan_trip(self, query: str) -> dict:
-        # Create a crew with agents and tasks
-        crew = self.create_crew()
+        # With the opt-in local pre-check (see flow.LOCAL_CONFIDENCE), clearly
+        # off-topic queries are rejected before any crew is built
+        if LOCAL_CONFIDENCE:
+            probability = get_confidence_classifier().predict(query)
+            if probability <= LOCAL_CONFIDENCE_LOW:
+                return self._rejection(query, probability)
 
-        # Update the confidence task with the actual query
-        if crew.tasks and len(crew.tasks) > 0:
-            # Replace the placeholder query with the actual query
-            crew.tasks[0].description = crew.tasks[0].description.replace(
-                "This is a placeholder query that will be replaced at runtime", query
-            )
+        crew = self.create_crew(query)
 
         # Execute the crew
         result = crew.kickoff()
 
         try:
             # Parse the confidence score result
-            confidence_result = json.loads(result)
+            confidence_result = parse_json(result)
             confidence_score = float(confidence_result.get("score", 0))
 
             # If confidence is too low, return early
             if confidence_score < 0.6:
-                return {
-                    "success": False,
-                    "error": "The query does not appear to be travel-related.",
-                    "confidence_score": confidence_score,
-                    "query": query,
-                }
+                return self._rejection(query, confidence_score)
 
             # For simplicity in this test version, just return a successful result
             # In a real implementation, we would run the full workflow with all tasks
@@ -96,3 +78,12 @@ class TravelCrew:
                 "confidence_score": 0,
                 "query": query,
             }
+
+    def plan_trip_batch(self, queries: list[str]) -> list[dict | Exception]:
+        """Plan several trips concurrently, at most ``BATCH_WORKERS`` at a time; a failed
+        run yields its exception in place."""
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(queries), BATCH_WORKERS)) as pool:
+            futures = [pool.submit(self.plan_trip, query) for query in queries]
+        return [f.exception() or f.result() for f in futures]  # type: ignore[misc]
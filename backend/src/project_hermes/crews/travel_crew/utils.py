@@ -1,14 +1,33 @@
-import json
+import os
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+import numpy as np
+import orjson
+
+from project_hermes.cache import TTLCache
+from project_hermes.semantic_cache import SemanticCache
+
 PROMPT_LIBRARY_PATH = Path(__file__).parent / "prompt_library.json"
 
 
+def parse_json(result: Any) -> Any:
+    """Decode a crew result (``CrewOutput`` or str) as JSON with orjson.
+
+    Output that cannot be a JSON document (prose, refusals) fails fast with
+    ``ValueError`` before attempting a decode; ``orjson.JSONDecodeError`` is one too.
+    """
+    text = str(result).strip()  # CrewOutput.__str__ is its raw text
+    if not text.startswith(("{", "[")):
+        raise ValueError(f"Expected a JSON object or array, got {text[:40]!r}")
+    return orjson.loads(text)
+
+
 class PromptLibrary:
     def __init__(self):
-        with open(PROMPT_LIBRARY_PATH, "r", encoding="utf-8") as f:
-            self.prompts = json.load(f)
+        self.prompts = orjson.loads(PROMPT_LIBRARY_PATH.read_bytes())
 
     def get_prompt(self, key: str) -> Dict[str, Any]:
         return self.prompts[key]
@@ -17,5 +36,75 @@ class PromptLibrary:
         return self.prompts[key]["prompt"]
 
 
+@lru_cache(maxsize=1)
 def get_prompt_library():
+    """Shared, read-only PromptLibrary: the JSON file is parsed once per process."""
     return PromptLibrary()
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> SemanticCache:
+    return SemanticCache(
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+        ttl=float(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 3600))),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_exact_cache() -> TTLCache:
+    """Step outputs keyed by exact (normalized) text, for answers similarity can't share."""
+    return TTLCache(maxsize=1024, ttl=float(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 3600))))
+
+
+# Labelled examples for the local travel-relevance pre-check
+TRAVEL_PROTOTYPES = (
+    "Plan a trip to Tokyo for a week",
+    "What should I see on vacation in Paris",
+    "Find flights and hotels for my holiday in Rome",
+    "Create a travel itinerary for Bali on a budget",
+    "Is it safe to travel to Mexico City",
+    "Best things to do when visiting New York",
+    "Weekend getaway ideas with kids",
+    "What's the weather in Lisbon for my trip next month",
+)
+OFF_TOPIC_PROTOTYPES = (
+    "Fix the bug in my Python code",
+    "Write a poem about the ocean",
+    "Explain how photosynthesis works",
+    "What is the capital gains tax rate",
+    "Help me write a cover letter",
+    "Solve this math equation",
+    "Recommend a good book to read",
+    "How do I bake sourdough bread",
+)
+
+
+class PrototypeClassifier:
+    """Travel-relevance probability from cosine similarity to labelled prototypes.
+
+    Cheap enough to run before the confidence LLM call; callers should only trust
+    scores near 0 or 1 and leave the ambiguous middle band to the LLM.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], np.ndarray],
+        positives: tuple[str, ...] = TRAVEL_PROTOTYPES,
+        negatives: tuple[str, ...] = OFF_TOPIC_PROTOTYPES,
+        sharpness: float = 10.0,
+    ):
+        self._embed = embed
+        self._positives = np.stack([embed(text) for text in positives])
+        self._negatives = np.stack([embed(text) for text in negatives])
+        self.sharpness = sharpness
+
+    def predict(self, text: str) -> float:
+        vec = self._embed(text)
+        margin = float((self._positives @ vec).max() - (self._negatives @ vec).max())
+        return 1.0 / (1.0 + np.exp(-self.sharpness * margin))
+
+
+@lru_cache(maxsize=1)
+def get_confidence_classifier() -> PrototypeClassifier:
+    # Shares the semantic cache's embedder and memoized query embeddings
+    return PrototypeClassifier(get_semantic_cache().embed)
@@ -0,0 +1,70 @@
+"""Structured error responses for plan generation failures."""
+
+import re
+from functools import lru_cache
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+
+
+class PlanError(Exception):
+    """Plan generation failed for ``provider``; ``cause`` is the original exception."""
+
+    def __init__(self, provider: str, cause: BaseException):
+        super().__init__(provider, cause)
+        self.provider = provider
+        self.cause = cause
+
+
+def is_rate_limit(exc: BaseException) -> bool:
+    """Provider SDKs (openai, anthropic, litellm) all name it ``RateLimitError`` / use 429."""
+    return getattr(exc, "status_code", None) == 429 or "RateLimit" in type(exc).__name__
+
+
+_TRANSIENT_RE = re.compile(r"overloaded|timeout|temporarily|unavailable|rate limit|503", re.I)
+_TRANSIENT_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@lru_cache(maxsize=1)
+def _transient_types() -> tuple[type[BaseException], ...]:
+    types: list[type[BaseException]] = [TimeoutError, ConnectionError]
+    try:
+        import httpx
+
+        types += [httpx.TimeoutException, httpx.NetworkError]
+    except ImportError:
+        pass
+    try:
+        from litellm import exceptions as llm_errors
+
+        types += [
+            llm_errors.RateLimitError,
+            llm_errors.ServiceUnavailableError,
+            llm_errors.Timeout,
+            llm_errors.APIConnectionError,
+        ]
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+def is_transient(err: Exception, message: str | None = None) -> bool:
+    """Whether a provider error is worth retrying (timeouts, rate limits, outages)."""
+    # Exception class and status code first; only stringify errors they don't classify
+    if isinstance(err, _transient_types()):
+        return True
+    if getattr(err, "status_code", None) in _TRANSIENT_STATUS:
+        return True
+    return _TRANSIENT_RE.search(str(err) if message is None else message) is not None
+
+
+async def plan_error_handler(_request: Request, exc: Exception) -> ORJSONResponse:
+    assert isinstance(exc, PlanError)
+    # Only the exception type: no per-request formatting of (possibly huge) messages
+    return ORJSONResponse(
+        status_code=502, content={"success": False, "error": type(exc.cause).__name__}
+    )
+
+
+def install_error_handlers(app: FastAPI) -> None:
+    app.add_exception_handler(PlanError, plan_error_handler)
@@ -0,0 +1,70 @@
+"""Shared keep-alive HTTP clients for LLM provider calls.
+
+CrewAI calls providers through litellm, which otherwise builds a client (and pays a
+TLS handshake) per call. Installing these on litellm lets every agent of every crew
+reuse pooled connections; HTTP/2 multiplexing is used when ``h2`` is installed.
+"""
+
+import atexit
+from functools import lru_cache
+from importlib.util import find_spec
+
+import httpx
+
+LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=300)
+TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+_HTTP2 = find_spec("h2") is not None
+
+# Hosts behind each provider's litellm calls, for warming the pool
+PROVIDER_URLS = {
+    "gemini": "https://generativelanguage.googleapis.com/",
+    "claude": "https://api.anthropic.com/",
+    "openai": "https://api.openai.com/",
+}
+
+
+@lru_cache(maxsize=1)
+def get_client() -> httpx.Client:
+    return httpx.Client(http2=_HTTP2, limits=LIMITS, timeout=TIMEOUT)
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(http2=_HTTP2, limits=LIMITS, timeout=TIMEOUT)
+
+
+@lru_cache(maxsize=1)
+def configure_llm_http() -> None:
+    """Point litellm's sync and async sessions at the shared clients (idempotent)."""
+    import litellm
+
+    litellm.client_session = get_client()
+    litellm.aclient_session = get_async_client()
+
+
+def prewarm(provider: str | None) -> None:
+    """Open a pooled connection to ``provider`` so the first plan skips the TLS handshake."""
+    url = PROVIDER_URLS.get(provider or "")
+    if url is None:
+        return
+    try:
+        get_client().head(url)
+    except httpx.HTTPError:
+        pass
+
+
+async def close_llm_http() -> None:
+    if get_client.cache_info().currsize:
+        get_client().close()
+        get_client.cache_clear()
+    if get_async_client.cache_info().currsize:
+        await get_async_client().aclose()
+        get_async_client.cache_clear()
+    configure_llm_http.cache_clear()
+
+
+@atexit.register
+def _close_client_at_exit() -> None:
+    # Scripts never run the API lifespan; the async client needs a loop and is left to it
+    if get_client.cache_info().currsize:
+        get_client().close()
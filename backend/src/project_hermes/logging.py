@@ -1,18 +1,46 @@
 import logging
 import os
+import time
+from functools import lru_cache
+
+import orjson
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# CrewAI's verbose mode logs every LLM payload; only turn it on when debugging
+VERBOSE = LOG_LEVEL == "DEBUG"
+
+
+@lru_cache(maxsize=1)
+def _iso_second(second: int) -> str:
+    # Records arrive in bursts within the same second; format the timestamp once
+    return time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(second))
+
+
+class JSONFormatter(logging.Formatter):
+    """One orjson-encoded object per record, so quotes in messages stay valid JSON."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Reused across records: Handler.handle() holds the handler lock around format()
+        self._buf: dict[str, str] = {"level": "", "time": "", "name": "", "message": ""}
+
+    def format(self, record: logging.LogRecord) -> str:
+        buf = self._buf
+        buf["level"] = record.levelname
+        buf["time"] = _iso_second(int(record.created))
+        buf["name"] = record.name
+        buf["message"] = record.getMessage()
+        if record.exc_info:
+            buf["exc_info"] = self.formatException(record.exc_info)
+            line = orjson.dumps(buf).decode()
+            del buf["exc_info"]
+            return line
+        return orjson.dumps(buf).decode()
 
 
 def configure_logging() -> None:
-    # Minimal json-like formatter without external deps
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        fmt='{"level":"%(levelname)s","time":"%(asctime)s","name":"%(name)s","message":"%(message)s"}',
-        datefmt="%Y-%m-%dT%H:%M:%S%z",
-    )
-    handler.setFormatter(formatter)
+    handler.setFormatter(JSONFormatter())
     root = logging.getLogger()
     root.handlers = [handler]
-    root.setLevel(log_level)
-
-
+    root.setLevel(LOG_LEVEL)
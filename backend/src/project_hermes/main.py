@@ -1,18 +1,33 @@
 #!/usr/bin/env python
+import asyncio
 import logging
 import os
 import sys
+import threading
 import time
-from datetime import datetime
+from collections.abc import AsyncIterator, Callable
+from functools import lru_cache
 from pathlib import Path
-from random import randint
+from random import Random
+from typing import Any
 
 from pydantic import BaseModel
 
+from crewai import LLM, Crew
 from crewai.flow import Flow, listen, start
 
 try:
-    from project_hermes.crews.poem_crew.poem_crew import PoemCrew
+    from project_hermes.circuit import CircuitBreaker, CircuitOpenError
+    from project_hermes.crews.travel_crew.streaming import stream_chunks
+    from project_hermes.errors import is_transient
+    from project_hermes.http import configure_llm_http
+    from project_hermes.poem_cache import (
+        get_poem_cache,
+        get_poem_semantic_cache,
+        poem_cache_key,
+        poem_namespace,
+    )
+    from project_hermes.settings import get_settings
 except ModuleNotFoundError:  # give user a helpful message
     if __name__ == "__main__":
         print(
@@ -29,6 +44,79 @@ if not logger.handlers:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 
 
+# Own RNG: the module-level random functions share one global generator
+_RNG = Random()
+
+
+def _sentence_count_override() -> int | None:
+    # Deterministic override for testing, read once at import
+    override = os.getenv("POEM_SENTENCE_COUNT", "")
+    return max(1, min(20, int(override))) if override.isdigit() else None
+
+
+SENTENCE_COUNT_OVERRIDE = _sentence_count_override()
+
+
+# Characters that are unsafe in filenames on some filesystems, mapped in one pass
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys(' /\\:*?"<>|\t\n\r', "_"))
+
+
+@lru_cache(maxsize=32)
+def _ensure_dir(path: str) -> Path:
+    # Only the first save into a directory pays for the mkdir
+    out_dir = Path(path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return out_dir
+
+
+_BREAKER = CircuitBreaker(
+    threshold=int(os.getenv("POEM_CB_THRESHOLD", "5")),
+    break_seconds=float(os.getenv("POEM_CB_BREAK_S", "30")),
+)
+
+
+# Idle crews per model: YAML config, agents and tasks are built once and reused.
+# A crew serves one kickoff at a time, so concurrent runs each take their own.
+_CREW_CACHE: dict[str, list[Crew]] = {}
+_CREW_LOCK = threading.Lock()
+
+
+def _get_crew(model: str | None) -> Crew:
+    with _CREW_LOCK:
+        idle = _CREW_CACHE.get(model or "__default__")
+        if idle:
+            return idle.pop()
+    # Deferred: loading the crew module reads its YAML config and .env, which
+    # processes that only serve travel plans (or just plot the flow) never need
+    from project_hermes.crews.poem_crew.poem_crew import PoemCrew
+
+    # Retries and fallbacks then reuse pooled keep-alive connections (no-op after once)
+    configure_llm_http()
+    return PoemCrew(model).crew()
+
+
+def _kickoff_poem_crew(
+    model: str | None,
+    inputs: dict[str, Any],
+    on_token: Callable[[str], None] | None = None,
+) -> Any:
+    crew = _get_crew(model)
+    llm = crew.agents[0].llm
+    try:
+        if on_token is None or not isinstance(llm, LLM):
+            return crew.kickoff(inputs=inputs)
+        # Pooled crews are shared with non-streaming runs, so only stream for this one
+        llm.stream = True
+        try:
+            with stream_chunks(llm, on_token):
+                return crew.kickoff(inputs=inputs)
+        finally:
+            llm.stream = False
+    finally:
+        with _CREW_LOCK:
+            _CREW_CACHE.setdefault(model or "__default__", []).append(crew)
+
+
 class PoemState(BaseModel):
     topic: str = ""
     sentence_count: int = 1
@@ -40,18 +128,20 @@ class PoemState(BaseModel):
 
 
 class PoemFlow(Flow[PoemState]):
+    # Optional ``on_token(chunk)`` callback: receives the poem text as the model
+    # generates it, on the crew's worker thread
+    on_token: Callable[[str], None] | None = None
+
     @start()
     def generate_sentence_count(self) -> None:
         logger.info("Generating sentence count")
-        # Allow deterministic override via env for testing
-        override = os.getenv("POEM_SENTENCE_COUNT")
-        if override and override.isdigit():
-            self.state.sentence_count = max(1, min(20, int(override)))
+        if SENTENCE_COUNT_OVERRIDE is not None:
+            self.state.sentence_count = SENTENCE_COUNT_OVERRIDE
         else:
-            self.state.sentence_count = randint(1, 5)
+            self.state.sentence_count = _RNG.randint(1, 5)
 
     @listen(generate_sentence_count)
-    def generate_poem(self) -> None:
+    async def generate_poem(self) -> None:
         logger.info(
             "Generating poem (topic='%s', sentence_count=%s)",
             self.state.topic,
@@ -71,116 +161,162 @@ class PoemFlow(Flow[PoemState]):
             self.state.model_used = "fake"
             return
 
-        primary = os.getenv("POEM_PRIMARY_MODEL")
-        fallbacks_env = os.getenv("POEM_FALLBACK_MODELS", "")
-        fallback_models = [m.strip() for m in fallbacks_env.split(",") if m.strip()]
-        models_chain = [primary] if primary else []
-        # Always include None sentinel to use YAML default at least once
-        if None not in models_chain:
-            models_chain.append(None)
-        for m in fallback_models:
-            if m and m not in models_chain:
-                models_chain.append(m)
-
-        max_attempts = int(os.getenv("POEM_RETRY_ATTEMPTS", "3"))
-        base_delay = float(os.getenv("POEM_RETRY_BASE_DELAY", "0.6"))
-        transient_phrases = [
-            "overloaded",
-            "timeout",
-            "temporarily",
-            "unavailable",
-            "rate limit",
-            "503",
-        ]
-
-        def is_transient(err: Exception) -> bool:
-            msg = str(err).lower()
-            return any(p in msg for p in transient_phrases)
-
-        last_error: Exception | None = None
-        for model_override in models_chain:
-            attempts = 0
-            while attempts < max_attempts:
-                attempts += 1
-                self.state.attempts += 1
-                try:
-                    if model_override:
-                        os.environ["POEM_MODEL_RUNTIME_OVERRIDE"] = model_override
-                    elif "POEM_MODEL_RUNTIME_OVERRIDE" in os.environ:
-                        del os.environ["POEM_MODEL_RUNTIME_OVERRIDE"]
-
-                    crew_instance = PoemCrew().crew()
-                    result = crew_instance.kickoff(
-                        inputs={
-                            "sentence_count": self.state.sentence_count,
-                            "topic": self.state.topic,
-                        }
-                    )
-                    raw = getattr(result, "raw", str(result))
-                    self.state.poem = raw
-                    self.state.model_used = model_override or os.getenv(
-                        "POEM_LAST_AGENT_MODEL", "unknown"
-                    )
-                    self.state.success = True
-                    logger.info(
-                        "Poem generated (chars=%d, model=%s, attempts=%d)",
-                        len(raw),
-                        self.state.model_used,
-                        self.state.attempts,
-                    )
-                    last_error = None
-                    break  # success for this model
-                except Exception as e:  # noqa: BLE001
-                    last_error = e
-                    self.state.success = False
-                    self.state.error_message = str(e)
-                    transient = is_transient(e)
-                    logger.warning(
-                        "Attempt %d failed for model=%s transient=%s: %s",
-                        attempts,
-                        model_override or "(yaml-default)",
-                        transient,
-                        e,
-                    )
-                    if attempts < max_attempts and transient:
-                        sleep_for = base_delay * (2 ** (attempts - 1))
-                        time.sleep(sleep_for)
-                        continue
-                    break  # break inner loop if not transient or maxed attempts
-            if last_error is None and self.state.success:
-                break  # overall success, exit model chain
-            # else try next model
-
-        if last_error is not None and not self.state.success:
-            strict = os.getenv("POEM_STRICT") == "1"
-            if strict:
-                logger.error("All attempts failed and POEM_STRICT=1; raising error")
+        settings = get_settings()
+        # Always include None sentinel to use YAML default at least once; dict.fromkeys
+        # drops repeats while keeping the order
+        models_chain: list[str | None] = list(
+            dict.fromkeys(
+                [settings.poem_primary_model or None, None, *settings.poem_fallback_models]
+            )
+        )
+
+        cache = get_poem_cache()
+        cache_key = poem_cache_key(self.state.topic, self.state.sentence_count, models_chain[0])
+        semantic_cache = get_poem_semantic_cache()
+        namespace = poem_namespace(self.state.sentence_count, models_chain[0])
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is None and semantic_cache is not None:
+            cached = semantic_cache.get(namespace, self.state.topic)
+        if cached is not None:
+            logger.info("Poem cache hit (chars=%d)", len(cached))
+            self.state.poem = cached
+            self.state.model_used = "cache"
+            return
+
+        try:
+            raw, self.state.model_used = await self._generate_hedged(models_chain)
+        except Exception as last_error:  # noqa: BLE001
+            self.state.success = False
+            if settings.poem_strict:
+                logger.error("All attempts failed and POEM_STRICT is set; raising error")
                 raise RuntimeError(
                     f"Poem generation failed after {self.state.attempts} attempts: {last_error}"
-                )
+                ) from last_error
             logger.error(
                 "Poem generation failed after %d attempts (last error: %s)",
                 self.state.attempts,
                 last_error,
             )
             self.state.poem = "<error generating poem>"
+            return
+
+        self.state.poem = raw
+        self.state.success = True
+        self.state.error_message = None
+        if cache is not None:
+            cache.set(cache_key, raw)
+        if semantic_cache is not None:
+            semantic_cache.set(namespace, self.state.topic, raw)
+        logger.info(
+            "Poem generated (chars=%d, model=%s, attempts=%d)",
+            len(raw),
+            self.state.model_used,
+            self.state.attempts,
+        )
+
+    async def _generate_hedged(self, models_chain: list[str | None]) -> tuple[str, str]:
+        """Return ``(poem, model_used)`` from the first model in the chain to succeed.
+
+        The next model is started when the running ones fail, and also alongside them
+        once ``poem_hedge_delay`` seconds pass without a result, so a hanging model
+        delays the answer by at most the hedge delay. Stragglers are cancelled. While
+        streaming, fallbacks only start on failure so two models never interleave tokens.
+        """
+        hedge_delay = None if self.on_token is not None else get_settings().poem_hedge_delay
+        remaining = iter(models_chain)
+        pending: set[asyncio.Task[tuple[str, str]]] = set()
+        last_error: BaseException | None = None
+
+        def launch_next() -> None:
+            for model in remaining:
+                pending.add(asyncio.create_task(self._try_model(model)))
+                return
+
+        launch_next()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch_next()
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    last_error = error
+                    launch_next()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise last_error or RuntimeError("No models to try")
+
+    async def _try_model(self, model_override: str | None) -> tuple[str, str]:
+        """Generate with one model, retrying transient errors with jittered exponential backoff."""
+        settings = get_settings()
+        max_attempts = settings.poem_retry_attempts
+        base_delay = settings.poem_retry_base_delay
+        inputs = {"sentence_count": self.state.sentence_count, "topic": self.state.topic}
+        breaker_key = model_override or "default"
+        attempt = 0
+        while True:
+            # A model that keeps failing is skipped outright until its break is over
+            if not _BREAKER.allow(breaker_key):
+                raise CircuitOpenError(breaker_key)
+            attempt += 1
+            self.state.attempts += 1
+            try:
+                result = await asyncio.to_thread(
+                    _kickoff_poem_crew, model_override, inputs, self.on_token
+                )
+            except Exception as e:  # noqa: BLE001
+                # Provider errors can embed whole response bodies: stringify once
+                message = str(e)
+                self.state.error_message = message
+                transient = is_transient(e, message)
+                if transient:
+                    _BREAKER.record_failure(breaker_key)
+                logger.warning(
+                    "Attempt %d failed for model=%s transient=%s: %s",
+                    attempt,
+                    model_override or "(yaml-default)",
+                    transient,
+                    message,
+                )
+                if attempt >= max_attempts or not transient:
+                    raise
+                # Full jitter: concurrent flows hitting the same rate limit spread
+                # their retries over the window instead of waking in lockstep
+                cap = min(base_delay * (2 ** (attempt - 1)), settings.poem_retry_max_s)
+                await asyncio.sleep(_RNG.uniform(0, cap))
+                continue
+            _BREAKER.record_success(breaker_key)
+            raw: str = getattr(result, "raw", None) or str(result)
+            model_used = model_override or os.getenv("POEM_LAST_AGENT_MODEL") or "unknown"
+            return raw, model_used
 
     @listen(generate_poem)
     def maybe_save_poem(self) -> None:
         if not self.state.poem or not self.state.success:
             return
-        if os.getenv("POEM_SAVE") != "1":
+        if not get_settings().poem_save:
             return
-        out_dir = Path(os.getenv("POEM_OUTPUT_DIR", "poems"))
-        out_dir.mkdir(parents=True, exist_ok=True)
+        out_dir = _ensure_dir(os.getenv("POEM_OUTPUT_DIR", "poems"))
         timestamped = os.getenv("POEM_SAVE_TIMESTAMPED", "1") == "1"
-        fname_base = self.state.topic.replace(" ", "_")[:40] or "poem"
+        fname_base = self.state.topic.translate(_SANITIZE_TABLE)[:40] or "poem"
         if timestamped:
-            fname = f"{fname_base}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.txt"
+            fname = f"{fname_base}-{time.strftime('%Y%m%d%H%M%S', time.gmtime())}.txt"
         else:
             fname = f"{fname_base}.txt"
         path = out_dir / fname
-        path.write_text(self.state.poem)
+        # A poem is one small write: skip the buffered file object
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, self.state.poem.encode("utf-8"))
+        finally:
+            os.close(fd)
         logger.info("Saved poem to %s", path)
 
 
@@ -192,6 +328,45 @@ def run_flow(prompt: str) -> PoemState:
     return poem_flow.state
 
 
+async def arun_flow(prompt: str) -> PoemState:
+    """Async :func:`run_flow`: LLM calls run in worker threads, not the event loop."""
+    poem_flow = PoemFlow()
+    poem_flow.state.topic = prompt
+    await poem_flow.kickoff_async()
+    return poem_flow.state
+
+
+async def stream_flow(prompt: str) -> AsyncIterator[str]:
+    """Yield the poem for ``prompt`` in chunks as the model generates it.
+
+    A poem that was not streamed (cache hit, fake output, or a model without streaming
+    support) is yielded whole once the flow finishes.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+    poem_flow = PoemFlow()
+    poem_flow.state.topic = prompt
+
+    def on_token(chunk: str) -> None:
+        # Called on the crew's worker thread
+        loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+    poem_flow.on_token = on_token
+    runner = asyncio.create_task(poem_flow.kickoff_async())
+    # Scheduled after any chunk the worker thread already handed to the loop
+    runner.add_done_callback(lambda _: loop.call_soon(queue.put_nowait, None))
+    streamed = False
+    try:
+        while (chunk := await queue.get()) is not None:
+            streamed = True
+            yield chunk
+        await runner
+    finally:
+        runner.cancel()
+    if not streamed:
+        yield poem_flow.state.poem
+
+
 def kickoff(prompt: str) -> str:
     """Backward compatible helper returning only poem text."""
     return run_flow(prompt).poem
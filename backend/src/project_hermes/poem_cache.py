@@ -0,0 +1,60 @@
+"""Caches for generated poems: exact-match by key, then by topic similarity."""
+
+import hashlib
+import os
+from functools import lru_cache
+
+import orjson
+
+from project_hermes.cache import TTLCache
+from project_hermes.semantic_cache import SemanticCache
+from project_hermes.settings import get_settings
+
+
+def poem_cache_key(topic: str, sentence_count: int, model: str | None) -> str:
+    payload = {"t": topic, "n": sentence_count, "m": model or "default"}
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class LLMCache:
+    """Poem text by :func:`poem_cache_key`; thread-safe, bounded, and expiring."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> str | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+@lru_cache(maxsize=1)
+def get_poem_cache() -> LLMCache | None:
+    """The process-wide poem cache, or ``None`` unless ``POEM_CACHE=1``."""
+    if not get_settings().poem_cache_enabled:
+        return None
+    return LLMCache(
+        maxsize=int(os.getenv("POEM_CACHE_SIZE", "512")),
+        ttl=float(os.getenv("POEM_CACHE_TTL", "3600")),
+    )
+
+
+def poem_namespace(sentence_count: int, model: str | None) -> str:
+    """Semantic-cache namespace: only topics with the same count and model match."""
+    return f"poem:{sentence_count}:{model or 'default'}"
+
+
+@lru_cache(maxsize=1)
+def get_poem_semantic_cache() -> SemanticCache | None:
+    """Second-level cache matching paraphrased topics, or ``None`` unless ``POEM_CACHE=1``."""
+    if not get_settings().poem_cache_enabled:
+        return None
+    return SemanticCache(
+        threshold=float(os.getenv("POEM_SEM_THRESHOLD", "0.92")),
+        ttl=float(os.getenv("POEM_CACHE_TTL", "3600")),
+        maxsize=4096,
+    )
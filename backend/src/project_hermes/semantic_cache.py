@@ -0,0 +1,134 @@
+"""Embedding-similarity cache shared by the travel and poem flows."""
+
+import os
+import re
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any
+
+import numpy as np
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+_HASH_DIM = 512
+
+
+def _hashed_embedding(text: str) -> np.ndarray:
+    """Dependency-free fallback: hashed word and character-trigram counts."""
+    vec = np.zeros(_HASH_DIM, dtype=np.float32)
+    words = re.findall(r"\w+", text.lower())
+    for word in words:
+        vec[zlib.crc32(word.encode()) % _HASH_DIM] += 1.0
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            vec[zlib.crc32(padded[i : i + 3].encode()) % _HASH_DIM] += 0.5
+    return vec
+
+
+_worker_model: Any = None
+
+
+def _load_model() -> None:
+    """Embedding worker initializer: load the sentence model once per process."""
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+
+    _worker_model = SentenceTransformer(EMBEDDING_MODEL)
+
+
+def _worker_embed(text: str) -> np.ndarray:
+    return _worker_model.encode(text, convert_to_numpy=True)
+
+
+@lru_cache(maxsize=1)
+def get_embed_pool() -> ProcessPoolExecutor:
+    workers = int(os.getenv("EMBED_WORKERS", "2"))
+    return ProcessPoolExecutor(max_workers=workers, initializer=_load_model)
+
+
+def _pooled_embedding(text: str) -> np.ndarray:
+    # Model inference holds the GIL for its whole run; in a worker process it no
+    # longer stalls the request threads of this one
+    return get_embed_pool().submit(_worker_embed, text).result()
+
+
+def _default_embedder() -> Callable[[str], np.ndarray]:
+    """sentence-transformers (in worker processes) when installed, else hashed n-grams.
+
+    The hashed fallback stays in-process: it takes microseconds, less than the
+    round trip to a worker.
+    """
+    if find_spec("sentence_transformers") is None:
+        return _hashed_embedding
+    return _pooled_embedding
+
+
+class SemanticCache:
+    """In-memory nearest-neighbour cache for LLM step outputs.
+
+    Entries are grouped by namespace (one per flow step) and matched by cosine
+    similarity of query embeddings, so paraphrased queries share a cached result.
+    """
+
+    def __init__(
+        self,
+        embedder: Callable[[str], np.ndarray] | None = None,
+        threshold: float = 0.92,
+        ttl: float = 24 * 3600,
+        maxsize: int = 1024,
+    ):
+        self._embedder = embedder
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # namespace -> (unit vectors as rows, [(expires_at, value), ...])
+        self._entries: dict[str, tuple[np.ndarray, list[tuple[float, Any]]]] = {}
+        self._lock = threading.Lock()
+        # A miss embeds the same text again for set(); memoize per instance
+        self.embed = lru_cache(maxsize=256)(self._embed)
+
+    def _embed(self, text: str) -> np.ndarray:
+        if self._embedder is None:
+            self._embedder = _default_embedder()
+        vec = np.asarray(self._embedder(text), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        vec = vec / norm if norm else vec
+        vec.flags.writeable = False  # shared by every caller of the memoized embed()
+        return vec
+
+    def get(self, namespace: str, text: str) -> Any:
+        """Cached value for the most similar live entry, or ``None`` below threshold."""
+        vec = self.embed(text)
+        with self._lock:
+            entry = self._entries.get(namespace)
+            if entry is None:
+                return None
+            matrix, values = entry
+            scores = matrix @ vec
+            best = int(np.argmax(scores))
+            expires_at, value = values[best]
+            if scores[best] < self.threshold or expires_at <= time.monotonic():
+                return None
+            return value
+
+    def set(self, namespace: str, text: str, value: Any) -> None:
+        vec = self.embed(text)
+        now = time.monotonic()
+        with self._lock:
+            matrix, values = self._entries.get(
+                namespace, (np.empty((0, vec.shape[0]), dtype=np.float32), [])
+            )
+            # Drop expired entries, then the oldest beyond maxsize
+            keep = [i for i, (expires_at, _) in enumerate(values) if expires_at > now]
+            keep = keep[-(self.maxsize - 1) :] if self.maxsize > 1 else []
+            values = [values[i] for i in keep] + [(now + self.ttl, value)]
+            matrix = np.vstack([matrix[keep], vec])
+            self._entries[namespace] = (matrix, values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
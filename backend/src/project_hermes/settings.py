@@ -1,5 +1,13 @@
-from functools import lru_cache
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cached_property, lru_cache
+from typing import Annotated
+
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+
+def parse_origins(value: str) -> tuple[str, ...]:
+    """Split a comma-separated origins string, dropping blanks."""
+    return tuple(o for o in (part.strip() for part in value.split(",")) if o)
 
 
 class Settings(BaseSettings):
@@ -18,11 +26,43 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8001
     cors_origins: str = "*"  # comma-separated
+    threadpool_size: int = 40  # worker threads for blocking handlers / crew runs
+
+    # Travel plan response cache
+    plan_cache_size: int = 1024
+    plan_cache_ttl: float = 3600.0  # seconds
+    plan_cache_redis: bool = False  # share cached plans across workers via redis_url
+    plan_negative_ttl: float = 30.0  # seconds a rate-limited provider fails fast
+
+    # Micro-batching of concurrent plan requests (0 disables)
+    plan_batch_window_ms: float = 0.0
+    plan_batch_max: int = 8
+
+    # Poem flow
+    poem_primary_model: str | None = None
+    poem_fallback_models: Annotated[list[str], NoDecode] = []  # comma-separated in env
+    poem_retry_attempts: int = 3
+    poem_retry_base_delay: float = 0.6  # seconds, doubled per transient failure
+    poem_retry_max_s: float = 20.0  # cap on a single backoff sleep
+    poem_hedge_delay: float = 2.0  # seconds before the next model is started alongside
+    poem_strict: bool = False  # raise instead of returning a placeholder poem
+    poem_save: bool = False
+    poem_cache_enabled: bool = Field(False, validation_alias="POEM_CACHE")
 
     # Providers / Backends (placeholders)
     redis_url: str = "redis://redis:6379/0"
     broker_url: str = "redis://redis:6379/1"
 
+    @field_validator("poem_fallback_models", mode="before")
+    @classmethod
+    def _split_models(cls, value: object) -> object:
+        return list(parse_origins(value)) if isinstance(value, str) else value
+
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """Parsed ``cors_origins``; ``("*",)`` when empty."""
+        return parse_origins(self.cors_origins) or ("*",)
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -0,0 +1,113 @@
+"""Redis-backed travel plan cache shared by all uvicorn workers.
+
+Optional: needs the ``redis`` extra (``pip install project_hermes[redis]``). Any
+Redis error is logged and treated as a miss, so an unreachable Redis degrades to
+the per-worker cache instead of failing requests.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None
+    RedisError = OSError
+
+logger = logging.getLogger(__name__)
+
+# Release the lock only if we still own it (the lease may have expired and been retaken)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisPlanCache:
+    """``hermes:plan:{provider}:{digest}`` -> orjson-encoded plan, with a SET NX
+    lease lock so only one worker runs the crew for a given key at a time."""
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: float = 600.0,
+        lock_lease: float = 300.0,
+        poll_interval: float = 0.5,
+        prefix: str = "hermes:plan",
+    ):
+        self._client = client
+        self.ttl = max(1, int(ttl))
+        self.lock_lease = max(1, int(lock_lease))
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._tokens: dict[str, str] = {}
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisPlanCache":
+        if aioredis is None:
+            raise RuntimeError("redis is not installed; install project_hermes[redis]")
+        return cls(aioredis.from_url(url), **kwargs)
+
+    def _key(self, cache_key: tuple[str, str]) -> str:
+        provider, digest = cache_key
+        return f"{self.prefix}:{provider}:{digest}"
+
+    async def get(self, cache_key: tuple[str, str]) -> dict | None:
+        try:
+            raw = await self._client.get(self._key(cache_key))
+        except RedisError as e:
+            logger.warning("Redis plan cache get failed: %s", e)
+            return None
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, cache_key: tuple[str, str], value: dict) -> None:
+        try:
+            await self._client.setex(self._key(cache_key), self.ttl, orjson.dumps(value))
+        except RedisError as e:
+            logger.warning("Redis plan cache set failed: %s", e)
+
+    async def acquire(self, cache_key: tuple[str, str]) -> bool:
+        """Try to take the generation lease; ``True`` also when Redis is unavailable,
+        so the caller falls back to generating locally."""
+        lock_key = self._key(cache_key) + ":lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._client.set(lock_key, token, nx=True, ex=self.lock_lease)
+        except RedisError as e:
+            logger.warning("Redis plan lock failed: %s", e)
+            return True
+        if acquired:
+            self._tokens[lock_key] = token
+        return bool(acquired)
+
+    async def release(self, cache_key: tuple[str, str]) -> None:
+        lock_key = self._key(cache_key) + ":lock"
+        token = self._tokens.pop(lock_key, None)
+        if token is None:
+            return
+        try:
+            await self._client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+        except RedisError as e:
+            logger.warning("Redis plan unlock failed: %s", e)
+
+    async def wait(self, cache_key: tuple[str, str]) -> dict | None:
+        """Wait for another worker's lease on ``cache_key`` to end and return what it
+        cached, or ``None`` if it stored nothing (failed run, expired lease)."""
+        lock_key = self._key(cache_key) + ":lock"
+        try:
+            while await self._client.exists(lock_key):
+                await asyncio.sleep(self.poll_interval)
+        except RedisError as e:
+            logger.warning("Redis plan lock poll failed: %s", e)
+            return None
+        return await self.get(cache_key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -4,151 +4,212 @@ This script tests the travel_crew module with mocked LLM responses to avoid API
 It's a simplified test that focuses on the workflow rather than actual API calls.
 """
 
+import asyncio
 import json
 import logging
-from unittest.mock import MagicMock, patch
+import re
+from functools import cache
+from unittest.mock import patch
+
+import orjson
+from crewai import Crew
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
-# Mocked responses
-CONFIDENCE_RESPONSE = json.dumps(
-    {"score": 0.95, "reasoning": "This query is explicitly asking for travel planning."}
-)
-BREAKDOWN_RESPONSE = json.dumps(
-    {
-        "destination": "Paris",
-        "dates": {"start": "2023-09-10", "end": "2023-09-12"},
-        "travelers": {"count": 2, "type": "couple"},
-        "budget": 2000,
-        "preferences": {"interests": ["sightseeing", "cuisine", "culture"]},
-    }
-)
-INFO_RESPONSE = json.dumps(
-    {
-        "attractions": ["Eiffel Tower", "Louvre Museum", "Notre Dame"],
-        "local_info": "Paris is known for its cuisine, art, and romantic atmosphere.",
-    }
-)
-SAFETY_RESPONSE = json.dumps(
-    {
-        "safety_rating": 4,
-        "health_advisories": "No current health advisories for Paris.",
-        "travel_advisories": "Exercise normal precautions in France.",
+
+def _pretty(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+# Mocked responses, kept as JSON text: the crews hand back strings, so there is
+# nothing to encode at import time
+CONFIDENCE_RESPONSE = """\
+{
+    "score": 0.95,
+    "reasoning": "This query is explicitly asking for travel planning."
+}
+"""
+BREAKDOWN_RESPONSE = """\
+{
+    "destination": "Paris",
+    "dates": {
+        "start": "2023-09-10",
+        "end": "2023-09-12"
+    },
+    "travelers": {
+        "count": 2,
+        "type": "couple"
+    },
+    "budget": 2000,
+    "preferences": {
+        "interests": [
+            "sightseeing",
+            "cuisine",
+            "culture"
+        ]
     }
-)
-EXPERIENCE_RESPONSE = json.dumps(
-    {
-        "recommended_activities": [
-            "Visit the Eiffel Tower",
-            "Tour the Louvre",
-            "Dine at a local café",
+}
+"""
+INFO_RESPONSE = """\
+{
+    "attractions": [
+        "Eiffel Tower",
+        "Louvre Museum",
+        "Notre Dame"
+    ],
+    "local_info": "Paris is known for its cuisine, art, and romantic atmosphere."
+}
+"""
+SAFETY_RESPONSE = """\
+{
+    "safety_rating": 4,
+    "health_advisories": "No current health advisories for Paris.",
+    "travel_advisories": "Exercise normal precautions in France."
+}
+"""
+EXPERIENCE_RESPONSE = """\
+{
+    "recommended_activities": [
+        "Visit the Eiffel Tower",
+        "Tour the Louvre",
+        "Dine at a local café"
+    ]
+}
+"""
+LOGISTIC_RESPONSE = """\
+{
+    "transportation": {
+        "from_airport": "Taxi or train",
+        "around_city": "Metro"
+    },
+    "accommodation": {
+        "recommended_areas": [
+            "Le Marais",
+            "Latin Quarter"
         ]
     }
-)
-LOGISTIC_RESPONSE = json.dumps(
-    {
-        "transportation": {"from_airport": "Taxi or train", "around_city": "Metro"},
-        "accommodation": {"recommended_areas": ["Le Marais", "Latin Quarter"]},
+}
+"""
+FINANCE_RESPONSE = """\
+{
+    "budget_breakdown": {
+        "accommodation": 800,
+        "food": 500,
+        "activities": 300,
+        "transportation": 300,
+        "misc": 100
     }
-)
-FINANCE_RESPONSE = json.dumps(
-    {
-        "budget_breakdown": {
+}
+"""
+FINAL_PLAN_RESPONSE = """\
+{
+    "overview": "A romantic weekend in Paris for a couple with a $2000 budget.",
+    "itinerary": [
+        {
+            "day": "Day 1",
+            "activities": [
+                "Arrive in Paris",
+                "Check into hotel",
+                "Evening at Eiffel Tower"
+            ]
+        },
+        {
+            "day": "Day 2",
+            "activities": [
+                "Morning at Louvre",
+                "Lunch in Latin Quarter",
+                "Evening Seine cruise"
+            ]
+        },
+        {
+            "day": "Day 3",
+            "activities": [
+                "Shopping in Le Marais",
+                "Farewell dinner",
+                "Departure"
+            ]
+        }
+    ],
+    "budget": {
+        "total": 2000,
+        "breakdown": {
             "accommodation": 800,
             "food": 500,
             "activities": 300,
             "transportation": 300,
-            "misc": 100,
+            "misc": 100
         }
+    },
+    "safety": {
+        "rating": 4,
+        "tips": "Keep valuables secure and be aware of pickpockets in tourist areas."
     }
+}
+"""
+
+# First keyword found in the task description wins, so order matters
+_DISPATCH = (
+    ("confidence", CONFIDENCE_RESPONSE),
+    ("break down", BREAKDOWN_RESPONSE),
+    ("real-time", INFO_RESPONSE),
+    ("safety", SAFETY_RESPONSE),
+    ("experience", EXPERIENCE_RESPONSE),
+    ("logistic", LOGISTIC_RESPONSE),
+    ("budget", FINANCE_RESPONSE),
+    ("synthesize", FINAL_PLAN_RESPONSE),
 )
-FINAL_PLAN_RESPONSE = json.dumps(
-    {
-        "overview": "A romantic weekend in Paris for a couple with a $2000 budget.",
-        "itinerary": [
-            {
-                "day": "Day 1",
-                "activities": ["Arrive in Paris", "Check into hotel", "Evening at Eiffel Tower"],
-            },
-            {
-                "day": "Day 2",
-                "activities": [
-                    "Morning at Louvre",
-                    "Lunch in Latin Quarter",
-                    "Evening Seine cruise",
-                ],
-            },
-            {
-                "day": "Day 3",
-                "activities": ["Shopping in Le Marais", "Farewell dinner", "Departure"],
-            },
-        ],
-        "budget": {
-            "total": 2000,
-            "breakdown": {
-                "accommodation": 800,
-                "food": 500,
-                "activities": 300,
-                "transportation": 300,
-                "misc": 100,
-            },
-        },
-        "safety": {
-            "rating": 4,
-            "tips": "Keep valuables secure and be aware of pickpockets in tourist areas.",
-        },
-    }
-)
+_UNKNOWN_RESPONSE = '{"error": "Unknown task type"}'
+# Every dispatch keyword in one pass over the description
+_KEYWORD_RE = re.compile("|".join(re.escape(keyword) for keyword, _ in _DISPATCH), re.IGNORECASE)
 
 
-def mock_kickoff(*args, **kwargs):
-    """Mock the kickoff method of Crew to return predefined responses based on the task description."""
-    # Get the task description from the first task in the crew
-    if not kwargs.get("tasks") and not args[0].tasks:
+def _response_for(crew):
+    """Pick the predefined response matching the crew's first task description."""
+    if not crew.tasks:
         return "No tasks defined"
+    found = {match.lower() for match in _KEYWORD_RE.findall(crew.tasks[0].description)}
+    return next(
+        (response for keyword, response in _DISPATCH if keyword in found),
+        _UNKNOWN_RESPONSE,
+    )
 
-    tasks = kwargs.get("tasks", args[0].tasks)
-    if not tasks:
-        return "No tasks defined"
 
-    task = tasks[0]
-    description = task.description.lower()
-
-    # Return appropriate response based on task description
-    if "confidence" in description:
-        return CONFIDENCE_RESPONSE
-    elif "breakdown" in description:
-        return BREAKDOWN_RESPONSE
-    elif "gather information" in description:
-        return INFO_RESPONSE
-    elif "safety" in description:
-        return SAFETY_RESPONSE
-    elif "experience" in description:
-        return EXPERIENCE_RESPONSE
-    elif "logistic" in description:
-        return LOGISTIC_RESPONSE
-    elif "finance" in description:
-        return FINANCE_RESPONSE
-    elif "synthesis" in description:
-        return FINAL_PLAN_RESPONSE
-    else:
-        return json.dumps({"error": "Unknown task type"})
+def mock_kickoff(crew, *args, **kwargs):
+    """Mock Crew.kickoff (patched with autospec, so the crew arrives as ``self``)."""
+    return _response_for(crew)
 
 
-def test_travel_planning():
-    """Test the travel planning system with mocked responses."""
+async def mock_kickoff_async(crew, *args, **kwargs):
+    """Mock Crew.kickoff_async; yields once so concurrent kickoffs interleave."""
+    await asyncio.sleep(0)
+    return _response_for(crew)
+
+
+@cache
+def _get_crew():
+    """One TravelCrew for the module; plan_trip keeps no per-query state."""
     from project_hermes.crews.travel_crew.travel_crew import TravelCrew
 
-    # Create a travel crew instance
-    travel_crew = TravelCrew(verbose=True)
+    return TravelCrew(verbose=True)
+
+
+def test_mock_responses_are_json_objects():
+    """The literal responses above must stay valid JSON."""
+    for _, response in _DISPATCH:
+        assert isinstance(json.loads(response), dict)
+
+
+def test_travel_planning():
+    """Test the travel planning system with mocked responses."""
+    travel_crew = _get_crew()
 
     # Mock the Crew.kickoff method to return our predefined responses
-    with patch("crewai.Crew.kickoff", side_effect=mock_kickoff):
+    with patch.object(Crew, "kickoff", autospec=True, side_effect=mock_kickoff):
         # Test with a travel query
         query = "Plan a weekend trip to Paris for a couple with a budget of $2000"
-        logger.info(f"Testing query: {query}")
+        logger.info("Testing query: %s", query)
 
         # Get the travel plan
         result = travel_crew.plan_trip(query)
@@ -158,19 +219,51 @@ def test_travel_planning():
         assert result["confidence_score"] >= 0.6, "Expected confidence score >= 0.6"
         assert "travel_plan" in result, "Expected travel_plan in result"
 
-        # Print the result
+        # Print the result; only serialized when INFO is actually emitted
         logger.info("Test passed! Result:")
-        logger.info(json.dumps(result, indent=2))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_pretty(result))
 
         return result
 
 
+def test_travel_flow_runs_specialists_concurrently():
+    """Drive the full TravelFlow: confidence and breakdown run first, then the five
+    specialists are awaited together via asyncio.gather, then synthesis."""
+    from project_hermes.crews.travel_crew.flow import TravelFlow
+
+    in_flight = 0
+    peak = 0
+
+    async def tracked_kickoff_async(crew, *args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await mock_kickoff_async(crew, *args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    flow = TravelFlow()
+    query = "Plan a weekend trip to Paris for a couple with a budget of $2000"
+    with (
+        patch.object(Crew, "kickoff", autospec=True, side_effect=mock_kickoff),
+        patch.object(Crew, "kickoff_async", autospec=True, side_effect=tracked_kickoff_async),
+    ):
+        asyncio.run(flow.kickoff_async(inputs={"query": query, "no_cache": True}))
+
+    assert flow.state.success, flow.state.error
+    assert peak == 5, "Expected all five specialists in flight at once"
+    assert flow.state.final_plan == json.loads(FINAL_PLAN_RESPONSE)
+
+
 if __name__ == "__main__":
     logger.info("Starting mocked travel planning test...")
     try:
         result = test_travel_planning()
+        test_travel_flow_runs_specialists_concurrently()
         logger.info("All tests passed successfully! 🎉")
     except Exception as e:
-        logger.error(f"Test failed: {e}", exc_info=True)
+        logger.error("Test failed: %s", e, exc_info=True)
     finally:
         logger.info("Test completed.")
@@ -3,9 +3,9 @@ Project Hermes - Travel Crew Test with Mocked Response
 """
 
 import os
-import json
 from unittest.mock import patch
 from dotenv import load_dotenv
+import orjson
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +22,10 @@ def print_section(title):
     print("=" * 60)
 
 
+def _pretty(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
 def test_travel_crew_with_mock():
     print_section("TESTING TRAVEL CREW WITH MOCKED RESPONSE")
 
@@ -36,7 +40,7 @@ def test_travel_crew_with_mock():
     from project_hermes.crews.travel_crew.travel_crew import TravelCrew
 
     # The response to return when crew.kickoff() is called
-    mock_response = json.dumps({"score": 0.85, "prompt": "Plan a trip to Paris"})
+    mock_response = orjson.dumps({"score": 0.85, "prompt": "Plan a trip to Paris"}).decode()
 
     # Use a context manager to patch the Crew.kickoff method
     with patch("crewai.Crew.kickoff", return_value=mock_response):
@@ -48,7 +52,7 @@ def test_travel_crew_with_mock():
 
         # Print the result
         print("\nRESULT:")
-        print(json.dumps(result, indent=2))
+        print(_pretty(result))
 
         # Verify the result structure
         print("\nVERIFICATION:")
@@ -5,25 +5,26 @@ This script demonstrates how Project Hermes can use different LLM providers
 (OpenAI, Gemini, Claude) based on available API keys.
 """
 
-import os
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 import sys
 
-# Add the backend directory to the Python path
-sys.path.append("/Users/shubhranshumohanty/Developer/Project-Hermes/backend")
-
-# Load environment variables
-load_dotenv()
-
 # Check what API keys are available
-openai_key = os.getenv("OPENAI_API_KEY")
-gemini_key = os.getenv("GEMINI_API_KEY")
-claude_key = os.getenv("CLAUDE_API_KEY")
-
-print("API Key Status:")
-print(f"- OpenAI API Key: {'Available' if openai_key else 'Not available'}")
-print(f"- Gemini API Key: {'Available' if gemini_key else 'Not available'}")
-print(f"- Claude API Key: {'Available' if claude_key else 'Not available'}")
+from _env import KEYS
+
+openai_key = KEYS["openai"]
+gemini_key = KEYS["gemini"]
+claude_key = KEYS["claude"]
+
+print(
+    "\n".join(
+        [
+            "API Key Status:",
+            f"- OpenAI API Key: {'Available' if openai_key else 'Not available'}",
+            f"- Gemini API Key: {'Available' if gemini_key else 'Not available'}",
+            f"- Claude API Key: {'Available' if claude_key else 'Not available'}",
+        ]
+    )
+)
 
 # Import the TravelCrew class
 try:
@@ -37,26 +38,30 @@ except ImportError as e:
 
 def test_provider(provider_name):
     """Test a specific LLM provider."""
-    print(f"\n--- Testing {provider_name.upper()} Provider ---")
+    # Providers are checked concurrently: print the report in one go so the
+    # lines of different providers don't interleave
+    report = [f"\n--- Testing {provider_name.upper()} Provider ---"]
 
     try:
         # Try to create a TravelCrew instance with the specified provider
         crew = TravelCrew(llm_provider=provider_name)
-        print(f"✅ Successfully initialized TravelCrew with {provider_name}")
+        report.append(f"✅ Successfully initialized TravelCrew with {provider_name}")
 
         # Print details about the LLM being used
         llm_type = type(crew.llm).__name__
-        print(f"LLM Type: {llm_type}")
+        report.append(f"LLM Type: {llm_type}")
 
         if hasattr(crew.llm, "model_name"):
-            print(f"Model Name: {crew.llm.model_name}")
+            report.append(f"Model Name: {crew.llm.model_name}")
         elif hasattr(crew.llm, "model"):
-            print(f"Model Name: {crew.llm.model}")
+            report.append(f"Model Name: {crew.llm.model}")
 
         return True
     except Exception as e:
-        print(f"❌ Failed to initialize with {provider_name}: {e}")
+        report.append(f"❌ Failed to initialize with {provider_name}: {e}")
         return False
+    finally:
+        print("\n".join(report))
 
 
 # Try auto-detection first
@@ -68,20 +73,25 @@ try:
 except Exception as e:
     print(f"❌ Auto-detection failed: {e}")
 
-# Test each provider explicitly
-if openai_key:
-    test_provider("openai")
-else:
-    print("\n--- Skipping OpenAI test (no API key) ---")
-
-if gemini_key:
-    test_provider("gemini")
-else:
-    print("\n--- Skipping Gemini test (no API key) ---")
-
-if claude_key:
-    test_provider("claude")
-else:
-    print("\n--- Skipping Claude test (no API key) ---")
+# Test each provider explicitly, all at once
+providers = []
+skipped = []
+for name, label, key in (
+    ("openai", "OpenAI", openai_key),
+    ("gemini", "Gemini", gemini_key),
+    ("claude", "Claude", claude_key),
+):
+    if key:
+        providers.append(name)
+    else:
+        skipped.append(f"\n--- Skipping {label} test (no API key) ---")
+if skipped:
+    print("\n".join(skipped))
+
+if providers:
+    # Submit every check before waiting on any of them
+    with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+        futures = {name: pool.submit(test_provider, name) for name in providers}
+    results = {name: future.result() for name, future in futures.items()}
 
 print("\nMulti-provider testing completed!")
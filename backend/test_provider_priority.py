@@ -3,17 +3,9 @@
 Test the new provider priority order (Gemini -> Claude -> OpenAI)
 """
 
-import os
 import sys
-from dotenv import load_dotenv
 
-# Add the backend directory to the Python path
-backend_dir = os.path.dirname(os.path.abspath(__file__))
-if backend_dir not in sys.path:
-    sys.path.append(backend_dir)
-
-# Load environment variables
-load_dotenv()
+from _env import KEYS
 
 # Import the new multi-provider TravelCrew
 try:
@@ -30,14 +22,20 @@ def test_auto_detection():
     print("\n--- Testing Provider Auto-Detection ---")
 
     # Check available API keys
-    has_gemini = bool(os.getenv("GEMINI_API_KEY"))
-    has_claude = bool(os.getenv("CLAUDE_API_KEY"))
-    has_openai = bool(os.getenv("OPENAI_API_KEY"))
-
-    print("Available API Keys:")
-    print(f"- Gemini (primary):   {'YES' if has_gemini else 'NO'}")
-    print(f"- Claude (secondary): {'YES' if has_claude else 'NO'}")
-    print(f"- OpenAI (tertiary):  {'YES' if has_openai else 'NO'}")
+    has_gemini = bool(KEYS["gemini"])
+    has_claude = bool(KEYS["claude"])
+    has_openai = bool(KEYS["openai"])
+
+    print(
+        "\n".join(
+            [
+                "Available API Keys:",
+                f"- Gemini (primary):   {'YES' if has_gemini else 'NO'}",
+                f"- Claude (secondary): {'YES' if has_claude else 'NO'}",
+                f"- OpenAI (tertiary):  {'YES' if has_openai else 'NO'}",
+            ]
+        )
+    )
 
     try:
         # Auto-detect the provider
@@ -47,8 +45,7 @@ def test_auto_detection():
         provider_name = crew.llm_provider_name
         llm_type = type(crew.llm).__name__
 
-        print(f"\n✅ Auto-detected provider: {provider_name}")
-        print(f"   LLM Type: {llm_type}")
+        print(f"\n✅ Auto-detected provider: {provider_name}\n   LLM Type: {llm_type}")
 
         # Verify the expected priority order
         if has_gemini:
@@ -75,43 +72,29 @@ def test_explicit_selection():
     print("\n--- Testing Explicit Provider Selection ---")
 
     # Test each provider explicitly if the API key is available
-    has_gemini = bool(os.getenv("GEMINI_API_KEY"))
-    has_claude = bool(os.getenv("CLAUDE_API_KEY"))
-    has_openai = bool(os.getenv("OPENAI_API_KEY"))
-
-    if has_gemini:
-        try:
-            crew = TravelCrew(llm_provider="gemini")
-            print(f"✅ Explicitly selected Gemini: {type(crew.llm).__name__}")
-        except Exception as e:
-            print(f"❌ Failed to explicitly select Gemini: {e}")
-    else:
-        print("⚠️ Skipping Gemini test (no API key)")
-
-    if has_claude:
-        try:
-            crew = TravelCrew(llm_provider="claude")
-            print(f"✅ Explicitly selected Claude: {type(crew.llm).__name__}")
-        except Exception as e:
-            print(f"❌ Failed to explicitly select Claude: {e}")
-    else:
-        print("⚠️ Skipping Claude test (no API key)")
-
-    if has_openai:
+    for provider, label in (("gemini", "Gemini"), ("claude", "Claude"), ("openai", "OpenAI")):
+        if not KEYS[provider]:
+            print(f"⚠️ Skipping {label} test (no API key)")
+            continue
         try:
-            crew = TravelCrew(llm_provider="openai")
-            print(f"✅ Explicitly selected OpenAI: {type(crew.llm).__name__}")
+            crew = TravelCrew(llm_provider=provider)
+            llm_type = type(crew.llm).__name__
+            print(f"✅ Explicitly selected {label}: {llm_type}")
         except Exception as e:
-            print(f"❌ Failed to explicitly select OpenAI: {e}")
-    else:
-        print("⚠️ Skipping OpenAI test (no API key)")
+            print(f"❌ Failed to explicitly select {label}: {e}")
 
 
 def main():
     """Run all tests."""
-    print("Testing Multi-Provider Priority Order")
-    print("======================================")
-    print("Priority: 1. Gemini → 2. Claude → 3. OpenAI")
+    print(
+        "\n".join(
+            [
+                "Testing Multi-Provider Priority Order",
+                "======================================",
+                "Priority: 1. Gemini → 2. Claude → 3. OpenAI",
+            ]
+        )
+    )
 
     test_auto_detection()
     test_explicit_selection()
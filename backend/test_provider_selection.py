@@ -2,19 +2,18 @@
 Simple Test of Provider Selection in TravelCrew
 """
 
-import os
-import sys
-from dotenv import load_dotenv
+from functools import cache
 
-# Add the backend directory to the Python path
-backend_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(backend_dir)
+from _env import KEYS
 
-# Load environment variables
-load_dotenv()
 
-# Import the TravelCrew class
-from travel_crew import TravelCrew
+@cache
+def _get_crew(provider_name=None):
+    # Built once per provider, however many times a provider is checked; imported
+    # here so collecting this module doesn't load crewai
+    from travel_crew import TravelCrew
+
+    return TravelCrew(llm_provider=provider_name)
 
 
 def test_provider(provider_name=None):
@@ -22,14 +21,13 @@ def test_provider(provider_name=None):
     print(f"\n--- Testing TravelCrew with {provider_name or 'auto-detected'} provider ---")
 
     # Create a TravelCrew instance with the specified provider
-    crew = TravelCrew(llm_provider=provider_name)
+    crew = _get_crew(provider_name)
 
     # Get the LLM type
     llm_type = type(crew.llm).__name__
-    print(f"Using LLM: {llm_type}")
+    print(f"Using LLM: {llm_type}\n\nTesting plan trip method:")
 
     # Basic functionality test
-    print("\nTesting plan trip method:")
     query = "What's the capital of France?"
     try:
         result = crew.plan_trip(query)
@@ -40,18 +38,25 @@ def test_provider(provider_name=None):
     return crew
 
 
-# Test with different providers
-print("Available API Keys:")
-print(f"- OpenAI: {'Yes' if os.getenv('OPENAI_API_KEY') else 'No'}")
-print(f"- Gemini: {'Yes' if os.getenv('GEMINI_API_KEY') else 'No'}")
-print(f"- Claude: {'Yes' if os.getenv('CLAUDE_API_KEY') else 'No'}")
-
-# Auto-detect
-auto_crew = test_provider()
-
-# Test each provider explicitly
-openai_crew = test_provider("openai")
-gemini_crew = test_provider("gemini")
-claude_crew = test_provider("claude")
-
-print("\nAll provider tests completed!")
+if __name__ == "__main__":
+    # Test with different providers
+    print(
+        "\n".join(
+            [
+                "Available API Keys:",
+                f"- OpenAI: {'Yes' if KEYS['openai'] else 'No'}",
+                f"- Gemini: {'Yes' if KEYS['gemini'] else 'No'}",
+                f"- Claude: {'Yes' if KEYS['claude'] else 'No'}",
+            ]
+        )
+    )
+
+    # Auto-detect
+    auto_crew = test_provider()
+
+    # Test each provider explicitly
+    openai_crew = test_provider("openai")
+    gemini_crew = test_provider("gemini")
+    claude_crew = test_provider("claude")
+
+    print("\nAll provider tests completed!")
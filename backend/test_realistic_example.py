@@ -5,23 +5,10 @@ This script tests the travel planning system with a realistic query,
 using the Gemini provider which has a valid API key.
 """
 
-import os
-import sys
 import json
-from dotenv import load_dotenv
 
-# Add necessary paths
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-backend_dir = os.path.join(project_root, "backend")
-src_dir = os.path.join(backend_dir, "src")
-sys.path.append(backend_dir)
-sys.path.append(src_dir)
-
-# Load environment variables
-load_dotenv()
-
-# Import the travel crew
-from travel_crew import TravelCrew
+# Environment variables are loaded once, by _env
+from _env import KEYS
 
 
 def print_section(title):
@@ -100,10 +87,10 @@ def main():
     # Check available providers
     print("Available API Keys:")
     print(
-        f"- OpenAI: {'Available' if os.getenv('OPENAI_API_KEY') and os.getenv('OPENAI_API_KEY') != 'dummy_key_for_testing' else 'Not available'}"
+        f"- OpenAI: {'Available' if KEYS['openai'] and KEYS['openai'] != 'dummy_key_for_testing' else 'Not available'}"
     )
-    print(f"- Gemini: {'Available' if os.getenv('GEMINI_API_KEY') else 'Not available'}")
-    print(f"- Claude: {'Available' if os.getenv('CLAUDE_API_KEY') else 'Not available'}")
+    print(f"- Gemini: {'Available' if KEYS['gemini'] else 'Not available'}")
+    print(f"- Claude: {'Available' if KEYS['claude'] else 'Not available'}")
 
     # Use Gemini for this test (it has a valid API key)
     provider = "gemini"
@@ -116,6 +103,10 @@ def main():
     print(query)
 
     try:
+        # Imported here so collecting this module doesn't load crewai
+        from _response_cache import cached_travel_plan
+        from travel_crew import TravelCrew
+
         # Create a TravelCrew instance with the Gemini provider
         travel_crew = TravelCrew(llm_provider=provider)
 
@@ -126,7 +117,7 @@ def main():
 
         # Plan the trip
         print("\nPlanning trip...")
-        result = travel_crew.create_travel_plan(query)
+        result = cached_travel_plan(travel_crew, query, provider)
 
         # Calculate and display the time taken
         elapsed_time = time.time() - start_time
@@ -6,8 +6,11 @@ This script tests the travel planning system directly, without going through the
 It's useful for debugging and development.
 """
 
-from travel_crew import TravelCrew
-import json
+import os
+
+import orjson
+
+from _response_cache import cached_travel_plan
 
 
 def test_travel_query(query):
@@ -15,11 +18,14 @@ def test_travel_query(query):
     print("\n===== Testing Travel Query =====")
     print(f"Query: {query}")
 
+    # Imported here so collecting this module doesn't load crewai
+    from travel_crew import TravelCrew
+
     # Create travel crew
     travel_crew = TravelCrew()
 
-    # Get travel plan
-    result = travel_crew.create_travel_plan(query)
+    # Get travel plan, from the on-disk cache when HERMES_TEST_CACHE=1
+    result = cached_travel_plan(travel_crew, query)
 
     # Print results
     print("\n===== Results =====")
@@ -57,13 +63,17 @@ if __name__ == "__main__":
     non_travel_query = "What's the capital of France?"
     result2 = test_travel_query(non_travel_query)
 
-    # Save results to file for reference
-    with open("test_results.json", "w") as f:
-        json.dump(
-            {
-                "travel_query": {"query": travel_query, "result": result1},
-                "non_travel_query": {"query": non_travel_query, "result": result2},
-            },
-            f,
-            indent=2,
-        )
+    # Save results to file for reference, only when asked to
+    if os.getenv("HERMES_DUMP_RESULTS") == "1":
+        with open("test_results.json", "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {
+                        "travel_query": {"query": travel_query, "result": result1},
+                        "non_travel_query": {"query": non_travel_query, "result": result2},
+                    },
+                    # Task outputs are objects, not JSON values: write their text
+                    default=str,
+                    option=orjson.OPT_INDENT_2,
+                )
+            )
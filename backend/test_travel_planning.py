@@ -3,9 +3,12 @@
 Simple test script for the travel crew implementation.
 """
 
-import json
 import sys
+from functools import cache
 from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import orjson
 
 # Add the project to the Python path
 src_path = Path(__file__).parent.parent / "src"
@@ -14,12 +17,22 @@ sys.path.append(str(src_path.absolute()))
 from project_hermes.crews.travel_crew.travel_crew import TravelCrew
 
 
+def _pretty(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+@cache
+def _get_crew() -> TravelCrew:
+    # One crew serves every test in the module; plan_trip keeps no per-query state
+    return TravelCrew(verbose=True)
+
+
 def test_travel_related_query():
     """Test with a travel-related query."""
-    travel_crew = TravelCrew(verbose=True)
+    travel_crew = _get_crew()
     result = travel_crew.plan_trip("Plan a weekend trip to Paris")
     print("\n=== Travel-Related Query Result ===")
-    print(json.dumps(result, indent=2))
+    print(_pretty(result))
     assert result["success"] is True
     assert "travel_plan" in result
     assert result["confidence_score"] >= 0.6
@@ -28,10 +41,14 @@ def test_travel_related_query():
 
 def test_non_travel_query():
     """Test with a non-travel-related query."""
-    travel_crew = TravelCrew(verbose=True)
-    result = travel_crew.plan_trip("What is the capital of France?")
+    travel_crew = _get_crew()
+    # Only the confidence stage runs for a rejected query, so it is the only one stubbed
+    with patch("project_hermes.crews.travel_crew.travel_crew.Crew") as crew_cls:
+        kickoff = crew_cls.return_value.kickoff = MagicMock(return_value='{"score": 0.2}')
+        result = travel_crew.plan_trip("What is the capital of France?")
+    assert kickoff.call_count <= 1
     print("\n=== Non-Travel Query Result ===")
-    print(json.dumps(result, indent=2))
+    print(_pretty(result))
     assert result["success"] is False
     assert "error" in result
     assert "not appear to be travel-related" in result["error"]
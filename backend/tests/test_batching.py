@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from project_hermes.batching import MicroBatcher
+
+
+def test_micro_batcher_groups_submissions_within_window():
+    batches = []
+
+    async def handler(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def main():
+        batcher = MicroBatcher(handler, max_batch=8, window_ms=20)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+
+def test_micro_batcher_raises_per_item_errors():
+    async def handler(items):
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    async def main():
+        batcher = MicroBatcher(handler, max_batch=2, window_ms=20)
+        batcher.start()
+        try:
+            ok = batcher.submit("ok")
+            bad = batcher.submit("bad")
+            return await asyncio.gather(ok, bad, return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    ok, bad = asyncio.run(main())
+    assert ok == "ok"
+    assert isinstance(bad, ValueError)
+
+
+def test_micro_batcher_requires_start():
+    async def handler(items):
+        return items
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(MicroBatcher(handler).submit(1))
+
+
+def test_micro_batcher_stop_fails_pending_submissions():
+    async def handler(items):
+        await asyncio.sleep(60)
+        return items
+
+    async def main():
+        batcher = MicroBatcher(handler, max_batch=1, window_ms=0)
+        batcher.start()
+        submissions = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        await batcher.stop()
+        return await asyncio.gather(*submissions, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
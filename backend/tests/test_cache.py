@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from project_hermes.cache import (
+    PlanStore,
+    SingleFlight,
+    TTLCache,
+    normalize_query,
+    plan_cache_key,
+)
+from project_hermes.errors import PlanError
+
+
+def test_normalize_query_collapses_case_and_whitespace():
+    assert normalize_query("  Plan a  Trip\tto PARIS ") == "plan a trip to paris"
+
+
+def test_plan_cache_key_ignores_formatting_but_not_provider():
+    key = plan_cache_key("Plan a trip to Paris", None)
+    assert key == plan_cache_key("plan a trip  to paris ", None)
+    assert key[0] == "auto"
+    assert key != plan_cache_key("Plan a trip to Paris", "gemini")
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("project_hermes.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    now[0] += 11
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "plan"
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        assert len(flight) == 0
+        return results
+
+    assert asyncio.run(main()) == ["plan"] * 5
+    assert len(calls) == 1
+
+
+class _DictSharedCache:
+    """In-memory stand-in for RedisPlanCache (same async interface)."""
+
+    def __init__(self):
+        self.data = {}
+        self.locked = set()
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value):
+        self.data[key] = value
+
+    async def acquire(self, key):
+        if key in self.locked:
+            return False
+        self.locked.add(key)
+        return True
+
+    async def release(self, key):
+        self.locked.discard(key)
+
+    async def wait(self, key):
+        while key in self.locked:
+            await asyncio.sleep(0)
+        return self.data.get(key)
+
+
+def test_plan_store_counts_hits_and_skips_failed_plans():
+    results = iter([{"success": False}, {"success": True, "plan": 1}])
+
+    async def work():
+        return next(results)
+
+    async def main():
+        store = PlanStore(TTLCache(maxsize=4, ttl=60))
+        assert (await store.get_or_create(("auto", "k"), work))["success"] is False
+        assert (await store.get_or_create(("auto", "k"), work))["plan"] == 1
+        assert (await store.get_or_create(("auto", "k"), work))["plan"] == 1
+        return store
+
+    store = asyncio.run(main())
+    assert (store.hits, store.misses) == (1, 2)
+    assert "cache_hits_total 1\n" in store.metrics()
+
+
+def test_plan_store_get_and_set_only_keep_successful_plans():
+    async def main():
+        store = PlanStore(TTLCache(maxsize=4, ttl=60))
+        key = plan_cache_key("Plan a trip to Paris", None)
+        assert await store.get(key) is None
+        await store.set(key, {"success": False})
+        assert await store.get(key) is None
+        await store.set(key, {"success": True, "plan": 1})
+        assert (await store.get(key))["plan"] == 1
+        return store
+
+    store = asyncio.run(main())
+    assert (store.hits, store.misses) == (1, 2)
+
+
+def test_plan_store_shares_plans_across_workers():
+    shared = _DictSharedCache()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"success": True}
+
+    async def main():
+        # Two stores model two workers pointed at the same shared cache
+        first = PlanStore(TTLCache(), shared)
+        second = PlanStore(TTLCache(), shared)
+        await asyncio.gather(
+            first.get_or_create(("auto", "k"), work), second.get_or_create(("auto", "k"), work)
+        )
+        assert await PlanStore(TTLCache(), shared).get_or_create(("auto", "k"), work)
+
+    asyncio.run(main())
+    assert len(calls) == 1
+    assert not shared.locked
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_plan_store_fails_fast_for_rate_limited_provider():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        raise RateLimitError("slow down")
+
+    async def main():
+        store = PlanStore(TTLCache(), negative_ttl=60)
+        for query in ("a", "b"):
+            with pytest.raises(PlanError) as info:
+                await store.get_or_create(("gemini", query), work)
+            assert isinstance(info.value.cause, RateLimitError)
+
+    asyncio.run(main())
+    assert len(calls) == 1
@@ -0,0 +1,25 @@
+from project_hermes.circuit import CircuitBreaker, State
+
+
+def test_circuit_opens_after_threshold_and_half_opens_after_break(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("project_hermes.circuit.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(threshold=2, break_seconds=10)
+
+    breaker.record_failure("gemini")
+    assert breaker.allow("gemini")
+    breaker.record_failure("gemini")
+    assert breaker.state("gemini") is State.OPEN
+    assert not breaker.allow("gemini")
+    assert breaker.allow("openai")
+
+    now[0] = 11.0
+    assert breaker.allow("gemini")
+    assert breaker.state("gemini") is State.HALF_OPEN
+    breaker.record_failure("gemini")
+    assert not breaker.allow("gemini")
+
+    now[0] = 22.0
+    assert breaker.allow("gemini")
+    breaker.record_success("gemini")
+    assert breaker.state("gemini") is State.CLOSED
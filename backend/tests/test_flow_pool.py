@@ -0,0 +1,23 @@
+import asyncio
+from unittest.mock import patch
+
+from project_hermes.crews.travel_crew.pool import FlowPool
+
+
+def test_flow_pool_reuses_flows_with_fresh_state():
+    with (
+        patch("project_hermes.crews.travel_crew.pool.configure_llm_http"),
+        patch("project_hermes.crews.travel_crew.pool._AGENT_PROPERTIES", ()),
+    ):
+        pool = FlowPool(size=1)
+        pool.fill()
+
+    async def run():
+        async with pool.flow() as first:
+            first.state.query = "Plan a trip to Tokyo"
+        async with pool.flow() as second:
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert second.state.query == ""
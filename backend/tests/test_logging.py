@@ -0,0 +1,15 @@
+import logging
+
+import orjson
+
+from project_hermes.logging import JSONFormatter
+
+
+def test_json_formatter_escapes_quotes_in_messages():
+    record = logging.LogRecord("hermes", logging.INFO, __file__, 1, 'said "hi" %s', ("x",), None)
+    formatted = orjson.loads(JSONFormatter().format(record))
+
+    assert formatted["level"] == "INFO"
+    assert formatted["name"] == "hermes"
+    assert formatted["message"] == 'said "hi" x'
+    assert "exc_info" not in formatted
@@ -0,0 +1,39 @@
+from project_hermes import main
+from project_hermes.poem_cache import LLMCache, poem_cache_key, poem_namespace
+from project_hermes.semantic_cache import SemanticCache
+
+
+def test_poem_cache_key_depends_on_topic_count_and_model():
+    key = poem_cache_key("sea", 3, None)
+    assert key == poem_cache_key("sea", 3, "default")
+    assert key != poem_cache_key("sea", 4, None)
+    assert key != poem_cache_key("sea", 3, "gemini/gemini-2.0-flash")
+
+
+def test_generate_poem_serves_cache_hits(monkeypatch):
+    cache = LLMCache()
+    cache.set(poem_cache_key("sea", 2, None), "CACHED POEM")
+    monkeypatch.setattr(main, "get_poem_cache", lambda: cache)
+    monkeypatch.setattr(main, "get_poem_semantic_cache", lambda: None)
+    monkeypatch.setattr(main, "SENTENCE_COUNT_OVERRIDE", 2)
+    monkeypatch.delenv("POEM_FAKE_OUTPUT", raising=False)
+    monkeypatch.delenv("POEM_PRIMARY_MODEL", raising=False)
+
+    state = main.run_flow("sea")
+
+    assert state.poem == "CACHED POEM"
+    assert state.model_used == "cache"
+    assert state.attempts == 0
+
+
+def test_generate_poem_matches_paraphrased_topics(monkeypatch):
+    semantic_cache = SemanticCache()
+    semantic_cache.set(poem_namespace(2, None), "crewai gemini integration", "SIMILAR POEM")
+    monkeypatch.setattr(main, "get_poem_cache", lambda: None)
+    monkeypatch.setattr(main, "get_poem_semantic_cache", lambda: semantic_cache)
+    monkeypatch.setattr(main, "SENTENCE_COUNT_OVERRIDE", 2)
+    monkeypatch.delenv("POEM_FAKE_OUTPUT", raising=False)
+    monkeypatch.delenv("POEM_PRIMARY_MODEL", raising=False)
+
+    assert main.run_flow("CrewAI Gemini integration").poem == "SIMILAR POEM"
+
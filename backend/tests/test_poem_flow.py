@@ -1,6 +1,10 @@
+import asyncio
 import sys
 from pathlib import Path
+from unittest.mock import MagicMock
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient  # type: ignore
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -8,28 +12,39 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:  # pragma: no cover (environmental)
     sys.path.insert(0, str(SRC))
 
+from project_hermes import main  # noqa: E402
 from project_hermes.api import app  # noqa: E402
+from project_hermes.errors import is_transient  # noqa: E402
 from project_hermes.main import kickoff  # noqa: E402
 
 
+@pytest.fixture(scope="module")
+def client():
+    # One client for the module; requests go through the app without running its
+    # lifespan, as the per-test clients did
+    return TestClient(app)
+
+
 def test_kickoff_fake_output(monkeypatch):
     monkeypatch.setenv("POEM_FAKE_OUTPUT", "FAKE POEM")
     poem = kickoff("test topic")
     assert poem == "FAKE POEM"
 
 
-def test_health():
-    client = TestClient(app)
-    r = client.get("/healthz")
-    assert r.status_code == 200
-    data = r.json()
-    assert data["status"] == "ok"
+def test_health_and_poem_endpoints_concurrently(monkeypatch):
+    # Both requests share one env, so they can be in flight together; the forced
+    # error test needs a conflicting env and stays on its own
+    monkeypatch.setenv("POEM_FAKE_OUTPUT", "API POEM")
 
+    async def fetch():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(ac.get("/healthz"), ac.get("/poem/demo"))
+
+    health, r = asyncio.run(fetch())
+    assert health.status_code == 200
+    assert health.json()["status"] == "ok"
 
-def test_poem_endpoint(monkeypatch):
-    monkeypatch.setenv("POEM_FAKE_OUTPUT", "API POEM")
-    client = TestClient(app)
-    r = client.get("/poem/demo")
     assert r.status_code == 200
     data = r.json()
     assert data["poem"] == "API POEM"
@@ -39,14 +54,120 @@ def test_poem_endpoint(monkeypatch):
     assert data["attempts"] >= 0
 
 
-def test_poem_endpoint_forced_error(monkeypatch):
+def test_poem_endpoint_forced_error(client, monkeypatch):
     # Force simulated error and ensure structured failure response
     monkeypatch.delenv("POEM_FAKE_OUTPUT", raising=False)
     monkeypatch.setenv("POEM_FORCE_ERROR", "1")
-    client = TestClient(app)
     r = client.get("/poem/broken")
     assert r.status_code == 200  # still 200 unless POEM_STRICT=1
     data = r.json()
     assert data["success"] is False
     assert data["error"]
-    assert data["poem"] == "<error generating poem>"
\ No newline at end of file
+    assert data["poem"] == "<error generating poem>"
+
+def test_travel_plan_rejects_invalid_body(client):
+    r = client.post("/travel/plan", json={"llm_provider": "gemini"})
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", "query"]
+    r = client.post(
+        "/travel/plan", content=b"{not json", headers={"content-type": "application/json"}
+    )
+    assert r.status_code == 422
+
+
+def test_travel_plan_documents_request_body():
+    schema = app.openapi()["paths"]["/travel/plan"]["post"]["requestBody"]
+    assert schema["content"]["application/json"]["schema"]["required"] == ["query"]
+
+
+def test_travel_plan_failure_is_structured(client, monkeypatch):
+    def boom(_provider):
+        raise ValueError("no API key")
+
+    monkeypatch.setattr("project_hermes.api._get_crew", boom)
+    r = client.post("/travel/plan", json={"query": "Trip to Rome", "llm_provider": "x"})
+    assert r.status_code == 502
+    assert r.json() == {"success": False, "error": "ValueError"}
+
+
+def test_generate_hedged_starts_fallback_when_primary_is_slow(monkeypatch):
+    monkeypatch.setattr(main.get_settings(), "poem_hedge_delay", 0.01)
+    cancelled = []
+
+    async def try_model(self, model):
+        if model == "slow":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(model)
+                raise
+        return f"poem from {model}", model
+
+    monkeypatch.setattr(main.PoemFlow, "_try_model", try_model)
+
+    async def run():
+        result = await main.PoemFlow()._generate_hedged(["slow", "fast"])
+        await asyncio.sleep(0)  # let the cancellation land
+        return result
+
+    assert asyncio.run(run()) == ("poem from fast", "fast")
+    assert cancelled == ["slow"]
+
+
+def test_poem_crews_are_reused_between_kickoffs(monkeypatch):
+    built = []
+
+    class FakePoemCrew:
+        def __init__(self, model=None):
+            self.model = model
+
+        def crew(self):
+            crew = MagicMock()
+            built.append(crew)
+            return crew
+
+    monkeypatch.setattr("project_hermes.crews.poem_crew.poem_crew.PoemCrew", FakePoemCrew)
+    monkeypatch.setattr(main, "configure_llm_http", lambda: None)
+    monkeypatch.setattr(main, "_CREW_CACHE", {})
+    main._kickoff_poem_crew(None, {"topic": "sea"})
+    main._kickoff_poem_crew(None, {"topic": "sky"})
+
+    assert len(built) == 1
+    assert built[0].kickoff.call_count == 2
+
+
+def test_is_transient_uses_exception_type_and_status():
+    class RateLimited(Exception):
+        status_code = 429
+
+    assert is_transient(TimeoutError())
+    assert is_transient(RateLimited("slow down"))
+    assert is_transient(RuntimeError("model is overloaded"))
+    assert not is_transient(ValueError("bad prompt"))
+
+
+def test_stream_flow_yields_chunks_as_they_arrive(monkeypatch):
+    monkeypatch.delenv("POEM_FAKE_OUTPUT", raising=False)
+    monkeypatch.setattr(main, "get_poem_cache", lambda: None)
+    monkeypatch.setattr(main, "get_poem_semantic_cache", lambda: None)
+
+    def kickoff(model, inputs, on_token=None):
+        for chunk in ("Roses ", "are ", "red"):
+            on_token(chunk)
+        return MagicMock(raw="Roses are red")
+
+    monkeypatch.setattr(main, "_kickoff_poem_crew", kickoff)
+
+    async def collect():
+        return [chunk async for chunk in main.stream_flow("roses")]
+
+    assert asyncio.run(collect()) == ["Roses ", "are ", "red"]
+
+
+def test_stream_flow_yields_unstreamed_poem_whole(monkeypatch):
+    monkeypatch.setenv("POEM_FAKE_OUTPUT", "FAKE POEM")
+
+    async def collect():
+        return [chunk async for chunk in main.stream_flow("anything")]
+
+    assert asyncio.run(collect()) == ["FAKE POEM"]
@@ -0,0 +1,48 @@
+import numpy as np
+
+from project_hermes.crews.travel_crew.utils import PrototypeClassifier, SemanticCache
+
+
+def _embedder(text):
+    # Deterministic stand-in for a sentence model: one axis per known city
+    cities = ["paris", "tokyo", "rome"]
+    return np.array([float(city in text.lower()) for city in cities] + [0.1])
+
+
+def test_semantic_cache_matches_similar_text_within_namespace():
+    cache = SemanticCache(embedder=_embedder, threshold=0.9)
+    cache.set("breakdown", "Plan a trip to Paris", {"destination": "Paris"})
+
+    assert cache.get("breakdown", "paris trip next week") == {"destination": "Paris"}
+    assert cache.get("breakdown", "Plan a trip to Tokyo") is None
+    assert cache.get("confidence", "Plan a trip to Paris") is None
+
+
+def test_semantic_cache_expires_and_bounds_entries(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(
+        "project_hermes.semantic_cache.time.monotonic", lambda: now[0]
+    )
+    cache = SemanticCache(embedder=_embedder, ttl=10, maxsize=2)
+    cache.set("ns", "paris", 1)
+    cache.set("ns", "tokyo", 2)
+    cache.set("ns", "rome", 3)
+    assert cache.get("ns", "paris") is None
+    assert cache.get("ns", "rome") == 3
+
+    now[0] = 11.0
+    assert cache.get("ns", "rome") is None
+
+
+def test_hashed_fallback_embedding_matches_identical_queries():
+    cache = SemanticCache()
+    cache.set("confidence", "Plan a trip to Paris", 0.9)
+    assert cache.get("confidence", "plan a trip to paris") == 0.9
+    assert cache.get("confidence", "Write a poem about the sea") is None
+
+
+def test_prototype_classifier_separates_travel_from_off_topic():
+    embed = SemanticCache().embed
+    classifier = PrototypeClassifier(embed)
+    assert classifier.predict("What's the weather in Tokyo for my trip?") > 0.85
+    assert classifier.predict("Fix the bug in my Python script") < 0.1
@@ -0,0 +1,22 @@
+import orjson
+
+from project_hermes.crews.travel_crew.streaming import JSONSectionScanner
+
+
+def test_scanner_emits_sections_as_they_complete():
+    plan = {
+        "overview": "Three days in Lisbon, {not a brace}",
+        "itinerary": [{"day": 1, "notes": 'say "olá", then \\ rest'}],
+        "finance": {"total": 1500},
+    }
+    text = "```json\n" + orjson.dumps(plan, option=orjson.OPT_INDENT_2).decode() + "\n```"
+    scanner = JSONSectionScanner()
+    seen = []
+    for i in range(0, len(text), 7):
+        for key, value in scanner.feed(text[i : i + 7]):
+            seen.append(key)
+            assert value == plan[key]
+            # Each section is available before the stream has finished
+            assert not scanner.done or key == "finance"
+    assert seen == ["overview", "itinerary", "finance"]
+    assert scanner.done
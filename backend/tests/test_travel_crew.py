@@ -1,18 +1,24 @@
-import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from project_hermes.crews.travel_crew.flow import TravelFlow, TravelState
+from project_hermes.crews.travel_crew.flow import TravelState
 from project_hermes.crews.travel_crew.travel_crew import TravelCrew
 
 
-@pytest.fixture
-def mock_crew():
+# Crew is patched once per module; mock_crew clears the recorded calls per test
+@pytest.fixture(scope="module")
+def _crew_patch():
     with patch("project_hermes.crews.travel_crew.travel_crew.Crew") as mock_crew:
         mock_instance = MagicMock()
         mock_crew.return_value = mock_instance
-        yield mock_instance
+        yield mock_crew
+
+
+@pytest.fixture
+def mock_crew(_crew_patch):
+    _crew_patch.reset_mock()
+    return _crew_patch.return_value
 
 
 class TestTravelCrew:
@@ -67,133 +73,32 @@ class TestTravelCrew:
         assert result["confidence_score"] == 0.8
         assert result["query"] == "Plan a trip to Mars"
 
-
-@pytest.fixture
-def mock_agents():
-    with (
-        patch("project_hermes.crews.travel_crew.flow.ConfidenceAgent") as mock_confidence_agent,
-        patch("project_hermes.crews.travel_crew.flow.OrchestratorAgent") as mock_orchestrator_agent,
-        patch("project_hermes.crews.travel_crew.flow.InfoAgent") as mock_info_agent,
-        patch("project_hermes.crews.travel_crew.flow.SafetyAgent") as mock_safety_agent,
-        patch("project_hermes.crews.travel_crew.flow.ExperienceAgent") as mock_experience_agent,
-        patch("project_hermes.crews.travel_crew.flow.LogisticAgent") as mock_logistic_agent,
-        patch("project_hermes.crews.travel_crew.flow.FinanceAgent") as mock_finance_agent,
-    ):
-        # Set up mock agents
-        agents = {
-            "confidence": MagicMock(),
-            "orchestrator": MagicMock(),
-            "info": MagicMock(),
-            "safety": MagicMock(),
-            "experience": MagicMock(),
-            "logistic": MagicMock(),
-            "finance": MagicMock(),
-        }
-
-        mock_confidence_agent.return_value.agent = agents["confidence"]
-        mock_orchestrator_agent.return_value.agent = agents["orchestrator"]
-        mock_info_agent.return_value.agent = agents["info"]
-        mock_safety_agent.return_value.agent = agents["safety"]
-        mock_experience_agent.return_value.agent = agents["experience"]
-        mock_logistic_agent.return_value.agent = agents["logistic"]
-        mock_finance_agent.return_value.agent = agents["finance"]
-
-        yield agents
-
-
-@pytest.fixture
-def mock_tasks():
-    with (
-        patch("project_hermes.crews.travel_crew.flow.ConfidenceTask") as mock_confidence_task,
-        patch("project_hermes.crews.travel_crew.flow.OrchestratorTask") as mock_orchestrator_task,
-        patch("project_hermes.crews.travel_crew.flow.InfoTask") as mock_info_task,
-        patch("project_hermes.crews.travel_crew.flow.SafetyTask") as mock_safety_task,
-        patch("project_hermes.crews.travel_crew.flow.ExperienceTask") as mock_experience_task,
-        patch("project_hermes.crews.travel_crew.flow.LogisticTask") as mock_logistic_task,
-        patch("project_hermes.crews.travel_crew.flow.FinanceTask") as mock_finance_task,
-    ):
-        # Set up mock task instances
-        tasks = {
-            "confidence": MagicMock(),
-            "orchestrator_breakdown": MagicMock(),
-            "orchestrator_synthesis": MagicMock(),
-            "info": MagicMock(),
-            "safety": MagicMock(),
-            "experience": MagicMock(),
-            "logistic": MagicMock(),
-            "finance": MagicMock(),
-        }
-
-        # Set up return values for create_*_task methods
-        mock_confidence_task.return_value.create_confidence_task.return_value = tasks["confidence"]
-
-        mock_orchestrator_task.return_value.create_breakdown_task.return_value = tasks[
-            "orchestrator_breakdown"
-        ]
-        mock_orchestrator_task.return_value.create_synthesis_task.return_value = tasks[
-            "orchestrator_synthesis"
-        ]
-        mock_info_task.return_value.create_info_task.return_value = tasks["info"]
-        mock_safety_task.return_value.create_safety_task.return_value = tasks["safety"]
-        mock_experience_task.return_value.create_experience_task.return_value = tasks["experience"]
-        mock_logistic_task.return_value.create_logistic_task.return_value = tasks["logistic"]
-        mock_finance_task.return_value.create_finance_task.return_value = tasks["finance"]
-
-        yield tasks
-
-
-class TestTravelFlow:
-    def test_analyze_confidence(self, mock_agents, mock_tasks):
-        # Set up mock confidence task result
-        mock_tasks["confidence"].execute.return_value = json.dumps({"score": 0.8})
-
-        # Create the flow and run analyze_confidence
-        flow = TravelFlow()
-        flow.state = TravelState(query="Plan a trip to Tokyo")
-        flow.analyze_confidence()
-
-        # Verify the confidence score was set correctly
-        assert flow.state.confidence_score == 0.8
-
-    def test_analyze_confidence_error(self, mock_agents, mock_tasks):
-        # Set up mock confidence task result with invalid JSON
-        mock_tasks["confidence"].execute.return_value = "not valid json"
-
-        # Create the flow and run analyze_confidence
-        flow = TravelFlow()
-        flow.state = TravelState(query="Plan a trip to Tokyo")
-        flow.analyze_confidence()
-
-        # Verify the error was caught and handled
-        assert flow.state.confidence_score == 0
-        assert flow.state.success is False
-        assert "Failed to parse confidence score" in flow.state.error
-
-    def test_breakdown_query(self, mock_agents, mock_tasks):
-        # Set up mock breakdown task result
-        mock_breakdown = {
-            "locations": {"destination": "Tokyo"},
-            "budget": 5000,
-            "preferences": {"dining": "local cuisine"},
-        }
-        mock_tasks["orchestrator_breakdown"].execute.return_value = json.dumps(mock_breakdown)
-
-        # Create the flow and run breakdown_query
-        flow = TravelFlow()
-        flow.state = TravelState(query="Plan a trip to Tokyo", confidence_score=0.8)
-        flow.breakdown_query()
-
-        # Verify the query breakdown was set correctly
-        assert flow.state.query_breakdown == mock_breakdown
-        assert flow.state.budget == 5000
-        assert flow.state.preferences == {"dining": "local cuisine"}
-
-    def test_breakdown_query_skipped(self, mock_agents, mock_tasks):
-        # Create the flow and run breakdown_query with low confidence
-        flow = TravelFlow()
-        flow.state = TravelState(query="Plan a trip to Tokyo", confidence_score=0.5)
-        flow.breakdown_query()
-
-        # Verify the function was skipped
-        assert flow.state.query_breakdown is None
-        assert mock_tasks["orchestrator_breakdown"].execute.call_count == 0
+    def test_plan_trip_skips_local_check_by_default(self, mock_crew):
+        mock_crew.kickoff.return_value = TravelState(query="test query", confidence_score=0.4)
+        classifier = MagicMock()
+        with patch(
+            "project_hermes.crews.travel_crew.travel_crew.get_confidence_classifier",
+            return_value=classifier,
+        ):
+            TravelCrew().plan_trip("test query")
+
+        classifier.predict.assert_not_called()
+        mock_crew.kickoff.assert_called_once()
+
+    def test_plan_trip_rejects_off_topic_query_locally(self, mock_crew):
+        classifier = MagicMock()
+        classifier.predict.return_value = 0.05
+        with (
+            patch("project_hermes.crews.travel_crew.travel_crew.LOCAL_CONFIDENCE", True),
+            patch(
+                "project_hermes.crews.travel_crew.travel_crew.get_confidence_classifier",
+                return_value=classifier,
+            ),
+        ):
+            result = TravelCrew().plan_trip("What is the capital of France?")
+
+        # The local pre-check settles it: no crew is kicked off
+        mock_crew.kickoff.assert_not_called()
+        assert not result["success"]
+        assert "not appear to be travel-related" in result["error"]
+        assert result["confidence_score"] == 0.05
@@ -0,0 +1,261 @@
+import asyncio
+import json
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
+
+import pytest
+
+from project_hermes.crews.travel_crew.flow import (
+    BatchedSpecialistStep,
+    TravelFlow,
+    TravelState,
+)
+
+
+def _reset(mocks, **kwargs):
+    for mock in mocks:
+        mock.reset_mock(**kwargs)
+
+
+# The patches are entered once per module; the per-test fixtures below reset the
+# shared mocks, so each test still starts from untouched ones
+
+
+FLOW = "project_hermes.crews.travel_crew.flow"
+
+_AGENT_CLASSES = {
+    "confidence": "ConfidenceAgent",
+    "orchestrator": "OrchestratorAgent",
+    "info": "InfoAgent",
+    "safety": "SafetyAgent",
+    "experience": "ExperienceAgent",
+    "logistic": "LogisticAgent",
+    "finance": "FinanceAgent",
+}
+
+
+@pytest.fixture(scope="module")
+def _agent_patches():
+    with patch.multiple(FLOW, **dict.fromkeys(_AGENT_CLASSES.values(), DEFAULT)) as classes:
+        # Set up mock agents
+        agents = {}
+        for name, cls in _AGENT_CLASSES.items():
+            agents[name] = classes[cls].build.return_value = MagicMock()
+        yield agents
+
+
+@pytest.fixture
+def mock_agents(_agent_patches):
+    _reset(_agent_patches.values(), return_value=True, side_effect=True)
+    return _agent_patches
+
+
+# (task class patched in the flow module, factory method) for each mock task
+_TASK_FACTORIES = {
+    "confidence": ("ConfidenceTask", "create_confidence_task"),
+    "orchestrator_breakdown": ("OrchestratorTask", "create_breakdown_task"),
+    "orchestrator_synthesis": ("OrchestratorTask", "create_synthesis_task"),
+    "info": ("InfoTask", "create_info_task"),
+    "safety": ("SafetyTask", "create_safety_task"),
+    "experience": ("ExperienceTask", "create_experience_task"),
+    "logistic": ("LogisticTask", "create_logistic_task"),
+    "finance": ("FinanceTask", "create_finance_task"),
+}
+
+
+@pytest.fixture(scope="module")
+def _task_patches():
+    task_classes = {cls for cls, _ in _TASK_FACTORIES.values()}
+    with patch.multiple(FLOW, **dict.fromkeys(task_classes, DEFAULT)) as classes:
+        # Set up mock task instances as the return values of the create_*_task methods
+        tasks = {}
+        for name, (cls, factory) in _TASK_FACTORIES.items():
+            tasks[name] = getattr(classes[cls], factory).return_value = MagicMock()
+        yield tasks
+
+
+@pytest.fixture
+def mock_tasks(_task_patches):
+    _reset(_task_patches.values(), return_value=True, side_effect=True)
+    return _task_patches
+
+
+@pytest.fixture(scope="module")
+def _flow(_agent_patches, _task_patches):
+    return TravelFlow()
+
+
+@pytest.fixture
+def flow(_flow, mock_agents, mock_tasks):
+    # One flow for the module: each test gets fresh state and no crew left over
+    # from the previous test's patches
+    _flow.reset()
+    _flow._crew = None
+    return _flow
+
+
+class TestTravelFlow:
+    def test_analyze_confidence(self, flow, mock_tasks):
+        with patch(f"{FLOW}.Crew") as mock_crew:
+            # Set up mock confidence crew result
+            mock_crew.return_value.kickoff.return_value = json.dumps({"score": 0.8})
+
+            # Run analyze_confidence on the shared flow
+            flow.reset(TravelState(query="Plan a trip to Tokyo"))
+            flow.analyze_confidence()
+
+        # Verify the confidence score was set correctly
+        assert flow.state.confidence_score == 0.8
+
+    def test_analyze_confidence_error(self, flow, mock_tasks):
+        with patch(f"{FLOW}.Crew") as mock_crew:
+            # Set up mock confidence crew result with invalid JSON
+            mock_crew.return_value.kickoff.return_value = "not valid json"
+
+            # Run analyze_confidence on the shared flow
+            flow.reset(TravelState(query="Plan a trip to Tokyo"))
+            flow.analyze_confidence()
+
+        # Verify the error was caught and handled
+        assert flow.state.confidence_score == 0
+        assert flow.state.success is False
+        assert "Failed to parse confidence score" in flow.state.error
+
+    def test_breakdown_query(self, flow, mock_tasks):
+        # Set up mock breakdown task result
+        mock_breakdown = {
+            "locations": {"destination": "Tokyo"},
+            "budget": 5000,
+            "preferences": {"dining": "local cuisine"},
+        }
+        with patch(f"{FLOW}.Crew") as mock_crew:
+            mock_crew.return_value.kickoff.return_value = json.dumps(mock_breakdown)
+
+            # Run breakdown_query on the shared flow
+            flow.reset(TravelState(query="Plan a trip to Tokyo", confidence_score=0.8))
+            flow.breakdown_query()
+
+        # Verify the query breakdown was set correctly
+        assert flow.state.query_breakdown == mock_breakdown
+        assert flow.state.budget == 5000
+        assert flow.state.preferences == {"dining": "local cuisine"}
+
+    def test_step_cache_is_opt_in_and_exact_for_breakdowns(self, flow, monkeypatch):
+        query = "Plan a 3 day trip to Paris for a couple with a budget of $2000"
+        flow.reset(TravelState(query=query))
+        flow._cache_set("breakdown", query, {"budget": 2000})
+        assert flow._cache_get("breakdown", query) is None
+
+        monkeypatch.setattr(f"{FLOW}.SEMANTIC_CACHE", True)
+        flow._cache_set("breakdown", query, {"budget": 2000})
+        assert flow._cache_get("breakdown", query.lower()) == {"budget": 2000}
+        # Near-identical text with different numbers is a different trip
+        assert flow._cache_get("breakdown", query.replace("3 day", "5 day")) is None
+        assert flow._cache_get("breakdown", query.replace("$2000", "$5000")) is None
+
+    def test_breakdown_query_skipped(self, flow, mock_tasks):
+        with patch(f"{FLOW}.Crew") as mock_crew:
+            # Run breakdown_query on the shared flow with low confidence
+            flow.reset(TravelState(query="Plan a trip to Tokyo", confidence_score=0.5))
+            flow.breakdown_query()
+
+        # Verify the function was skipped
+        assert flow.state.query_breakdown is None
+        assert mock_crew.return_value.kickoff.call_count == 0
+
+    def test_run_specialists_keeps_results_when_one_fails(self, flow, mock_tasks, monkeypatch):
+        monkeypatch.setattr("project_hermes.crews.travel_crew.flow.SPECIALIST_BACKOFF", 0)
+        outputs = {
+            "info": {"info": 1},
+            "safety": RuntimeError("provider temporarily unavailable"),
+            "experience": {"experience": 1},
+            "logistic": {"logistic": 1},
+            "finance": {"finance": 1},
+        }
+        by_task = {id(mock_tasks[name]): output for name, output in outputs.items()}
+
+        crews = {}
+
+        def make_crew(agents, tasks, verbose):
+            output = by_task[id(tasks[0])]
+            crew = crews[id(tasks[0])] = MagicMock()
+            if isinstance(output, Exception):
+                crew.kickoff_async = AsyncMock(side_effect=output)
+            else:
+                crew.kickoff_async = AsyncMock(return_value=json.dumps(output))
+            return crew
+
+        with patch("project_hermes.crews.travel_crew.flow.Crew", side_effect=make_crew):
+            flow.state.query_breakdown = {"destination": "Tokyo"}
+            asyncio.run(flow.run_specialists())
+
+        assert flow.state.info_results == {"info": 1}
+        assert flow.state.finance_results == {"finance": 1}
+        assert flow.state.safety_results is None
+        assert flow.state.success is False
+        assert "safety" in flow.state.error
+        # The failing specialist is retried; the others run once
+        assert crews[id(mock_tasks["safety"])].kickoff_async.await_count == 3
+        assert crews[id(mock_tasks["info"])].kickoff_async.await_count == 1
+
+    def test_run_specialist_does_not_retry_permanent_errors(self, monkeypatch):
+        monkeypatch.setattr(f"{FLOW}.SPECIALIST_BACKOFF", 0)
+        with patch(f"{FLOW}.Crew") as mock_crew:
+            kickoff = mock_crew.return_value.kickoff_async = AsyncMock(return_value="not json")
+            with pytest.raises(ValueError):
+                asyncio.run(TravelFlow._run_specialist(MagicMock(), MagicMock()))
+
+        assert kickoff.await_count == 1
+
+    def test_synthesize_plan_runs_with_partial_results(self, flow, mock_tasks):
+        with patch("project_hermes.crews.travel_crew.flow.Crew") as mock_crew:
+            mock_crew.return_value.kickoff.return_value = json.dumps({"overview": "ok"})
+            flow.state.no_cache = True
+            flow.state.info_results = {"info": 1}
+            flow.state.experience_results = {"experience": 1}
+            flow.state.finance_results = {"finance": 1}
+            flow.synthesize_plan()
+
+        assert flow.state.final_plan == {"overview": "ok"}
+        assert flow.state.missing == ["safety", "logistics"]
+
+    def test_breakdown_query_records_schema_errors(self, flow, mock_tasks):
+        with patch("project_hermes.crews.travel_crew.flow.Crew") as mock_crew:
+            mock_crew.return_value.kickoff.return_value = json.dumps({"budget": "lots"})
+            flow.state.confidence_score = 0.9
+            flow.state.no_cache = True
+            flow.breakdown_query()
+
+        assert flow.state.query_breakdown is None
+        assert flow.state.success is False
+        assert flow.state.error.startswith("Failed to parse query breakdown")
+
+    def test_breakdown_query_accepts_dict_output(self, flow, mock_tasks):
+        breakdown = {"budget": 1200, "preferences": {"pace": "slow"}}
+        with patch("project_hermes.crews.travel_crew.flow.Crew") as mock_crew:
+            mock_crew.return_value.kickoff.return_value = breakdown
+            flow.state.confidence_score = 0.9
+            flow.state.no_cache = True
+            flow.breakdown_query()
+
+        assert flow.state.query_breakdown == breakdown
+        assert flow.state.budget == 1200
+        assert flow.state.success is True
+
+
+def test_batched_specialist_step_sends_one_completion_per_job():
+    def completion(model, messages, n):
+        content = json.dumps({"topic": messages[1]["content"].split()[0]})
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=completion)
+    agent = MagicMock(role="Guide", backstory="Knows Tokyo.", goal="Help", llm=None)
+    tasks = [
+        MagicMock(description=f"{name} report", expected_output="JSON")
+        for name in ("info", "safety")
+    ]
+
+    results = asyncio.run(BatchedSpecialistStep(client).run([(agent, t) for t in tasks]))
+
+    assert results == [{"topic": "info"}, {"topic": "safety"}]
+    assert client.chat.completions.create.await_count == 2
@@ -11,107 +11,91 @@ It uses the latest CrewAI API to organize agents and their tasks.
 from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import orjson
+import re
+
+from project_hermes.cache import TTLCache, plan_cache_key
+from project_hermes.logging import VERBOSE
 
 # Load environment variables (for API keys)
 load_dotenv()
 
 
-class TravelCrew:
-    """
-    TravelCrew coordinates specialized travel agents to create comprehensive travel plans.
-    """
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
 
-    def __init__(self, model_name="gpt-4-turbo"):
-        """Initialize the crew with a specified language model."""
-        # Initialize the language model
-        self.llm = ChatOpenAI(model=model_name, temperature=0.7)
 
-        # Create the specialized agents
-        self.destination_expert = self._create_destination_expert()
-        self.itinerary_planner = self._create_itinerary_planner()
-        self.safety_advisor = self._create_safety_advisor()
-        self.budget_analyst = self._create_budget_analyst()
-        self.confidence_agent = self._create_confidence_agent()
+def _normalize_json(text):
+    """Trim LLM output to its outermost JSON object and drop trailing commas."""
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start : end + 1]
+    return _TRAILING_COMMA_RE.sub(r"\1", text)
 
-    def _create_destination_expert(self):
-        """Create the destination expert agent."""
-        return Agent(
-            role="Travel Destination Expert",
-            goal="Provide detailed information about travel destinations and recommend appropriate places based on user preferences",
-            backstory="""You are a highly knowledgeable travel destination expert with decades of experience 
+
+# orjson-encoded results by (model name, normalized query digest)
+_PLAN_CACHE = TTLCache(maxsize=512, ttl=3600.0)
+
+
+@lru_cache(maxsize=4)
+def _get_llm(model_name):
+    """One chat model per model name, shared by every TravelCrew."""
+    return ChatOpenAI(model=model_name, temperature=0.7)
+
+
+@lru_cache(maxsize=4)
+def _get_gating_llm(model_name):
+    """The confidence gate's model: deterministic, with room for only a short answer."""
+    return ChatOpenAI(model=model_name, temperature=0, max_tokens=256)
+
+
+# (role, goal, backstory) of each agent. Agents hold per-run state, so each crew
+# builds its own from these.
+DESTINATION_EXPERT = (
+    "Travel Destination Expert",
+    "Provide detailed information about travel destinations and recommend appropriate places based on user preferences",
+    """You are a highly knowledgeable travel destination expert with decades of experience 
                       exploring different countries and cities around the world. You have in-depth knowledge 
                       of popular tourist attractions, local customs, best times to visit, and hidden gems 
                       that most tourists miss.""",
-            verbose=True,
-            llm=self.llm,
-        )
-
-    def _create_itinerary_planner(self):
-        """Create the itinerary planner agent."""
-        return Agent(
-            role="Travel Itinerary Planner",
-            goal="Create detailed day-by-day travel itineraries that maximize enjoyment while respecting time constraints",
-            backstory="""You are an expert travel itinerary planner who specializes in creating perfectly 
+)
+ITINERARY_PLANNER = (
+    "Travel Itinerary Planner",
+    "Create detailed day-by-day travel itineraries that maximize enjoyment while respecting time constraints",
+    """You are an expert travel itinerary planner who specializes in creating perfectly 
                       balanced schedules. You know how to pace activities to avoid exhaustion, how to 
                       group nearby attractions efficiently, and how to allow for downtime. You understand 
                       travel logistics and how long it takes to move between locations.""",
-            verbose=True,
-            llm=self.llm,
-        )
-
-    def _create_safety_advisor(self):
-        """Create the safety advisor agent."""
-        return Agent(
-            role="Travel Safety Advisor",
-            goal="Provide safety information and recommendations specific to the travel destination",
-            backstory="""You are a former security consultant who now specializes in travel safety. 
+)
+SAFETY_ADVISOR = (
+    "Travel Safety Advisor",
+    "Provide safety information and recommendations specific to the travel destination",
+    """You are a former security consultant who now specializes in travel safety. 
                       You stay updated on global safety conditions, health advisories, common scams, 
                       and best practices for staying safe while traveling. You provide practical 
                       safety advice without causing unnecessary alarm.""",
-            verbose=True,
-            llm=self.llm,
-        )
-
-    def _create_budget_analyst(self):
-        """Create the budget analyst agent."""
-        return Agent(
-            role="Travel Budget Analyst",
-            goal="Create realistic travel budgets and find ways to optimize costs without sacrificing experience quality",
-            backstory="""You are a financial advisor specializing in travel budgeting. You have 
+)
+BUDGET_ANALYST = (
+    "Travel Budget Analyst",
+    "Create realistic travel budgets and find ways to optimize costs without sacrificing experience quality",
+    """You are a financial advisor specializing in travel budgeting. You have 
                       extensive knowledge of costs in various destinations, from accommodation and 
                       food to activities and transportation. You know the best times for deals, 
                       money-saving tips, and how to allocate budgets to maximize experiences.""",
-            verbose=True,
-            llm=self.llm,
-        )
-
-    def _create_confidence_agent(self):
-        """Create the confidence scoring agent that determines if a query is travel-related."""
-        return Agent(
-            role="Travel Query Evaluator",
-            goal="Evaluate whether user queries are related to travel planning and provide a confidence score",
-            backstory="""You are an expert at analyzing user requests and determining if they're 
+)
+CONFIDENCE_AGENT = (
+    "Travel Query Evaluator",
+    "Evaluate whether user queries are related to travel planning and provide a confidence score",
+    """You are an expert at analyzing user requests and determining if they're 
                       related to travel planning. You can distinguish between travel queries and 
                       general knowledge questions. You provide confidence scores ranging from 0 to 1, 
                       where 1 indicates a definite travel planning query and 0 indicates a non-travel query.""",
-            verbose=True,
-            llm=self.llm,
-        )
-
-    def create_travel_plan(self, query):
-        """
-        Generate a comprehensive travel plan based on the user query.
+)
 
-        Args:
-            query (str): The user's travel planning query
 
-        Returns:
-            dict: A travel plan with itinerary, safety info, and budget
-        """
-        # First, check if this is a travel-related query
-        confidence_task = Task(
-            description=f"""Evaluate whether the following query is related to travel planning:
+# Task descriptions; CrewAI fills in {query} from the kickoff inputs on each run
+CONFIDENCE_TEMPLATE = """Evaluate whether the following query is related to travel planning:
                           "{query}"
                           
                           Analyze the query carefully and determine if it's asking for help planning a trip,
@@ -122,14 +106,9 @@ class TravelCrew:
                           - 0.0 means definitely not travel-related
                           
                           Return your response as a JSON with a 'confidence_score' key and a 'reasoning' key.
-                          """,
-            agent=self.confidence_agent,
-        )
+                          """
 
-        # If the query is travel-related (confidence > 0.6), proceed with planning
-        # Create the destination research task
-        destination_task = Task(
-            description=f"""Research the travel destination(s) mentioned in this query: "{query}"
+DESTINATION_TEMPLATE = """Research the travel destination(s) mentioned in this query: "{query}"
                           
                           If no specific destination is mentioned, recommend suitable destinations based on the 
                           preferences and requirements stated in the query.
@@ -142,13 +121,9 @@ class TravelCrew:
                           5. General transportation options
                           
                           Format your response in a clear, organized manner.
-                          """,
-            agent=self.destination_expert,
-        )
+                          """
 
-        # Create the itinerary planning task
-        itinerary_task = Task(
-            description=f"""Create a detailed day-by-day itinerary based on this query: "{query}"
+ITINERARY_TEMPLATE = """Create a detailed day-by-day itinerary based on this query: "{query}"
                           
                           Use the destination research to plan activities that match the user's interests.
                           Consider:
@@ -159,14 +134,9 @@ class TravelCrew:
                           5. Meal and rest breaks
                           
                           Format the itinerary by day with timings and brief descriptions.
-                          """,
-            agent=self.itinerary_planner,
-            context=[destination_task],  # This task depends on destination research
-        )
+                          """
 
-        # Create the safety advisory task
-        safety_task = Task(
-            description=f"""Provide safety information and recommendations for the trip described in: "{query}"
+SAFETY_TEMPLATE = """Provide safety information and recommendations for the trip described in: "{query}"
                           
                           Based on the destination research and itinerary, advise on:
                           1. Current safety situations or travel advisories
@@ -176,19 +146,11 @@ class TravelCrew:
                           5. Safe transportation options
                           
                           Format your response as a concise safety guide with practical tips.
-                          """,
-            agent=self.safety_advisor,
-            context=[
-                destination_task,
-                itinerary_task,
-            ],  # This task depends on previous research
-        )
+                          """
 
-        # Create the budget analysis task
-        budget_task = Task(
-            description=f"""Create a detailed budget for the trip described in: "{query}"
+BUDGET_TEMPLATE = """Create a detailed budget for the trip described in: "{query}"
                           
-                          Based on the destination, itinerary and safety information, estimate costs for:
+                          Based on the destination research and itinerary, estimate costs for:
                           1. Accommodation (options at different price points if appropriate)
                           2. Transportation (international and local)
                           3. Food and dining
@@ -199,72 +161,148 @@ class TravelCrew:
                           If no budget is mentioned, provide options for budget, mid-range, and luxury travelers.
                           
                           Format your response as a detailed budget breakdown with approximate costs.
-                          """,
-            agent=self.budget_analyst,
-            context=[
-                destination_task,
-                itinerary_task,
-                safety_task,
-            ],  # This task depends on all previous research
+                          """
+
+
+class TravelCrew:
+    """
+    TravelCrew coordinates specialized travel agents to create comprehensive travel plans.
+    """
+
+    def __init__(self, model_name="gpt-4-turbo", verbose=VERBOSE, gating_model="gpt-4o-mini"):
+        """Initialize the crew with a specified language model; the travel-or-not
+        confidence check runs on the smaller ``gating_model``."""
+        self.verbose = verbose
+
+        # Reuse the language models built for these model names, if any
+        self.model_name = model_name
+        self.gating_model = gating_model
+        self.llm = _get_llm(model_name)
+        self.gating_llm = _get_gating_llm(gating_model)
+
+        # Agents and tasks hold the state of the run in progress, so each
+        # create_travel_plan call builds its own (see _run_crew) and calls on one
+        # instance can overlap; the shared models and templates keep that cheap
+
+    def _create_agent(self, spec, llm=None):
+        """Create an agent from its (role, goal, backstory) spec, on ``llm`` or the crew's model."""
+        role, goal, backstory = spec
+        return Agent(
+            role=role, goal=goal, backstory=backstory, verbose=self.verbose, llm=llm or self.llm
         )
 
-        # Create the crew with the defined agents and tasks
-        crew = Crew(
-            agents=[
-                self.confidence_agent,
-                self.destination_expert,
-                self.itinerary_planner,
-                self.safety_advisor,
-                self.budget_analyst,
-            ],
-            tasks=[
-                confidence_task,
-                destination_task,
-                itinerary_task,
-                safety_task,
-                budget_task,
-            ],
-            verbose=True,
+    def _create_crew(self, *tasks):
+        """Create a crew running ``tasks`` in order, each with its own agent."""
+        return Crew(
+            agents=[task.agent for task in tasks],
+            tasks=list(tasks),
+            verbose=self.verbose,
             process=Process.sequential,  # Tasks will run in the order defined
         )
 
-        # Execute the crew workflow
-        result = crew.kickoff(inputs={"query": query})
+    def create_travel_plan(self, query):
+        """
+        Generate a comprehensive travel plan based on the user query.
+
+        Plans for a query already answered with the same models within the hour are
+        served from memory.
+
+        Args:
+            query (str): The user's travel planning query
+
+        Returns:
+            dict: A travel plan with itinerary, safety info, and budget
+        """
+        # Both models shape the answer: the gate decides rejections
+        key = plan_cache_key(query, f"{self.model_name}+{self.gating_model}")
+        cached = _PLAN_CACHE.get(key)
+        if cached is not None:
+            # Decoded per hit, so callers can't alter the cached plan
+            return orjson.loads(cached)
+
+        plan = self._run_crew(query)
+        # Answers are cached (plans and rejections); processing errors are not
+        if "confidence_score" in plan:
+            _PLAN_CACHE.set(key, orjson.dumps(plan))
+        return plan
 
-        # Parse and format results
+    def _run_crew(self, query):
+        """Build this run's agents, tasks and crews, run them for one query and
+        assemble their result."""
+        inputs = {"query": query}
+
+        # The {query} templates are filled in by kickoff(inputs=...)
+        confidence_task = Task(
+            description=CONFIDENCE_TEMPLATE,
+            agent=self._create_agent(CONFIDENCE_AGENT, llm=self.gating_llm),
+        )
+        destination_task = Task(
+            description=DESTINATION_TEMPLATE, agent=self._create_agent(DESTINATION_EXPERT)
+        )
+        itinerary_task = Task(
+            description=ITINERARY_TEMPLATE,
+            agent=self._create_agent(ITINERARY_PLANNER),
+            context=[destination_task],  # This task depends on destination research
+        )
+        safety_task = Task(
+            description=SAFETY_TEMPLATE,
+            agent=self._create_agent(SAFETY_ADVISOR),
+            context=[destination_task, itinerary_task],  # This task depends on previous research
+        )
+        budget_task = Task(
+            description=BUDGET_TEMPLATE,
+            agent=self._create_agent(BUDGET_ANALYST),
+            # Like safety, this depends on the research but not on safety
+            context=[destination_task, itinerary_task],
+        )
+
+        # First, settle whether this is a travel-related query
+        result = self._create_crew(confidence_task).kickoff(inputs=inputs)
+
+        # Only the confidence JSON can be malformed; the other outputs are used as text
         try:
-            # Try to parse confidence score result
-            confidence_result = json.loads(crew.tasks[0].output)
-            confidence_score = confidence_result.get("confidence_score", 0)
-
-            # If confidence is too low, return early with just the confidence score
-            if confidence_score < 0.6:
-                return {
-                    "success": False,
-                    "confidence_score": confidence_score,
-                    "error": "Query does not appear to be related to travel planning",
-                    "travel_plan": None,
-                }
-
-            # Otherwise, process the full travel plan
-            return {
-                "success": True,
-                "confidence_score": confidence_score,
-                "travel_plan": {
-                    "overview": crew.tasks[1].output,  # Destination research
-                    "itinerary": crew.tasks[2].output,  # Itinerary
-                    "safety": crew.tasks[3].output,  # Safety info
-                    "finance": crew.tasks[4].output,  # Budget
-                },
-            }
-        except Exception as e:
-            # Handle any parsing errors
+            confidence_result = orjson.loads(_normalize_json(str(confidence_task.output)))
+            confidence_score = float(confidence_result.get("confidence_score", 0))
+        except (AttributeError, TypeError, ValueError) as e:
             return {
                 "success": False,
                 "error": f"Error processing travel plan: {str(e)}",
                 "raw_output": result,
             }
 
+        # If confidence is too low, return early with just the confidence score
+        if confidence_score < 0.6:
+            return {
+                "success": False,
+                "confidence_score": confidence_score,
+                "error": "Query does not appear to be related to travel planning",
+                "travel_plan": None,
+            }
+
+        # The query is travel-related, so research the destination and itinerary in order
+        self._create_crew(destination_task, itinerary_task).kickoff(inputs=inputs)
+
+        # Then run the safety and budget tasks side by side
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(self._create_crew(task).kickoff, inputs=inputs)
+                for task in (safety_task, budget_task)
+            ]
+        for future in futures:
+            future.result()  # Re-raise a failed kickoff
+
+        return {
+            "success": True,
+            "confidence_score": confidence_score,
+            "travel_plan": {
+                # Each task's text, so the plan is plain data
+                "overview": str(destination_task.output),  # Destination research
+                "itinerary": str(itinerary_task.output),  # Itinerary
+                "safety": str(safety_task.output),  # Safety info
+                "finance": str(budget_task.output),  # Budget
+            },
+        }
+
 
 # Example usage
 if __name__ == "__main__":
@@ -277,7 +315,5 @@ if __name__ == "__main__":
     # Generate the travel plan
     plan = travel_crew.create_travel_plan(query)
 
-    # Print the results
-    import json
-
-    print(json.dumps(plan, indent=2))
+    # Print the results; an error's raw crew output is an object, so print its text
+    print(orjson.dumps(plan, default=str, option=orjson.OPT_INDENT_2).decode())
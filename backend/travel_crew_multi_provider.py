@@ -13,17 +13,179 @@ Providers are checked in this order:
 The system will use the first available provider unless explicitly specified.
 """
 
-import json
+import asyncio
 import os
-import re
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, singledispatch
+from types import MappingProxyType
 from typing import Any
 
+import orjson
 from crewai import LLM, Agent, Crew, Process, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
 from dotenv import load_dotenv
 
+from project_hermes.errors import is_rate_limit
+from project_hermes.http import configure_llm_http
+from project_hermes.logging import VERBOSE
+
 # Load environment variables (for API keys)
 load_dotenv()
 
+# Which providers have an API key, settled once at import
+_AVAILABLE = MappingProxyType(
+    {
+        "gemini": bool(os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")),
+        "claude": bool(os.getenv("CLAUDE_API_KEY") or os.getenv("ANTHROPIC_API_KEY")),
+        "openai": bool(os.getenv("OPENAI_API_KEY")),
+    }
+)
+
+
+# Concurrent crew runs allowed per provider, shared by every TravelCrew in the process
+# (plans run on separate event loops, so these are thread semaphores)
+_SLOTS = MappingProxyType(
+    {
+        "gemini": threading.BoundedSemaphore(10),
+        "claude": threading.BoundedSemaphore(5),
+        "openai": threading.BoundedSemaphore(20),
+    }
+)
+# Attempts per crew run when the provider rate-limits, and the backoff cap in seconds
+# for the first retry (doubled per retry, up to KICKOFF_BACKOFF_MAX, with full jitter)
+KICKOFF_ATTEMPTS = 5
+KICKOFF_BACKOFF = 1.0
+KICKOFF_BACKOFF_MAX = 30.0
+# Most plans one plan_trip_batch call runs at a time (each fans out to three crews)
+BATCH_WORKERS = 8
+
+# Task descriptions, formatted with the query per plan, and their expected outputs
+CONFIDENCE_TEMPLATE = (
+    "Analyze this query and determine if it's related to travel planning: "
+    '"{query}"\n\n'
+    "Respond with a JSON object containing: \n"
+    "1. confidence_score: A number between 0 and 1 (1 = definitely travel-related)\n"
+    "2. query: The original query\n\n"
+    'Example: {{"confidence_score": 0.95, "query": "Plan a trip to Paris"}}'
+)
+CONFIDENCE_OUTPUT = '{"confidence_score": <float 0-1>, "query": "<original query>"}'
+
+DESTINATION_TEMPLATE = (
+    'Research the destination(s) mentioned in this query: "{query}"\n\n'
+    "Provide details about: key features and attractions; culture and customs;"
+    " best times to visit; and special considerations."
+)
+DESTINATION_OUTPUT = (
+    "A comprehensive destination overview in markdown covering attractions, culture, "
+    "best times to visit, and special considerations."
+)
+
+ITINERARY_TEMPLATE = (
+    'Create a detailed itinerary for: "{query}"\n\n'
+    "Include arrival/departure logistics, daily activities, meal suggestions, and local"
+    " transport between locations. Format as a clear daily schedule."
+)
+ITINERARY_OUTPUT = (
+    "A day-by-day itinerary in markdown with timeslots, activities, meals, and logistics."
+)
+
+SAFETY_TEMPLATE = (
+    'Provide safety guidance for: "{query}"\n\n'
+    "Include: general safety, risks in the destination's main areas and for getting"
+    " around, health tips, and emergency resources. Format as a traveler safety guide."
+)
+SAFETY_OUTPUT = (
+    "A practical safety guide in markdown covering general risks, area and transport "
+    "concerns at the destination, health tips, and emergency contacts/resources."
+)
+
+BUDGET_TEMPLATE = (
+    'Create a budget for: "{query}"\n\n'
+    "Estimate costs for accommodation, transportation, food, activities, and misc."
+    " If a budget is provided, fit within it; otherwise, provide budget/mid-range/luxury"
+    " options. Include a clear breakdown with approximate costs."
+)
+BUDGET_OUTPUT = (
+    "A markdown budget breakdown table with estimated costs by category and total, "
+    "plus options for different budget levels if applicable."
+)
+
+
+@lru_cache(maxsize=4)
+def _get_llm(model: str) -> LLM:
+    """One LLM client per model, shared by every TravelCrew, on the pooled HTTP clients."""
+    configure_llm_http()
+    return LLM(model=model, temperature=0.7)
+
+
+# Text attributes seen on CrewAI output types, probed for anything else
+_TEXT_ATTRS = ("raw", "raw_output", "content", "text", "final_output")
+
+
+@singledispatch
+def _to_text_output(out: Any) -> str:
+    """Best-effort conversion of a CrewAI Task output to plain text."""
+    if out is None:
+        return ""
+    for attr in _TEXT_ATTRS:
+        val = getattr(out, attr, None)
+        if isinstance(val, str):
+            return val
+    try:
+        return str(out)
+    except Exception:
+        return ""
+
+
+@_to_text_output.register
+def _(out: str) -> str:
+    return out
+
+
+@_to_text_output.register(TaskOutput)
+@_to_text_output.register(CrewOutput)
+def _(out: TaskOutput | CrewOutput) -> str:
+    return out.raw or ""
+
+
+def _extract_json(text: str) -> str | None:
+    """Extract the first complete JSON object from text, if present."""
+    if not text:
+        return None
+    # Quick path if the whole text is JSON
+    text_stripped = text.strip()
+    if text_stripped.startswith("{") and text_stripped.endswith("}"):
+        return text_stripped
+    # Fallback: scan for the brace closing the first "{", skipping string contents
+    start = text_stripped.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text_stripped)):
+        ch = text_stripped[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text_stripped[start : i + 1]
+    return None
+
 
 class TravelCrew:
     """
@@ -31,28 +193,23 @@ class TravelCrew:
     using multiple LLM providers.
     """
 
-    def __init__(self, llm_provider: str | None = None, verbose: bool = True):
+    def __init__(self, llm_provider: str | None = None, verbose: bool = VERBOSE):
         """
         Initialize the crew with a specified language model provider.
 
         Args:
             llm_provider: The LLM provider to use ('gemini', 'claude', 'openai',
                 or None for auto-detect)
-            verbose: Whether to enable verbose mode for debugging
+            verbose: Whether to enable verbose mode for debugging (on when
+                LOG_LEVEL=DEBUG)
         """
         self.verbose = verbose
         self.llm_provider_name = None
 
-        # Initialize the language model based on the provider
+        # Initialize the language model based on the provider. Agents keep per-run
+        # executor state, so each plan builds its own (cheap: the LLM is shared)
         self.llm = self._initialize_llm(llm_provider)
 
-        # Create the specialized agents
-        self.destination_expert = self._create_destination_expert()
-        self.itinerary_planner = self._create_itinerary_planner()
-        self.safety_advisor = self._create_safety_advisor()
-        self.budget_analyst = self._create_budget_analyst()
-        self.confidence_agent = self._create_confidence_agent()
-
     def _initialize_llm(self, provider: str | None = None):
         """
         Initialize the language model based on the provider.
@@ -74,30 +231,30 @@ class TravelCrew:
             return self._get_specific_provider(provider)
 
         # Try Gemini first
-        if os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"):
+        if _AVAILABLE["gemini"]:
             try:
                 self.llm_provider_name = "gemini"
                 # Use CrewAI/LightLLM provider-prefixed model naming
                 # Requirement: only use gemini-2.0-flash for Gemini
-                return LLM(model="gemini/gemini-2.0-flash", temperature=0.7)
+                return _get_llm("gemini/gemini-2.0-flash")
             except Exception as e:
                 if self.verbose:
                     print(f"Could not initialize Gemini: {e}")
 
         # Try Claude second
-        if os.getenv("CLAUDE_API_KEY") or os.getenv("ANTHROPIC_API_KEY"):
+        if _AVAILABLE["claude"]:
             try:
                 self.llm_provider_name = "claude"
-                return LLM(model="anthropic/claude-3-sonnet-20240229", temperature=0.7)
+                return _get_llm("anthropic/claude-3-sonnet-20240229")
             except Exception as e:
                 if self.verbose:
                     print(f"Could not initialize Claude: {e}")
 
         # Try OpenAI last
-        if os.getenv("OPENAI_API_KEY"):
+        if _AVAILABLE["openai"]:
             try:
                 self.llm_provider_name = "openai"
-                return LLM(model="openai/gpt-4-turbo", temperature=0.7)
+                return _get_llm("openai/gpt-4-turbo")
             except Exception as e:
                 if self.verbose:
                     print(f"Could not initialize OpenAI: {e}")
@@ -121,19 +278,19 @@ class TravelCrew:
         p = provider.lower()
         if p in ("google", "gemini"):
             self.llm_provider_name = "gemini"
-            if not (os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")):
+            if not _AVAILABLE["gemini"]:
                 raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY not set")
-            return LLM(model="gemini/gemini-2.0-flash", temperature=0.7)
+            return _get_llm("gemini/gemini-2.0-flash")
         if p in ("anthropic", "claude"):
             self.llm_provider_name = "claude"
-            if not (os.getenv("CLAUDE_API_KEY") or os.getenv("ANTHROPIC_API_KEY")):
+            if not _AVAILABLE["claude"]:
                 raise ValueError("CLAUDE_API_KEY or ANTHROPIC_API_KEY not set")
-            return LLM(model="anthropic/claude-3-sonnet-20240229", temperature=0.7)
+            return _get_llm("anthropic/claude-3-sonnet-20240229")
         if p in ("openai",):
             self.llm_provider_name = "openai"
-            if not os.getenv("OPENAI_API_KEY"):
+            if not _AVAILABLE["openai"]:
                 raise ValueError("OPENAI_API_KEY not set")
-            return LLM(model="openai/gpt-4-turbo", temperature=0.7)
+            return _get_llm("openai/gpt-4-turbo")
         raise ValueError("Unknown provider. Use 'gemini', 'claude', or 'openai'")
 
     def _create_destination_expert(self):
@@ -216,180 +373,180 @@ class TravelCrew:
             llm=self.llm,
         )
 
-    def plan_trip(self, query: str) -> dict[str, Any]:
+    def plan_trip(
+        self, query: str, on_section: Callable[[str, str], None] | None = None
+    ) -> dict[str, Any]:
+        """
+        Plan a trip based on a natural language query.
+
+        Blocking wrapper around :meth:`aplan_trip`; call it from a thread without a
+        running event loop.
+
+        Args:
+            query: The natural language query describing the desired trip
+            on_section: Optional callback invoked as ``on_section(name, text)`` when
+                each plan section (overview, itinerary, safety, finance) is ready;
+                it runs on the crew's thread
+
+        Returns:
+            A dictionary containing the travel plan details
+        """
+        return asyncio.run(self.aplan_trip(query, on_section=on_section))
+
+    async def aplan_trip(
+        self, query: str, on_section: Callable[[str, str], None] | None = None
+    ) -> dict[str, Any]:
         """
         Plan a trip based on a natural language query.
 
+        The confidence check runs alone first, so off-topic queries cost one LLM
+        call. Destination research follows; the itinerary, safety and budget
+        tasks only build on the research, so they then run concurrently. Each
+        call builds its own agents and tasks, so one TravelCrew can serve
+        overlapping plans.
+
         Args:
             query: The natural language query describing the desired trip
+            on_section: Optional callback invoked as ``on_section(name, text)`` when
+                each plan section (overview, itinerary, safety, finance) is ready;
+                it runs on the crew's thread
 
         Returns:
             A dictionary containing the travel plan details
         """
-        # Create the confidence task
         confidence_task = Task(
-            description=(
-                f"Analyze this query and determine if it's related to travel planning: "
-                f'"{query}"\n\n'
-                "Respond with a JSON object containing: \n"
-                "1. confidence_score: A number between 0 and 1 (1 = definitely travel-related)\n"
-                "2. query: The original query\n\n"
-                'Example: {"confidence_score": 0.95, "query": "Plan a trip to Paris"}'
-            ),
-            expected_output=('{"confidence_score": <float 0-1>, "query": "<original query>"}'),
-            agent=self.confidence_agent,
+            description=CONFIDENCE_TEMPLATE.format(query=query),
+            expected_output=CONFIDENCE_OUTPUT,
+            agent=self._create_confidence_agent(),
         )
-
-        # Create the destination research task
         destination_task = Task(
-            description=(
-                f'Research the destination(s) mentioned in this query: "{query}"\n\n'
-                "Provide details about: key features and attractions; culture and customs;"
-                " best times to visit; and special considerations."
-            ),
-            expected_output=(
-                "A comprehensive destination overview in markdown covering attractions, culture, "
-                "best times to visit, and special considerations."
-            ),
-            agent=self.destination_expert,
+            description=DESTINATION_TEMPLATE.format(query=query),
+            expected_output=DESTINATION_OUTPUT,
+            agent=self._create_destination_expert(),
         )
-
-        # Create the itinerary planning task
         itinerary_task = Task(
-            description=(
-                f'Create a detailed itinerary for: "{query}"\n\n'
-                "Include arrival/departure logistics, daily activities, meal suggestions, and local"
-                " transport between locations. Format as a clear daily schedule."
-            ),
-            expected_output=(
-                "A day-by-day itinerary in markdown with timeslots, activities, meals, and "
-                "logistics."
-            ),
-            agent=self.itinerary_planner,
+            description=ITINERARY_TEMPLATE.format(query=query),
+            expected_output=ITINERARY_OUTPUT,
+            agent=self._create_itinerary_planner(),
             context=[destination_task],
         )
-
-        # Create the safety assessment task
         safety_task = Task(
-            description=(
-                f'Provide safety guidance for: "{query}"\n\n'
-                "Include: general safety, itinerary-specific concerns, health tips, and emergency"
-                " resources. Format as a traveler safety guide."
-            ),
-            expected_output=(
-                "A practical safety guide in markdown covering general risks, itinerary-specific "
-                "concerns, health tips, and emergency contacts/resources."
-            ),
-            agent=self.safety_advisor,
-            context=[destination_task, itinerary_task],
+            description=SAFETY_TEMPLATE.format(query=query),
+            expected_output=SAFETY_OUTPUT,
+            agent=self._create_safety_advisor(),
+            context=[destination_task],
         )
-
-        # Create the budget analysis task
         budget_task = Task(
-            description=(
-                f'Create a budget for: "{query}"\n\n'
-                "Estimate costs for accommodation, transportation, food, activities, and misc."
-                " If a budget is provided, fit within it; otherwise, provide budget/mid-range/"
-                "luxury"
-                " options. Include a clear breakdown with approximate costs."
-            ),
-            expected_output=(
-                "A markdown budget breakdown table with estimated costs by category and total, "
-                "plus options for different budget levels if applicable."
-            ),
-            agent=self.budget_analyst,
-            context=[destination_task, itinerary_task, safety_task],
+            description=BUDGET_TEMPLATE.format(query=query),
+            expected_output=BUDGET_OUTPUT,
+            agent=self._create_budget_analyst(),
+            context=[destination_task],
         )
 
-        # Create the crew with the defined agents and tasks
-        crew = Crew(
-            agents=[
-                self.confidence_agent,
-                self.destination_expert,
-                self.itinerary_planner,
-                self.safety_advisor,
-                self.budget_analyst,
-            ],
-            tasks=[
-                confidence_task,
-                destination_task,
-                itinerary_task,
-                safety_task,
-                budget_task,
-            ],
-            verbose=self.verbose,
-            process=Process.sequential,
-        )
+        # Report each plan section as soon as its task completes
+        if on_section is not None:
+            for section, task in (
+                ("overview", destination_task),
+                ("itinerary", itinerary_task),
+                ("safety", safety_task),
+                ("finance", budget_task),
+            ):
+                task.callback = lambda out, section=section: on_section(
+                    section, getattr(out, "raw", None) or str(out)
+                )
 
-        # Execute the crew workflow
-        _final_output = crew.kickoff(inputs={"query": query})
+        inputs = {"query": query}
 
-        # Parse and format results
-        try:
+        # Score the query before any planning work
+        await asyncio.to_thread(self._kickoff, self._crew_for(confidence_task), inputs)
 
-            def _to_text_output(out: Any) -> str:
-                """Best-effort conversion of a CrewAI Task output to plain text."""
-                if out is None:
-                    return ""
-                if isinstance(out, str):
-                    return out
-                # Try common attributes seen in CrewAI TaskOutput types
-                for attr in ("raw", "raw_output", "content", "text", "final_output"):
-                    val = getattr(out, attr, None)
-                    if isinstance(val, str):
-                        return val
-                try:
-                    return str(out)
-                except Exception:
-                    return ""
-
-            def _extract_json(text: str) -> str | None:
-                """Extract the first JSON object from text, if present."""
-                if not text:
-                    return None
-                # Quick path if the whole text is JSON
-                text_stripped = text.strip()
-                if text_stripped.startswith("{") and text_stripped.endswith("}"):
-                    return text_stripped
-                # Fallback: find JSON object via regex (non-greedy)
-                match = re.search(r"\{.*?\}", text_stripped, re.DOTALL)
-                return match.group(0) if match else None
-
-            # Try to parse confidence score result (task 0)
-            conf_text = _to_text_output(crew.tasks[0].output)
+        try:
+            # Try to parse confidence score result
+            conf_text = _to_text_output(confidence_task.output)
             conf_json = _extract_json(conf_text)
-            confidence_result = json.loads(conf_json) if conf_json else {"confidence_score": 1.0}
+            confidence_result = orjson.loads(conf_json) if conf_json else {"confidence_score": 1.0}
             confidence_score = confidence_result.get("confidence_score", 0.0)
-
-            # If confidence is too low, return early
-            if confidence_score < 0.6:
-                return {
-                    "success": False,
-                    "confidence_score": confidence_score,
-                    "error": "Query does not appear to be related to travel planning",
-                    "query": query,
-                    "travel_plan": None,
-                    "llm_provider": self.llm_provider_name,
-                }
-
-            # Otherwise, process the full travel plan
+        except Exception as e:
             return {
-                "success": True,
-                "confidence_score": confidence_score,
+                "success": False,
+                "error": f"Failed to process travel plan: {str(e)}",
+                "confidence_score": 0.0,
                 "query": query,
                 "llm_provider": self.llm_provider_name,
-                "travel_plan": {
-                    "overview": _to_text_output(crew.tasks[1].output),
-                    "itinerary": _to_text_output(crew.tasks[2].output),
-                    "safety": _to_text_output(crew.tasks[3].output),
-                    "finance": _to_text_output(crew.tasks[4].output),
-                },
             }
-        except Exception as e:
+
+        # If confidence is too low, return early, before any planning task runs
+        if confidence_score < 0.6:
             return {
                 "success": False,
-                "error": f"Failed to process travel plan: {str(e)}",
-                "confidence_score": 0.0,
+                "confidence_score": confidence_score,
+                "error": "Query does not appear to be related to travel planning",
                 "query": query,
+                "travel_plan": None,
                 "llm_provider": self.llm_provider_name,
             }
+
+        # Research the destination, then fan out the tasks that only need the research
+        await asyncio.to_thread(self._kickoff, self._crew_for(destination_task), inputs)
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(self._kickoff, self._crew_for(task), inputs)
+                for task in (itinerary_task, safety_task, budget_task)
+            )
+        )
+
+        return {
+            "success": True,
+            "confidence_score": confidence_score,
+            "query": query,
+            "llm_provider": self.llm_provider_name,
+            "travel_plan": {
+                "overview": _to_text_output(destination_task.output),
+                "itinerary": _to_text_output(itinerary_task.output),
+                "safety": _to_text_output(safety_task.output),
+                "finance": _to_text_output(budget_task.output),
+            },
+        }
+
+    def _crew_for(self, *tasks: Task) -> Crew:
+        """A crew running ``tasks`` in order, each with its own agent."""
+        return Crew(
+            agents=[task.agent for task in tasks],
+            tasks=list(tasks),
+            verbose=self.verbose,
+            process=Process.sequential,
+        )
+
+    def _kickoff(self, crew: Crew, inputs: dict[str, str]) -> Any:
+        """Run ``crew`` within the provider's concurrency limit, retrying rate limits."""
+        attempt = 1
+        while True:
+            try:
+                with _SLOTS[self.llm_provider_name]:
+                    return crew.kickoff(inputs=inputs)
+            except Exception as e:
+                if attempt >= KICKOFF_ATTEMPTS or not is_rate_limit(e):
+                    raise
+            # Full jitter, outside the slot: retries of concurrent runs spread out
+            # instead of waking in lockstep
+            cap = min(KICKOFF_BACKOFF * 2 ** (attempt - 1), KICKOFF_BACKOFF_MAX)
+            time.sleep(random.uniform(0, cap))
+            attempt += 1
+
+    def plan_trip_batch(self, queries: list[str]) -> list[dict[str, Any] | Exception]:
+        """
+        Plan several trips concurrently, at most BATCH_WORKERS at a time; each plan
+        builds its own agents.
+
+        Args:
+            queries: The natural language queries to plan
+
+        Returns:
+            One result per query, in order; a query whose crew run raised yields the
+            exception instead of a dictionary
+        """
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(queries), BATCH_WORKERS)) as pool:
+            futures = [pool.submit(self.plan_trip, query) for query in queries]
+        return [f.exception() or f.result() for f in futures]  # type: ignore[misc]
@@ -6,9 +6,9 @@ Project Hermes Package Verification
 This script verifies that the pyproject.toml setup is working correctly.
 """
 
-import importlib
-import subprocess
 import sys
+from importlib.metadata import distributions
+from importlib.util import find_spec
 
 
 def check_package_info():
@@ -34,23 +34,19 @@ def check_package_info():
     ]
 
     for dep in dependencies:
-        try:
-            # Try to import the module
-            module_name = dep.split(".")[0]  # Get the top-level module name
-            importlib.import_module(module_name)
+        module_name = dep.split(".")[0]  # Get the top-level module name
+        # Locate the module without importing it (and running its import-time setup)
+        if find_spec(module_name) is not None:
             print(f"  ✓ {module_name} is installed")
-        except ImportError:
+        else:
             print(f"  ✗ {module_name} is not installed")
 
-    # Try to run pip list to show installed packages
-    print("\nInstalled packages (via pip list):")
-    try:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "list"], capture_output=True, text=True, check=True
-        )
-        print(result.stdout)
-    except subprocess.CalledProcessError:
-        print("  Unable to run 'pip list'")
+    # Read the installed distributions' metadata directly instead of spawning pip
+    print("\nInstalled packages:")
+    packages = sorted(
+        (f"{dist.metadata['Name']}=={dist.version}" for dist in distributions()), key=str.lower
+    )
+    print("\n".join(f"  {package}" for package in packages))
 
     print("\nVerification completed.")
     print("\nTo install dependencies using uv and pyproject.toml, run:")
@@ -63,7 +59,3 @@ def check_package_info():
 
 if __name__ == "__main__":
     check_package_info()
-
-
-if __name__ == "__main__":
-    check_package_info()
@@ -5,9 +5,11 @@ A simple web interface for the travel planning system.
 """
 
 import streamlit as st
-import requests
-import json
+import httpx
+import orjson
 import os
+import pandas as pd
+from importlib.util import find_spec
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,7 +17,128 @@ load_dotenv()
 
 # API endpoint configuration
 API_HOST = os.getenv("API_HOST", "http://localhost:8001")
-TRAVEL_ENDPOINT = f"{API_HOST}/travel/plan"
+# NDJSON: one line per plan section as it is generated, then the full response
+STREAM_ENDPOINT = f"{API_HOST}/travel/plan/stream"
+
+
+@st.cache_resource
+def get_client():
+    """One keep-alive client for every rerun of the script (HTTP/2 if h2 is installed)."""
+    # Longer timeout for complex queries
+    return httpx.Client(http2=find_spec("h2") is not None, timeout=120.0)
+
+
+def render_itinerary(itinerary):
+    if isinstance(itinerary, list):
+        for day in itinerary:
+            st.subheader(f"📅 {day.get('day', 'Day')}")
+            for activity in day.get("activities", []):
+                st.write(
+                    f"• {activity.get('time', '')} - {activity.get('description', '')}"
+                )
+    else:
+        st.write(itinerary)
+
+
+def render_safety(safety):
+    if isinstance(safety, dict):
+        for key, value in safety.items():
+            st.subheader(key.replace("_", " ").title())
+            st.write(value)
+    else:
+        st.write(safety)
+
+
+def render_finance(finance):
+    if not isinstance(finance, dict):
+        st.write(finance)
+        return
+
+    # Create a table for budget items
+    items = {k: v for k, v in finance.items() if k not in ("total", "summary")}
+    if items:
+        amounts = pd.Series(list(items.values()), dtype=object)
+        budget_data = pd.DataFrame(
+            {
+                "Category": pd.Series(list(items)).str.replace("_", " ").str.title(),
+                "Amount": amounts.map(
+                    lambda v: f"${v:,.2f}" if isinstance(v, (int, float)) else str(v)
+                ),
+            }
+        )
+        st.dataframe(budget_data, hide_index=True)
+
+    # Show total if available
+    if "total" in finance:
+        st.subheader("Total")
+        total = finance["total"]
+        if isinstance(total, (int, float)):
+            st.metric("Total Budget", f"${total:,.2f}")
+        else:
+            st.write(total)
+
+    # Show budget summary if available
+    if "summary" in finance:
+        st.subheader("Budget Summary")
+        st.write(finance["summary"])
+
+
+# (section, tab label, heading, renderer, fallback text) in tab order
+SECTIONS = [
+    ("overview", "Overview", "## 📋 Overview", st.write, "No overview available"),
+    ("itinerary", "Itinerary", "## 🗓️ Itinerary", render_itinerary, "No itinerary available"),
+    (
+        "safety",
+        "Safety",
+        "## 🛡️ Safety Information",
+        render_safety,
+        "No safety information available",
+    ),
+    ("finance", "Budget", "## 💰 Budget", render_finance, "No budget information available"),
+]
+
+
+def section_placeholders():
+    """Create the result tabs, returning an empty slot per section (and "raw")."""
+    tabs = st.tabs([label for _, label, _, _, _ in SECTIONS] + ["Raw JSON"])
+    placeholders = {}
+    for tab, (section, _, heading, _, _) in zip(tabs, SECTIONS):
+        with tab:
+            st.markdown(heading)
+            placeholders[section] = st.empty()
+    with tabs[-1]:
+        st.markdown("## Raw JSON Response")
+        placeholders["raw"] = st.empty()
+    return placeholders
+
+
+def show_result(result, status, placeholders):
+    """Display a full plan response, filling (or creating) the section tabs."""
+    if result.get("success", False):
+        with status.container():
+            st.success("Travel plan generated successfully!")
+
+            # Show confidence score
+            st.metric(
+                "Confidence Score",
+                f"{result.get('confidence_score', 0) * 100:.1f}%",
+            )
+
+        # Display travel plan, replacing any streamed text
+        travel_plan = result.get("travel_plan", {})
+        if not placeholders:
+            placeholders = section_placeholders()
+        for section, _, _, render, fallback in SECTIONS:
+            with placeholders[section].container():
+                render(travel_plan.get(section, fallback))
+        placeholders["raw"].json(travel_plan)
+
+    else:
+        st.error(f"Error: {result.get('error', 'Unknown error')}")
+        if "confidence_score" in result:
+            st.warning(f"Confidence Score: {result.get('confidence_score', 0) * 100:.1f}%")
+            st.info("The query may not be specific enough or might not be travel-related.")
+
 
 # Page configuration
 st.set_page_config(
@@ -59,142 +182,44 @@ with st.form("travel_form"):
 # Process the query when submitted
 if submit_button and query:
     try:
+        status = st.empty()
+        placeholders = {}
+        result = None
         # Show a spinner while processing
         with st.spinner("Generating your travel plan... This may take a minute."):
-            # Call the API
-            response = requests.post(
-                TRAVEL_ENDPOINT,
-                json={"query": query},
+            # Call the API, showing each section as soon as its agent finishes
+            with get_client().stream(
+                "POST",
+                STREAM_ENDPOINT,
+                content=orjson.dumps({"query": query}),
                 headers={"Content-Type": "application/json"},
-                timeout=120,  # Longer timeout for complex queries
-            )
-
-            # Check if the request was successful
-            if response.status_code == 200:
-                result = response.json()
-
-                # Display results
-                if result.get("success", False):
-                    st.success("Travel plan generated successfully!")
-
-                    # Show confidence score
-                    st.metric(
-                        "Confidence Score",
-                        f"{result.get('confidence_score', 0) * 100:.1f}%",
-                    )
-
-                    # Display travel plan
-                    travel_plan = result.get("travel_plan", {})
-
-                    # Create tabs for different sections
-                    tabs = st.tabs(
-                        ["Overview", "Itinerary", "Safety", "Budget", "Raw JSON"]
-                    )
-
-                    # Overview tab
-                    with tabs[0]:
-                        st.markdown("## 📋 Overview")
-                        st.write(travel_plan.get("overview", "No overview available"))
-
-                    # Itinerary tab
-                    with tabs[1]:
-                        st.markdown("## 🗓️ Itinerary")
-                        itinerary = travel_plan.get(
-                            "itinerary", "No itinerary available"
-                        )
-                        if isinstance(itinerary, list):
-                            for day in itinerary:
-                                st.subheader(f"📅 {day.get('day', 'Day')}")
-                                for activity in day.get("activities", []):
-                                    st.write(
-                                        f"• {activity.get('time', '')} - {activity.get('description', '')}"
-                                    )
-                        else:
-                            st.write(itinerary)
-
-                    # Safety tab
-                    with tabs[2]:
-                        st.markdown("## 🛡️ Safety Information")
-                        safety = travel_plan.get(
-                            "safety", "No safety information available"
-                        )
-                        if isinstance(safety, dict):
-                            for key, value in safety.items():
-                                st.subheader(key.replace("_", " ").title())
-                                st.write(value)
-                        else:
-                            st.write(safety)
-
-                    # Budget tab
-                    with tabs[3]:
-                        st.markdown("## 💰 Budget")
-                        finance = travel_plan.get(
-                            "finance", "No budget information available"
-                        )
-                        if isinstance(finance, dict):
-                            # Create a table for budget items
-                            budget_data = []
-                            for category, amount in finance.items():
-                                if category != "total" and category != "summary":
-                                    if isinstance(amount, (int, float)):
-                                        budget_data.append(
-                                            {
-                                                "Category": category.replace(
-                                                    "_", " "
-                                                ).title(),
-                                                "Amount": f"${amount:,.2f}",
-                                            }
-                                        )
-                                    else:
-                                        budget_data.append(
-                                            {
-                                                "Category": category.replace(
-                                                    "_", " "
-                                                ).title(),
-                                                "Amount": str(amount),
-                                            }
-                                        )
-
-                            # Show the table if we have data
-                            if budget_data:
-                                st.table(budget_data)
-
-                            # Show total if available
-                            if "total" in finance:
-                                st.subheader("Total")
-                                total = finance["total"]
-                                if isinstance(total, (int, float)):
-                                    st.metric("Total Budget", f"${total:,.2f}")
-                                else:
-                                    st.write(total)
-
-                            # Show budget summary if available
-                            if "summary" in finance:
-                                st.subheader("Budget Summary")
-                                st.write(finance["summary"])
-                        else:
-                            st.write(finance)
-
-                    # Raw JSON tab
-                    with tabs[4]:
-                        st.markdown("## Raw JSON Response")
-                        st.json(travel_plan)
-
+            ) as response:
+                if response.status_code == 200:
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        message = orjson.loads(line)
+                        if message["section"] == "result":
+                            result = message["content"]
+                            break
+                        # Sections only arrive for travel queries, so tabs appear with the first
+                        if not placeholders:
+                            placeholders = section_placeholders()
+                        placeholders[message["section"]].write(message["content"])
                 else:
-                    st.error(f"Error: {result.get('error', 'Unknown error')}")
-                    if "confidence_score" in result:
-                        st.warning(
-                            f"Confidence Score: {result.get('confidence_score', 0) * 100:.1f}%"
-                        )
-                        st.info(
-                            "The query may not be specific enough or might not be travel-related."
-                        )
-            else:
-                st.error(f"Error: HTTP {response.status_code} - {response.text}")
+                    response.read()
+                    st.error(f"Error: HTTP {response.status_code} - {response.text}")
+
+        if result is not None:
+            # Kept for later reruns, which redraw it instead of calling the API again
+            st.session_state["plan"] = result
+            show_result(result, status, placeholders)
 
     except Exception as e:
         st.error(f"Error calling the travel planning API: {str(e)}")
         st.info("Make sure the API server is running at " + API_HOST)
+elif "plan" in st.session_state:
+    show_result(st.session_state["plan"], st.empty(), {})
 
 # Footer
 st.markdown("---")